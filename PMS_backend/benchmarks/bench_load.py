@@ -0,0 +1,400 @@
+"""PMS_backend 부하 테스트: 로컬 fake 서버 + SQLite(또는 MySQL) 위에서 app.py 엔드포인트 처리량/지연시간 측정.
+
+fake STRATO / 추천 서버 / Argo server를 띄우고, app을 별도 프로세스로 실행한 뒤
+지정한 동시성으로 요청 mix를 보내 엔드포인트별 RPS와 p50/p95/p99를 JSON으로 저장한다.
+
+    cd PMS_backend
+    python benchmarks/bench_load.py --concurrency 32 --duration 30 --out load_before.json
+    python benchmarks/bench_load.py --concurrency 32 --duration 30 --baseline load_before.json --out load_after.json
+
+    # 개발 서버(python app.py) vs gunicorn (같은 요청 mix)
+    python benchmarks/bench_load.py --server dev --out load_dev.json
+    python benchmarks/bench_load.py --server gunicorn --baseline load_dev.json
+
+    # MySQL 사용 (.env의 DB 접속 정보, 별도 테이블 권장)
+    TABLE_NAME=ml_workload_loadtest python benchmarks/bench_load.py --db mysql
+
+    # 이미 떠 있는 서버 대상 (fakes.py로 띄운 fake 서버를 바라보도록 설정된 서버)
+    python benchmarks/bench_load.py --target http://127.0.0.1:5000 --argo-port 18443 --no-fakes
+"""
+import os
+import sys
+import json
+import time
+import base64
+import runpy
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import statistics
+
+import yaml
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+import fakes  # noqa: E402
+from bench_manifest import synthetic_pipeline  # noqa: E402
+
+DEFAULT_MIX = "info=4,predict=4,strato=1,analytics=1"
+LABELS = ["preprocess", "train", "inference", "evaluate", "serve", "etl", "tune", "export"]
+
+
+# ---------------------------------------------------------------- server 측
+
+def serve(args):
+    # 부하 테스트 대상 app 프로세스 (driver가 환경변수와 함께 실행)
+    if args.db == "sqlite":
+        import sqlite_db
+        sqlite_db.install(args.sqlite_path)
+        sqlite_db.create_schema()
+    else:
+        from utils.migrations import run_migrations
+        run_migrations()
+
+    if args.server == "gunicorn":
+        _serve_gunicorn(args)
+        return
+
+    # python app.py와 같은 방식 (Flask 개발 서버, 단일 프로세스) - reloader만 끔
+    import app as pms_app
+    from utils.lifecycle import startup
+    startup()
+    pms_app.app.run(host="127.0.0.1", port=args.port, debug=True, use_reloader=False)
+
+
+def _serve_gunicorn(args):
+    # gunicorn.conf.py 설정 + bind/workers/threads만 덮어씀 (스키마는 위에서 생성)
+    from gunicorn.app.base import BaseApplication
+
+    class BenchApplication(BaseApplication):
+        def load_config(self):
+            config = runpy.run_path(os.path.join(SRC_DIR, "gunicorn.conf.py"))
+            for key, value in config.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+            self.cfg.set("bind", f"127.0.0.1:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("threads", args.threads)
+
+        def load(self):
+            if args.db == "sqlite":
+                import sqlite_db
+                sqlite_db.install(args.sqlite_path)
+            import app as pms_app
+            return pms_app.app
+
+    BenchApplication().run()
+
+
+def start_server(args, env):
+    cmd = [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port), "--db", args.db,
+           "--sqlite-path", args.sqlite_path, "--server", args.server, "--workers", str(args.workers),
+           "--threads", str(args.threads)]
+    log = open(os.path.join(args.workdir, "server.log"), "w")
+    process = subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT, cwd=args.workdir)
+    return process, log
+
+
+def wait_ready(base_url, timeout=30, process=None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/v1/stats", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} not ready within {timeout}s")
+
+
+# ---------------------------------------------------------------- driver 측
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(REQUESTS)
+    if unknown:
+        raise SystemExit(f"unknown endpoints in --mix: {sorted(unknown)} (choose from {sorted(REQUESTS)})")
+    return mix
+
+
+def _pipeline_payloads(count):
+    # 서로 다른 파이프라인 이름 -> 서로 다른 manifest digest (dedup에 합쳐지지 않음)
+    template = yaml.dump(synthetic_pipeline(3), sort_keys=False)
+    return [base64.b64encode(template.replace("resource-stress-workload", f"bench-load-{i}").encode()).decode()
+            for i in range(count)]
+
+
+class RequestFactory:
+    def __init__(self, args):
+        self.args = args
+        self.argo_query = {"ip": "127.0.0.1", "port": str(args.argo_port), "namespace": "bench"}
+        self.payloads = _pipeline_payloads(args.strato_payloads) if "strato" in args.mix else []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def strato(self):
+        with self._lock:
+            self._counter += 1
+            payload = self.payloads[self._counter % len(self.payloads)]
+        params = {"sync": "true"} if self.args.strato_mode == "sync" else {}
+        return "POST", "/api/v1/strato", {"params": params, "json": {"cluster": 1, "yaml": payload}}
+
+    def info(self):
+        return "GET", "/api/v1/info", {"params": self.argo_query}
+
+    def batch(self):
+        return "POST", "/api/v1/info/batch", {"json": {"targets": [self.argo_query] * 3}}
+
+    def _templates(self):
+        return [{"name": f"step-{i}", "container": {"image": "bench"},
+                 "metadata": {"labels": {"ml.workload": random.choice(LABELS)}}}
+                for i in range(self.args.predict_templates)]
+
+    def predict(self):
+        return "POST", "/api/v1/predict", {"json": self._templates()}
+
+    def predict_bulk(self):
+        pipelines = [self._templates() for _ in range(self.args.predict_bulk_size)]
+        return "POST", "/api/v1/predict/bulk", {"json": {"pipelines": pipelines}}
+
+    def analytics(self):
+        return "GET", "/api/v1/analytics", {"params": {"window": 86400, "group_by": "name"}}
+
+
+REQUESTS = {"strato": RequestFactory.strato, "info": RequestFactory.info, "batch": RequestFactory.batch,
+            "predict": RequestFactory.predict, "predict_bulk": RequestFactory.predict_bulk,
+            "analytics": RequestFactory.analytics}
+
+
+def _ok(name, response):
+    if response.status_code >= 400:
+        return False
+    # sync 제출은 200 + 문자열 결과, 실패 시 "Error:" 로 시작
+    if name == "strato" and response.status_code == 200 and response.text.startswith("Error"):
+        return False
+    return True
+
+
+def drive(base_url, factory, mix, concurrency, duration, warmup, timeout):
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}
+    errors = {name: {} for name in names}
+    lock = threading.Lock()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local = []
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            name = rng.choices(names, weights)[0]
+            method, path, kwargs = REQUESTS[name](factory)
+            started = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, timeout=timeout, **kwargs)
+                ok, status = _ok(name, response), response.status_code
+            except requests.RequestException as e:
+                ok, status = False, type(e).__name__
+            elapsed = time.perf_counter() - started
+            if now >= start_at:
+                local.append((name, elapsed, ok, status))
+        with lock:
+            for name, elapsed, ok, status in local:
+                if ok:
+                    samples[name].append(elapsed)
+                else:
+                    errors[name][str(status)] = errors[name].get(str(status), 0) + 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return round(sorted_values[index] * 1000, 3)
+
+
+def summarize(samples, errors, duration):
+    report = {}
+    for name, values in samples.items():
+        values.sort()
+        error_count = sum(errors[name].values())
+        report[name] = {
+            "requests": len(values) + error_count,
+            "errors": error_count,
+            "error_codes": errors[name],
+            "rps": round(len(values) / duration, 2),
+            "mean_ms": round(statistics.mean(values) * 1000, 3) if values else None,
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+            "max_ms": round(values[-1] * 1000, 3) if values else None,
+        }
+    total = sum(len(v) for v in samples.values())
+    report["total"] = {
+        "requests": total + sum(sum(e.values()) for e in errors.values()),
+        "errors": sum(sum(e.values()) for e in errors.values()),
+        "rps": round(total / duration, 2),
+    }
+    return report
+
+
+def compare(report, baseline):
+    print(f"\n{'endpoint':12s} {'rps':>30s} {'p95_ms':>30s}")
+    for name, current in report.items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+
+        def delta(key):
+            if not before.get(key) or current.get(key) is None:
+                return f"{current.get(key)}"
+            return f"{before[key]} -> {current[key]} ({(current[key] - before[key]) / before[key] * 100:+.1f}%)"
+        print(f"{name:12s} {delta('rps'):>30s} {delta('p95_ms') if name != 'total' else '':>30s}")
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3, help="측정 전 워밍업(초)")
+    parser.add_argument("--timeout", type=float, default=30, help="요청 timeout(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=가중치 목록 (strato, info, batch, predict, predict_bulk, analytics)")
+    parser.add_argument("--strato-mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--strato-payloads", type=int, default=1000, help="서로 다른 파이프라인 개수")
+    parser.add_argument("--predict-templates", type=int, default=6)
+    parser.add_argument("--predict-bulk-size", type=int, default=100, help="predict_bulk 요청당 파이프라인 수")
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--port", type=int, default=5055, help="app 서버 포트")
+    parser.add_argument("--server", choices=["dev", "gunicorn"], default="dev",
+                        help="dev: python app.py와 같은 Flask 개발 서버, gunicorn: gunicorn.conf.py")
+    parser.add_argument("--workers", type=int, default=1, help="--server gunicorn 워커 수")
+    parser.add_argument("--threads", type=int, default=16, help="--server gunicorn 워커당 스레드 수")
+    parser.add_argument("--target", help="이미 실행 중인 서버 URL (지정 시 app 서버를 띄우지 않음)")
+    parser.add_argument("--no-fakes", action="store_true", help="fake 서버를 띄우지 않음 (--target과 함께 사용)")
+    parser.add_argument("--server-env", action="append", default=[], help="app 서버에 추가로 전달할 KEY=VALUE")
+    parser.add_argument("--label", help="결과 JSON에 남길 이름")
+    parser.add_argument("--out")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    # 내부용: app 서버 프로세스
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--sqlite-path", help=argparse.SUPPRESS)
+    fakes.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    random.seed(args.seed)
+    args.mix = parse_mix(args.mix)
+    args.workdir = tempfile.mkdtemp(prefix="pms-load-")
+    args.sqlite_path = args.sqlite_path or os.path.join(args.workdir, "pms.sqlite3")
+
+    fake_servers = {} if args.no_fakes else fakes.start_fakes(args)
+    if fake_servers:
+        args.argo_port = fake_servers["argo"].port
+
+    process = log = None
+    base_url = args.target
+    if base_url is None:
+        env = dict(os.environ)
+        env.update(fakes.fake_env(fake_servers))
+        env.setdefault("TABLE_NAME", "ml_workload")
+        env.update({
+            "WORKFLOW_HISTORY_PATH": os.path.join(args.workdir, "workflow_history.npz"),
+            "PROFILE_DIR": os.path.join(args.workdir, "profiles"),
+            # 스키마는 serve()에서 생성 (gunicorn on_starting에서 다시 migrate 하지 않음)
+            "DB_MIGRATE_ON_START": "false",
+            "PYTHONPATH": os.pathsep.join([SRC_DIR, BENCH_DIR]),
+        })
+        env.update(item.split("=", 1) for item in args.server_env)
+        process, log = start_server(args, env)
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(base_url, process=process)
+        factory = RequestFactory(args)
+        print(f"Driving {base_url} for {args.duration}s (+{args.warmup}s warmup), concurrency={args.concurrency}, "
+              f"mix={args.mix}")
+        samples, errors = drive(base_url, factory, args.mix, args.concurrency, args.duration, args.warmup,
+                                args.timeout)
+        try:
+            server_stats = requests.get(f"{base_url}/api/v1/stats", timeout=5).json()
+        except (requests.RequestException, ValueError):
+            server_stats = None
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+            log.close()
+
+    endpoints = summarize(samples, errors, args.duration)
+    result = {
+        "label": args.label,
+        "revision": _git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count(), "platform": platform.platform()},
+        "config": {
+            "target": args.target, "server": None if args.target else args.server,
+            "workers": args.workers if args.server == "gunicorn" else 1,
+            "threads": args.threads if args.server == "gunicorn" else None, "db": args.db, "concurrency": args.concurrency, "duration": args.duration,
+            "warmup": args.warmup, "mix": args.mix, "strato_mode": args.strato_mode,
+            "predict_templates": args.predict_templates, "server_env": args.server_env,
+            "fakes": {name: {"latency": server.latency, "error_rate": server.error_rate, "requests": server.requests}
+                      for name, server in fake_servers.items()},
+        },
+        "endpoints": endpoints,
+        "server_stats": server_stats,
+    }
+
+    print(f"\n{'endpoint':12s} {'requests':>9s} {'errors':>7s} {'rps':>9s} {'p50_ms':>9s} {'p95_ms':>9s} {'p99_ms':>9s}")
+    for name, report in endpoints.items():
+        if name == "total":
+            continue
+        print(f"{name:12s} {report['requests']:9d} {report['errors']:7d} {report['rps']:9.2f} "
+              f"{report['p50_ms'] or 0:9.3f} {report['p95_ms'] or 0:9.3f} {report['p99_ms'] or 0:9.3f}")
+    print(f"{'total':12s} {endpoints['total']['requests']:9d} {endpoints['total']['errors']:7d} "
+          f"{endpoints['total']['rps']:9.2f}")
+    if process is not None:
+        print(f"(server log: {os.path.join(args.workdir, 'server.log')})")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(endpoints, json.load(f))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""POST /api/v1/strato manifest 변환(decode -> 라벨 추가 -> dump -> encode) 경로 비교.
+
+- baseline : 기존 ml_post_handler 방식 (yaml.safe_load + yaml.dump, 순수 Python)
+- libyaml  : manifest_utils.transform_manifest (CSafeLoader/CSafeDumper)
+- cached   : manifest_utils.ManifestCache (같은 입력 재제출)
+
+컴파일된 파이프라인 YAML을 넘겨 측정한다 (kfp 1.x 환경에서 생성):
+
+    cd resource_stress_pipeline && python pipeline.py      # -> stress-test-1.6.yaml
+    cd sllm/sllm_pipeline && PIPELINE_VERSION=1 python pipeline.py   # -> sllm-pipeline-1.yaml
+    cd PMS_backend
+    python benchmarks/bench_manifest.py --yaml ../resource_stress_pipeline/stress-test-1.6.yaml \\
+        --yaml ../sllm/sllm_pipeline/sllm-pipeline-1.yaml --repeat 200 --out manifest_bench.json
+
+--yaml 없이 실행하면 같은 형태(KFP v1 Argo Workflow)의 합성 파이프라인을 --templates 크기로 만들어 측정한다.
+"""
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import statistics
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.manifest_utils import transform_manifest, ManifestCache, yaml_loader  # noqa: E402
+
+USER_ID = "bench"
+
+
+def synthetic_pipeline(templates):
+    # kfp 1.x compiler 출력과 같은 구조의 Workflow
+    steps = []
+    for i in range(templates):
+        steps.append({
+            "name": f"resource-stress-step-{i}",
+            "container": {
+                "args": ["main.py", "--time", "5", "--cpu_stress", "True", "--memory_stress", "True",
+                         "--mem_amount", "600", "--size_mb", "100", "--net_url", "http://localhost"],
+                "command": ["python3"],
+                "image": "chromatices/resource_stress:1.6",
+                "resources": {"limits": {"nvidia.com/gpu": 1}},
+            },
+            "metadata": {
+                "labels": {"ml.workload": "train", "pipelines.kubeflow.org/kfp_sdk_version": "1.8.22",
+                           "pipelines.kubeflow.org/pipeline-sdk-type": "kfp"},
+                "annotations": {"pipelines.kubeflow.org/component_spec": json.dumps(
+                    {"name": f"resource-stress-step-{i}", "implementation": {"container": {"image": "chromatices/resource_stress:1.6"}}})},
+            },
+        })
+    dag = [{"name": s["name"], "template": s["name"],
+            **({"dependencies": [steps[i - 1]["name"]]} if i else {})} for i, s in enumerate(steps)]
+    return {
+        "apiVersion": "argoproj.io/v1alpha1",
+        "kind": "Workflow",
+        "metadata": {
+            "generateName": "resource-stress-workload-",
+            "annotations": {
+                "pipelines.kubeflow.org/kfp_sdk_version": "1.8.22",
+                "pipelines.kubeflow.org/pipeline_compilation_time": "2024-01-01T00:00:00",
+                "pipelines.kubeflow.org/pipeline_spec": json.dumps(
+                    {"description": "resource-stress-test", "name": "resource-stress-workload"}),
+            },
+            "labels": {"pipelines.kubeflow.org/kfp_sdk_version": "1.8.22"},
+        },
+        "spec": {
+            "entrypoint": "resource-stress-workload",
+            "templates": steps + [{"name": "resource-stress-workload", "dag": {"tasks": dag}}],
+            "arguments": {"parameters": []},
+            "serviceAccountName": "pipeline-runner",
+        },
+    }
+
+
+def baseline_transform(encoded_yaml, userid):
+    # 변경 전 ml_post_handler의 변환 코드
+    decoded_yaml = base64.b64decode(encoded_yaml).decode("utf-8")
+    parsed_yaml = yaml.safe_load(decoded_yaml)
+    json.loads(parsed_yaml['metadata']['annotations']['pipelines.kubeflow.org/pipeline_spec'])
+    if 'spec' in parsed_yaml and 'templates' in parsed_yaml['spec']:
+        for template in parsed_yaml['spec']['templates']:
+            if 'metadata' in template:
+                labels = template['metadata'].setdefault('labels', {})
+                labels['ml.workload.id'] = userid
+    updated_yaml = yaml.dump(parsed_yaml, sort_keys=False)
+    return base64.b64encode(updated_yaml.encode('utf-8')).decode('utf-8')
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 3),
+    }
+
+
+def measure(name, encoded_yaml, repeat):
+    # 결과가 같은지 먼저 확인 (dumper가 달라도 YAML 내용은 동일해야 함)
+    expected = yaml.safe_load(base64.b64decode(baseline_transform(encoded_yaml, USER_ID)))
+    actual = yaml.safe_load(base64.b64decode(transform_manifest(encoded_yaml, USER_ID)["yaml"]))
+    if expected != actual:
+        raise RuntimeError(f"{name}: transformed manifest differs from baseline output")
+
+    cache = ManifestCache(max_size=8)
+    cache.transform(encoded_yaml, USER_ID)
+    report = {
+        "size_kb": round(len(base64.b64decode(encoded_yaml)) / 1024, 1),
+        "baseline": timed(lambda: baseline_transform(encoded_yaml, USER_ID), repeat),
+        "libyaml": timed(lambda: transform_manifest(encoded_yaml, USER_ID), repeat),
+        "cached": timed(lambda: cache.transform(encoded_yaml, USER_ID), repeat),
+    }
+    report["speedup_libyaml"] = round(report["baseline"]["mean_ms"] / report["libyaml"]["mean_ms"], 2)
+    report["speedup_cached"] = round(report["baseline"]["mean_ms"] / max(report["cached"]["mean_ms"], 1e-6), 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--yaml", action="append", default=[], help="컴파일된 파이프라인 YAML 경로 (여러 번 지정 가능)")
+    parser.add_argument("--templates", type=int, action="append", help="합성 파이프라인 template 수 (기본 3, 50)")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    inputs = {}
+    for path in args.yaml:
+        with open(path, "rb") as f:
+            inputs[os.path.basename(path)] = base64.b64encode(f.read()).decode("ascii")
+    if not inputs:
+        for templates in args.templates or [3, 50]:
+            text = yaml.dump(synthetic_pipeline(templates), sort_keys=False)
+            inputs[f"synthetic-{templates}"] = base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+    result = {"libyaml": yaml_loader() is not yaml.SafeLoader, "repeat": args.repeat, "inputs": {}}
+    for name, encoded_yaml in inputs.items():
+        report = result["inputs"][name] = measure(name, encoded_yaml, args.repeat)
+        print(f"{name:28s} {report['size_kb']:8.1f}KB  baseline={report['baseline']['mean_ms']:8.3f}ms  "
+              f"libyaml={report['libyaml']['mean_ms']:8.3f}ms  cached={report['cached']['mean_ms']:8.3f}ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""placement advisor(best-fit decreasing) 배치 품질 / 결정 시간 측정.
+
+대기 중인 파이프라인 N개(3단계 DAG, 학습(GPU) / 전처리 전용(CPU) 혼합, step마다 추천 리소스 반영)를
+서로 다른 크기의 클러스터 M개에 배치하고 전략별로 비교한다.
+
+- default     : 기존 동작 (모두 cluster 1, 들어가는 만큼만 실행 가능)
+- first_fit   : 도착 순서대로 처음 들어가는 클러스터
+- online_bf   : 도착 순서대로 PlacementAdvisor.place() (제출 시 "cluster": "auto" 경로, 예약 포함)
+- bfd         : 전체를 한 번에 best_fit_decreasing (PlacementAdvisor.plan(), /api/v1/placement 경로)
+
+    cd PMS_backend
+    python benchmarks/bench_placement.py --pipelines 1000 --pipelines 5000 --clusters 8 --out placement_bench.json
+"""
+import os
+import sys
+import json
+import time
+import io
+import random
+import argparse
+import contextlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.resource_utils import apply_recommendation  # noqa: E402
+from utils.placement import (ClusterRegistry, PlacementAdvisor, best_fit_decreasing, pipeline_demand,  # noqa: E402
+                             parse_memory, DIMENSIONS)
+
+CLUSTER_SHAPES = [
+    {"cpu": 32, "memory": "128Gi", "gpu": 2},
+    {"cpu": 64, "memory": "256Gi", "gpu": 4},
+    {"cpu": 96, "memory": "384Gi", "gpu": 8},
+    {"cpu": 48, "memory": "192Gi", "gpu": 0},
+]
+# 라벨별 추천값 범위 (cpu 코어, memory Mi)
+LABEL_RANGES = {"preprocess": ((0.5, 6.0), (512, 16384)), "train": ((1.0, 8.0), (2048, 32768)),
+                "inference": ((0.5, 4.0), (1024, 8192))}
+# 학습 파이프라인 (GPU 사용, train/inference step에 GPU 1개)과 전처리 전용 파이프라인 (CPU만 사용)
+PIPELINE_KINDS = {"training": ("preprocess", "train", "inference"), "etl": ("preprocess", "preprocess", "preprocess")}
+
+
+def synthetic_pipeline(rng, index, gpu_ratio):
+    # apply_recommendation으로 추천값을 반영한 3단계 파이프라인 templates
+    kind = "training" if rng.random() < gpu_ratio else "etl"
+    steps = []
+    for step, label in enumerate(PIPELINE_KINDS[kind]):
+        (cpu_lo, cpu_hi), (mem_lo, mem_hi) = LABEL_RANGES[label]
+        req_cpu, req_mem = rng.uniform(cpu_lo, cpu_hi), int(rng.uniform(mem_lo, mem_hi))
+        template = {"name": f"p{index}-{step}-{label}", "container": {"image": "bench"},
+                    "metadata": {"labels": {"ml.workload": label}}}
+        apply_recommendation(template, label, {"req_cpu": req_cpu, "req_mem": req_mem,
+                                               "lim_cpu": req_cpu * 2, "lim_mem": req_mem * 2})
+        if label == "preprocess":
+            template["container"]["resources"]["limits"].pop("nvidia.com/gpu", None)
+        steps.append(template)
+    tasks = [{"name": s["name"], "template": s["name"], **({"dependencies": [steps[i - 1]["name"]]} if i else {})}
+             for i, s in enumerate(steps)]
+    return steps + [{"name": f"p{index}", "dag": {"tasks": tasks}}]
+
+
+def make_clusters(rng, count, load):
+    clusters = []
+    for idx in range(1, count + 1):
+        shape = CLUSTER_SHAPES[(idx - 1) % len(CLUSTER_SHAPES)]
+        used = rng.uniform(0, load)
+        clusters.append({"idx": idx, "capacity": shape,
+                         "allocated": {"cpu": shape["cpu"] * used, "memory": f"{int(parse_memory(shape['memory']) * used)}Mi",
+                                       "gpu": int(shape["gpu"] * used)}})
+    return clusters
+
+
+def first_fit(demands, free):
+    free = free.copy()
+    assignment = np.full(len(demands), -1, dtype=np.int64)
+    for i, demand in enumerate(demands):
+        fits = np.flatnonzero((free - demand >= -1e-9).all(axis=1))
+        if fits.size:
+            assignment[i] = fits[0]
+            free[fits[0]] -= demand
+    return assignment, free
+
+
+def only_first_cluster(demands, free):
+    free = free.copy()
+    assignment = np.full(len(demands), -1, dtype=np.int64)
+    for i, demand in enumerate(demands):
+        if (free[0] - demand >= -1e-9).all():
+            assignment[i] = 0
+            free[0] -= demand
+    return assignment, free
+
+
+def report(assignment, free_before, free_after, capacity, elapsed):
+    placed = int((assignment >= 0).sum())
+    used = np.unique(assignment[assignment >= 0])
+    allocated = free_before - free_after
+    with np.errstate(invalid="ignore", divide="ignore"):
+        used_util = np.where(capacity[used].sum(axis=0) > 0,
+                             (capacity[used] - free_after[used]).sum(axis=0) / capacity[used].sum(axis=0), np.nan)
+    return {
+        "placed": placed,
+        "unplaced": int(len(assignment) - placed),
+        "clusters_used": int(used.size),
+        "placed_demand": dict(zip(DIMENSIONS, allocated.sum(axis=0).round(2).tolist())),
+        # 사용한 클러스터 기준 점유율 (기존 할당 포함)
+        "used_cluster_utilization": dict(zip(DIMENSIONS, [None if np.isnan(v) else round(float(v), 4)
+                                                          for v in used_util])),
+        "decision_ms": round(elapsed * 1000, 3),
+        "per_pipeline_us": round(elapsed / max(len(assignment), 1) * 1e6, 3),
+    }
+
+
+def measure(pipelines, clusters):
+    started = time.perf_counter()
+    demands = np.array([pipeline_demand(templates) for templates in pipelines])
+    demand_elapsed = time.perf_counter() - started
+
+    registry = ClusterRegistry(clusters, reservation_ttl=3600)
+    indexes, capacity, free = registry.snapshot()
+    result = {"pipelines": len(pipelines), "clusters": len(indexes),
+              "demand_extraction_ms": round(demand_elapsed * 1000, 3), "strategies": {}}
+
+    for name, fn in (("default", only_first_cluster), ("first_fit", first_fit),
+                     ("bfd", lambda d, f: best_fit_decreasing(d, f, capacity))):
+        started = time.perf_counter()
+        assignment, free_after = fn(demands, free)
+        result["strategies"][name] = report(assignment, free, free_after, capacity, time.perf_counter() - started)
+
+    # 제출마다 place() 호출 (snapshot + 예약 포함한 실제 경로), 자리가 없으면 기본 클러스터로 fallback
+    advisor = PlacementAdvisor(ClusterRegistry(clusters, reservation_ttl=3600), default_cluster=-1)
+    started = time.perf_counter()
+    placed = [advisor.place(demand) for demand in demands]
+    elapsed = time.perf_counter() - started
+    positions = {idx: position for position, idx in enumerate(indexes)}
+    assignment = np.array([positions[idx] if fitted else -1 for idx, fitted in placed], dtype=np.int64)
+    _, _, free_after = advisor.registry.snapshot()
+    result["strategies"]["online_bf"] = report(assignment, free, free_after, capacity, elapsed)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pipelines", type=int, action="append", help="대기 파이프라인 수 (기본 1000, 5000)")
+    parser.add_argument("--clusters", type=int, default=8)
+    parser.add_argument("--load", type=float, default=0.3, help="클러스터별 기존 할당 비율 상한 (0~1)")
+    parser.add_argument("--gpu-ratio", type=float, default=0.3, help="GPU를 사용하는 학습 파이프라인 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clusters = make_clusters(rng, args.clusters, args.load)
+    result = {"clusters": clusters, "gpu_ratio": args.gpu_ratio, "runs": []}
+    for count in args.pipelines or [1000, 5000]:
+        with contextlib.redirect_stdout(io.StringIO()):  # apply_recommendation 출력 생략
+            pipelines = [synthetic_pipeline(rng, i, args.gpu_ratio) for i in range(count)]
+        run = measure(pipelines, clusters)
+        result["runs"].append(run)
+        print(f"pipelines={count} clusters={args.clusters} demand extraction={run['demand_extraction_ms']:.1f}ms")
+        for name, report_ in run["strategies"].items():
+            print(f"  {name:10s} placed={report_['placed']:6d} unplaced={report_['unplaced']:6d} "
+                  f"used={report_['clusters_used']:3d} placed_demand={report_['placed_demand']} "
+                  f"util={report_['used_cluster_utilization']} "
+                  f"decision={report_['decision_ms']:9.3f}ms ({report_['per_pipeline_us']:.1f}us/pipeline)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""ML workload 테이블 인덱스/마이그레이션 전후 쿼리 플랜과 지연시간 비교.
+
+.env의 DB 접속 정보를 사용해 임시 테이블(<TABLE_NAME>_bench)을 만들고
+합성 workload를 채운 뒤, 마이그레이션 적용 전/후로 EXPLAIN과 latency를 측정한다.
+
+    cd PMS_backend
+    python benchmarks/bench_schema.py --rows 100000 --repeat 200 --out schema_bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.db_utils import get_db_info, ML_ID_PREFIX  # noqa: E402
+from utils.migrations import run_migrations, _create_workload_table  # noqa: E402
+from utils.mlid_allocator import mlid_allocator  # noqa: E402
+
+STATUSES = ["Pending", "Running", "Succeeded", "Failed"]
+
+
+def seed(table, rows, clusters, chunk=1000):
+    with get_db_info() as (connection, cursor, _):
+        _create_workload_table(cursor, table)
+        query = f"""INSERT INTO {table}
+            (id, mlId, name, namespace, description, mlStepCode, status, userId, clusterIdx) VALUES """
+        step_code = json.dumps(["ml-step-100", "ml-step-200", "ml-step-400"])
+        for start in range(0, rows, chunk):
+            values = []
+            for i in range(start, min(rows, start + chunk)):
+                # 절반은 keti 번호, 절반은 STRATO workload- 형식
+                mlid = f"{ML_ID_PREFIX}{i:03}" if i % 2 == 0 else f"workload-{i:08x}"
+                values.append((str(i), mlid, f"pipeline-{i}", "keti-crd", "synthetic", step_code,
+                               random.choice(STATUSES), "bench", str(i % clusters + 1)))
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(values))
+            cursor.execute(query + placeholders, [v for row in values for v in row])
+            connection.commit()
+
+
+def explain(cursor, query, params):
+    cursor.execute("EXPLAIN " + query, params)
+    columns = [c[0] for c in cursor.description]
+    return [{k: v for k, v in zip(columns, row) if k in ("type", "key", "rows", "Extra")} for row in cursor.fetchall()]
+
+
+def measure(table, rows, clusters, repeat):
+    cases = {
+        "lookup_by_name": (f"SELECT mlId FROM {table} WHERE name = %s",
+                           lambda: (f"pipeline-{random.randrange(rows)}",)),
+        "list_by_cluster_status": (f"SELECT mlId, name, status FROM {table} WHERE clusterIdx = %s AND status = %s",
+                                   lambda: (str(random.randrange(clusters) + 1), random.choice(STATUSES))),
+        "next_mlid_prefix_scan": (f"SELECT mlId FROM {table} WHERE mlId LIKE %s ORDER BY mlId DESC LIMIT 1",
+                                  lambda: (f"{ML_ID_PREFIX}%",)),
+    }
+    report = {}
+    with get_db_info() as (connection, cursor, _):
+        cursor.execute(f"SHOW COLUMNS FROM {table} LIKE 'mlSeq'")
+        if cursor.fetchone():
+            cases["next_mlid_max_seq"] = (f"SELECT MAX(mlSeq) FROM {table}", lambda: ())
+        for name, (query, params) in cases.items():
+            plan = explain(cursor, query, params())
+            samples = []
+            for _ in range(repeat):
+                p = params()
+                started = time.perf_counter()
+                cursor.execute(query, p)
+                cursor.fetchall()
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            report[name] = {
+                "plan": plan,
+                "mean_ms": round(statistics.mean(samples), 3),
+                "p50_ms": round(samples[len(samples) // 2], 3),
+                "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+            }
+    return report
+
+
+def cleanup(table):
+    with get_db_info() as (connection, cursor, _):
+        for t in (table, f"{table}_schema_migrations", mlid_allocator.sequence_table_for(table)):
+            cursor.execute(f"DROP TABLE IF EXISTS {t}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--clusters", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--table", default=f"{os.getenv('TABLE_NAME', 'ml_workload')}_bench")
+    parser.add_argument("--out")
+    parser.add_argument("--keep", action="store_true", help="측정 후 임시 테이블을 삭제하지 않음")
+    args = parser.parse_args()
+
+    cleanup(args.table)
+    try:
+        started = time.perf_counter()
+        seed(args.table, args.rows, args.clusters)
+        print(f"Seeded {args.rows} rows into '{args.table}' in {time.perf_counter() - started:.1f}s")
+
+        before = measure(args.table, args.rows, args.clusters, args.repeat)
+        started = time.perf_counter()
+        migration = run_migrations(args.table)
+        migration["elapsed_s"] = round(time.perf_counter() - started, 3)
+        after = measure(args.table, args.rows, args.clusters, args.repeat)
+    finally:
+        if not args.keep:
+            cleanup(args.table)
+
+    result = {"rows": args.rows, "repeat": args.repeat, "migration": migration, "before": before, "after": after}
+    for name in before:
+        print(f"{name:24s} before p50={before[name]['p50_ms']:8.3f}ms  after p50={after[name]['p50_ms']:8.3f}ms")
+    if "next_mlid_max_seq" in after:
+        print(f"{'next_mlid_max_seq':24s} after  p50={after['next_mlid_max_seq']['p50_ms']:8.3f}ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2, default=str)
+    else:
+        print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""PMS_backend 기동 시간 측정: STARTUP_MODE=eager(기존, import 시 모두 로드) vs lazy(첫 사용 시 로드).
+
+1. import 시간: `python -X importtime -c "import app"`을 모드별로 --repeat번 실행해 모듈별 누적 import 시간(중앙값) 비교
+2. 기동 -> 응답 가능 시간: 서버 프로세스 시작부터 /api/v1/health 첫 200 응답까지 + route별 첫 요청 지연시간
+   (fake STRATO / 추천 서버 / Argo server, SQLite 사용 - 외부 지연은 0)
+
+    cd PMS_backend
+    python benchmarks/bench_startup.py --repeat 5 --out startup.json
+    python benchmarks/bench_startup.py --scenario eager:sync --scenario lazy:off --scenario lazy:background
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+import fakes  # noqa: E402
+
+# 무거운 의존성 / 앱 모듈 (항상 표에 표시)
+TRACKED = ["app", "flask", "flask_cors", "dotenv", "argo_workflows", "pymysql", "yaml", "requests", "numpy"]
+DEFAULT_SCENARIOS = ["eager:sync", "lazy:background"]
+
+
+def _first_requests(argo_port):
+    templates = [{"name": "step-0", "container": {"image": "bench"}, "metadata": {"labels": {"ml.workload": "train"}}}]
+    argo_query = {"ip": "127.0.0.1", "port": str(argo_port), "namespace": "bench"}
+    return [
+        ("stats", "GET", "/api/v1/stats", {}),
+        ("predict", "POST", "/api/v1/predict", {"json": templates}),
+        ("placement", "POST", "/api/v1/placement", {"json": {"pipelines": [templates]}}),
+        ("info", "GET", "/api/v1/info", {"params": argo_query}),
+        ("analytics", "GET", "/api/v1/analytics", {"params": {"window": 86400}}),
+    ]
+
+
+# ---------------------------------------------------------------- server 측
+
+def serve(args):
+    # 측정 대상 app 프로세스: import -> startup() (STARTUP_WARMUP) -> 포트 열기
+    import sqlite_db
+    sqlite_db.install(args.sqlite_path)
+    sqlite_db.create_schema()
+    from werkzeug.serving import make_server
+    import app as pms_app
+    from utils.lifecycle import startup
+    startup()
+    make_server("127.0.0.1", args.port, pms_app.app, threaded=True).serve_forever()
+
+
+# ---------------------------------------------------------------- driver 측
+
+def import_times(mode, env, workdir, code="import app"):
+    # 모듈 이름 -> 누적 import 시간(ms), 처음 import 된 위치 기준
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=workdir,
+                            env={**env, "STARTUP_MODE": mode}, capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.setdefault(name.strip(), int(cumulative) / 1000)
+    return times
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_startup(scenario, env, workdir, argo_port, timeout=60):
+    mode, _, warmup = scenario.partition(":")
+    port = _free_port()
+    cmd = [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+           "--sqlite-path", os.path.join(workdir, f"{mode}-{warmup}.sqlite3")]
+    log = open(os.path.join(workdir, f"server-{mode}-{warmup}.log"), "w")
+    started = time.perf_counter()
+    process = subprocess.Popen(cmd, cwd=workdir, stdout=log, stderr=subprocess.STDOUT,
+                               env={**env, "STARTUP_MODE": mode, "STARTUP_WARMUP": warmup or "off"})
+    base_url = f"http://127.0.0.1:{port}"
+    result = {"scenario": scenario}
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode} (log: {log.name})")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"server not ready within {timeout}s (log: {log.name})")
+            try:
+                if requests.get(f"{base_url}/api/v1/health", timeout=1).status_code == 200:
+                    break
+            except requests.RequestException:
+                time.sleep(0.005)
+        result["ready_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["first_request_ms"] = {}
+        for name, method, path, kwargs in _first_requests(argo_port):
+            request_started = time.perf_counter()
+            response = requests.request(method, base_url + path, timeout=30, **kwargs)
+            result["first_request_ms"][name] = round((time.perf_counter() - request_started) * 1000, 1)
+            if response.status_code >= 400:
+                result.setdefault("errors", {})[name] = response.status_code
+        result["loaded"] = requests.get(f"{base_url}/api/v1/health", timeout=5).json()["lazy"]
+    finally:
+        process.terminate()
+        process.wait(10)
+        log.close()
+    return result
+
+
+def _median(values):
+    return round(statistics.median(values), 1) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--sqlite-path")
+    parser.add_argument("--scenario", action="append", help="STARTUP_MODE:STARTUP_WARMUP (기본 eager:sync, lazy:background)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="eager 기준 누적 import 시간 상위 모듈 수")
+    parser.add_argument("--out")
+    fakes.add_arguments(parser)
+    parser.set_defaults(strato_latency=0.0, recommender_latency=0.0, argo_latency=0.0)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args)
+
+    scenarios = args.scenario or DEFAULT_SCENARIOS
+    modes = list(dict.fromkeys(scenario.partition(":")[0] for scenario in scenarios))
+    workdir = tempfile.mkdtemp(prefix="pms-startup-")
+    fake_servers = fakes.start_fakes(args)
+    env = dict(os.environ)
+    env.update(fakes.fake_env(fake_servers))
+    env.setdefault("TABLE_NAME", "ml_workload")
+    env.update({"ML_SYNC_ENABLED": "false", "PYTHONPATH": os.pathsep.join([SRC_DIR, BENCH_DIR])})
+
+    # 1. 모듈별 import 시간
+    runs = {mode: [import_times(mode, env, workdir) for _ in range(args.repeat)] for mode in modes}
+    medians = {mode: {name: _median([run[name] for run in mode_runs if name in run])
+                      for name in set().union(*mode_runs)} for mode, mode_runs in runs.items()}
+    interpreter = set(import_times(modes[0], env, workdir, code="pass"))  # 인터프리터 기동 시 import (site 등) 제외
+    ranked = sorted(set(medians[modes[0]]) - interpreter, key=lambda name: -(medians[modes[0]][name] or 0))
+    names = list(dict.fromkeys(TRACKED + [name for name in ranked if name.startswith("utils.")] + ranked[:args.top]))
+    print(f"import time (cumulative ms, median of {args.repeat})")
+    print(f"{'module':45s}" + "".join(f"{mode:>12s}" for mode in modes))
+    for name in names:
+        print(f"{name:45s}" + "".join(f"{str(medians[mode].get(name, '-')):>12s}" for mode in modes))
+
+    # 2. 기동 -> 응답 가능 시간, 첫 요청 지연시간
+    startup = []
+    for scenario in scenarios:
+        results = [measure_startup(scenario, env, workdir, fake_servers["argo"].port) for _ in range(args.repeat)]
+        routes = results[0]["first_request_ms"]
+        startup.append({
+            "scenario": scenario,
+            "ready_ms": _median([r["ready_ms"] for r in results]),
+            "first_request_ms": {name: _median([r["first_request_ms"][name] for r in results]) for name in routes},
+            "errors": [r["errors"] for r in results if r.get("errors")],
+            "loaded_after_requests": results[-1]["loaded"],
+        })
+    print(f"\nstartup (ms, median of {args.repeat})")
+    print(f"{'scenario':18s}{'ready':>9s}" + "".join(f"{name:>11s}" for name in routes))
+    for row in startup:
+        print(f"{row['scenario']:18s}{row['ready_ms']:9.1f}" +
+              "".join(f"{value:11.1f}" for value in row["first_request_ms"].values()) +
+              (f"  errors={row['errors']}" if row["errors"] else ""))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"environment": {"python": platform.python_version(), "cpus": os.cpu_count(),
+                                       "platform": platform.platform()},
+                       "repeat": args.repeat, "import_ms": medians, "startup": startup}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
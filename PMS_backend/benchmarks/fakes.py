@@ -0,0 +1,274 @@
+"""부하 테스트용 로컬 stand-in 서버 (STRATO / 추천 서버 / Argo server).
+
+각 서버는 latency(초, 평균)와 error_rate(0~1)를 받아 응답을 지연/실패시킨다.
+
+    python benchmarks/fakes.py --strato-port 18080 --recommender-port 18081 --argo-port 18443
+    # 출력되는 환경변수를 PMS_backend 서버 실행 환경에 설정
+"""
+import os
+import ssl
+import json
+import time
+import random
+import string
+import argparse
+import datetime
+import tempfile
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, handler, port=0, latency=0.0, error_rate=0.0):
+        super().__init__(("127.0.0.1", port), handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name=f"fake-{type(self).__name__}", daemon=True)
+        thread.start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _simulate(self):
+        # 지연 (지수 분포 -> tail latency 재현) + 확률적 5xx
+        with self.server._lock:
+            self.server.requests += 1
+        if self.server.latency > 0:
+            time.sleep(random.expovariate(1 / self.server.latency))
+        if self.server.error_rate > 0 and random.random() < self.server.error_rate:
+            self._send(503, {"code": "50000", "message": "injected failure"})
+            return False
+        return True
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _StratoHandler(_Handler):
+    def do_POST(self):
+        body = self._body()
+        if not self._simulate():
+            return
+        path = urlparse(self.path).path
+        if path.endswith("/ml/apply"):
+            data = json.loads(body)
+            workload = {
+                "id": str(random.randrange(1 << 30)),
+                "mlId": data["mlId"],
+                "name": data["name"],
+                "namespace": data["namespace"],
+                "description": data["description"],
+                "mlStepCode": data["mlStepCode"],
+                "status": "Waiting",
+                "userId": data["userId"],
+                "clusterIdx": str(data["clusterIdx"]),
+            }
+            with self.server._lock:
+                self.server.workloads[workload["mlId"]] = workload
+            self._send(200, {"code": "10001", "message": "success", "result": {"success": True, "workload": workload}})
+        elif path.endswith("/ml/list"):
+            with self.server._lock:
+                workloads = list(self.server.workloads.values())
+            self._send(200, {"code": "10001", "message": "success", "result": workloads})
+        else:
+            self._send(404, {"code": "40400", "message": f"unknown path {path}"})
+
+    def do_DELETE(self):
+        body = self._body()
+        if not self._simulate():
+            return
+        mlid = json.loads(body or b"{}").get("mlId")
+        with self.server._lock:
+            self.server.workloads.pop(mlid, None)
+        self._send(200, {"code": "10001", "message": f"deleted {mlid}"})
+
+
+class FakeStrato(FakeServer):
+    def __init__(self, port=0, latency=0.05, error_rate=0.0):
+        super().__init__(_StratoHandler, port, latency, error_rate)
+        self.workloads = {}
+
+
+class _RecommenderHandler(_Handler):
+    def do_POST(self):
+        body = self._body()
+        if not self._simulate():
+            return
+        case = json.loads(body or b"{}").get("case", "")
+        # 라벨별로 고정된 값 (cpu는 x100 단위)
+        seed = sum(case.encode("utf-8"))
+        cpu, mem = 50 + seed % 400, 256 + seed % 4096
+        self._send(200, {"result": {"requests": [[[cpu, mem]]], "limits": [[[cpu * 2, mem * 2]]]}})
+
+
+class FakeRecommender(FakeServer):
+    def __init__(self, port=0, latency=0.02, error_rate=0.0):
+        super().__init__(_RecommenderHandler, port, latency, error_rate)
+
+
+def _workflow(index, now):
+    phase = random.choices(["Succeeded", "Failed", "Running", "Error"], [70, 10, 15, 5])[0]
+    started = now - random.uniform(60, 86400)
+    finished = None if phase == "Running" else started + random.uniform(10, 3600)
+    fmt = "%Y-%m-%dT%H:%M:%SZ"
+    suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=5))
+    return {
+        "metadata": {"name": f"bench-pipeline-{index % 20}-{suffix}", "resourceVersion": str(index + 1)},
+        "status": {
+            "phase": phase,
+            "startedAt": time.strftime(fmt, time.gmtime(started)),
+            "finishedAt": None if finished is None else time.strftime(fmt, time.gmtime(finished)),
+        },
+    }
+
+
+class _ArgoHandler(_Handler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.startswith("/api/v1/workflow-events/"):
+            self._watch(query)
+            return
+        if not url.path.startswith("/api/v1/workflows/"):
+            self._send(404, {"code": 5, "message": "not found"})
+            return
+        if not self._simulate():
+            return
+        items = self.server.workflows
+        limit = int(query.get("listOptions.limit", ["0"])[0] or 0)
+        offset = int(query.get("listOptions.continue", ["0"])[0] or 0)
+        end = offset + limit if limit else len(items)
+        self._send(200, {
+            "metadata": {"resourceVersion": str(len(items)), "continue": str(end) if end < len(items) else ""},
+            "items": items[offset:end],
+        })
+
+    def _watch(self, query):
+        # 변경 이벤트 없이 timeoutSeconds 동안 연결 유지 (informer 재연결 루프 방지)
+        timeout = min(float(query.get("listOptions.timeoutSeconds", ["30"])[0]), self.server.watch_timeout)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(timeout)
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def _self_signed_context():
+    # argo_host_url은 항상 https -> cryptography로 임시 인증서 생성
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+            .serial_number(x509.random_serial_number()).not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=7)).sign(key, hashes.SHA256()))
+    directory = tempfile.mkdtemp(prefix="pms-bench-")
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+class FakeArgo(FakeServer):
+    def __init__(self, port=0, latency=0.02, error_rate=0.0, workflows=200, watch_timeout=30):
+        super().__init__(_ArgoHandler, port, latency, error_rate)
+        now = time.time()
+        self.workflows = [_workflow(i, now) for i in range(workflows)]
+        self.watch_timeout = watch_timeout
+        self.context = _self_signed_context()
+
+    def finish_request(self, request, client_address):
+        # TLS handshake는 accept 스레드가 아닌 요청 처리 스레드에서 수행
+        try:
+            request = self.context.wrap_socket(request, server_side=True)
+        except (ssl.SSLError, OSError):
+            return
+        super().finish_request(request, client_address)
+
+
+def add_arguments(parser):
+    parser.add_argument("--strato-port", type=int, default=0)
+    parser.add_argument("--strato-latency", type=float, default=0.05)
+    parser.add_argument("--strato-error-rate", type=float, default=0.0)
+    parser.add_argument("--recommender-port", type=int, default=0)
+    parser.add_argument("--recommender-latency", type=float, default=0.02)
+    parser.add_argument("--recommender-error-rate", type=float, default=0.0)
+    parser.add_argument("--argo-port", type=int, default=0)
+    parser.add_argument("--argo-latency", type=float, default=0.02)
+    parser.add_argument("--argo-error-rate", type=float, default=0.0)
+    parser.add_argument("--argo-workflows", type=int, default=200)
+
+
+def start_fakes(args):
+    fakes = {
+        "strato": FakeStrato(args.strato_port, args.strato_latency, args.strato_error_rate).start(),
+        "recommender": FakeRecommender(args.recommender_port, args.recommender_latency,
+                                       args.recommender_error_rate).start(),
+        "argo": FakeArgo(args.argo_port, args.argo_latency, args.argo_error_rate, args.argo_workflows).start(),
+    }
+    return fakes
+
+
+def fake_env(fakes):
+    # PMS_backend가 fake 서버를 바라보도록 하는 환경변수
+    return {
+        "URL": f"http://127.0.0.1:{fakes['strato'].port}",
+        "TOKEN": "bench-token",
+        "RECOMMAND_SERVER": f"http://127.0.0.1:{fakes['recommender'].port}",
+        "BENCH_ARGO_PORT": str(fakes["argo"].port),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    args = parser.parse_args()
+    fakes = start_fakes(args)
+    for key, value in fake_env(fakes).items():
+        print(f"export {key}={value}")
+    print(f"# Argo: ip=127.0.0.1 port={fakes['argo'].port} ({args.argo_workflows} workflows)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""추천 리소스 정책이 클러스터 처리량에 미치는 영향 오프라인 시뮬레이션 (utils/simulator.py).
+
+preprocess -> train -> inference 형태의 파이프라인(resource_stress_pipeline, sllm_pipeline)에
+추천값(requests/limits)을 apply_recommendation으로 반영하고, 노드 N개 클러스터에서
+대기/배치/실행을 시뮬레이션해 makespan, 자원 점유율, 대기 시간, OOM 횟수를 비교한다.
+
+--grid로 지정한 값의 모든 조합(시나리오)을 실행한다 (--jobs 프로세스 병렬).
+
+    cd PMS_backend
+    python benchmarks/simulate.py --grid request_scale=0.5,0.75,1.0,1.25 --grid limit_scale=1.0,1.5 \\
+        --grid nodes=4,8,16 --grid policy=best_fit,spread --seeds 5 --out sweep.csv
+
+    # 추천값 / 실제 사용량 / step 시간 지정 (JSON)
+    python benchmarks/simulate.py --recommendations rec.json --usage usage.json --durations durations.json
+
+기본 추천값/사용량/sllm step 시간은 예시 값이므로 실제 비교에는 측정값(JSON)을 넘겨 사용한다.
+"""
+import io
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import itertools
+import contextlib
+import multiprocessing
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.resource_utils import apply_recommendation  # noqa: E402
+from utils.placement import parse_cpu, parse_memory  # noqa: E402
+from utils.simulator import ClusterSimulator, compile_pipeline  # noqa: E402
+
+# (step 이름, ml.workload 라벨, GPU limit)
+PIPELINE_SHAPES = {
+    # resource_stress_pipeline/pipeline.py: --time 5 / 40 / 5 (분)
+    "stress": [("resource-stress-preprocess", "preprocess", None),
+               ("resource-stress-train", "train", "1"),
+               ("resource-stress-inference", "inference", "1")],
+    # sllm/sllm_pipeline/pipeline.py
+    "sllm": [("preprocessing-alpaca-datasets", "preprocess", None),
+             ("training-alpaca-lora-model", "train", "1"),
+             ("inferencing-alpaca-lora-model", "inference", "1")],
+}
+DEFAULT_DURATIONS = {
+    "resource-stress-preprocess": 300, "resource-stress-train": 2400, "resource-stress-inference": 300,
+    "preprocessing-alpaca-datasets": 600, "training-alpaca-lora-model": 7200, "inferencing-alpaca-lora-model": 900,
+}
+# 라벨별 추천값 (fetch_recommendation 형식: cpu 코어, memory Mi)
+DEFAULT_RECOMMENDATIONS = {
+    "preprocess": {"req_cpu": 2.0, "req_mem": 2048, "lim_cpu": 4.0, "lim_mem": 4096},
+    "train": {"req_cpu": 4.0, "req_mem": 8192, "lim_cpu": 8.0, "lim_mem": 16384},
+    "inference": {"req_cpu": 2.0, "req_mem": 4096, "lim_cpu": 4.0, "lim_mem": 8192},
+}
+# 라벨별 실제 사용량 (평균, 변동계수)
+DEFAULT_USAGE = {
+    "preprocess": {"cpu": (1.8, 0.3), "memory": (1800, 0.3)},
+    "train": {"cpu": (3.5, 0.3), "memory": (7000, 0.35)},
+    "inference": {"cpu": (1.5, 0.3), "memory": (3500, 0.3)},
+}
+DEFAULTS = {"nodes": 8, "node_cpu": 32, "node_memory": "128Gi", "node_gpu": 4, "policy": "best_fit",
+            "request_scale": 1.0, "limit_scale": 1.0, "pipelines": 200, "interarrival": 0.0, "sllm_ratio": 0.5,
+            "oom_retries": 2}
+_CONFIG = {}
+_SHAPE_CACHE = {}
+
+
+def build_templates(shape, recommendations, request_scale, limit_scale):
+    # KFP 컴파일 결과와 같은 구조 (container step + dag) 에 추천값 반영
+    steps = []
+    for name, label, gpu in PIPELINE_SHAPES[shape]:
+        template = {"name": name, "container": {"image": "sim"}, "metadata": {"labels": {"ml.workload": label}}}
+        if gpu:
+            template["container"]["resources"] = {"limits": {"nvidia.com/gpu": gpu}}
+        rec = recommendations[label]
+        apply_recommendation(template, label, {
+            "req_cpu": rec["req_cpu"] * request_scale, "req_mem": int(rec["req_mem"] * request_scale),
+            "lim_cpu": rec["lim_cpu"] * limit_scale, "lim_mem": int(rec["lim_mem"] * limit_scale)})
+        if not gpu:
+            template["container"]["resources"]["limits"].pop("nvidia.com/gpu", None)
+        steps.append(template)
+    tasks = [{"name": s["name"], "template": s["name"], **({"dependencies": [steps[i - 1]["name"]]} if i else {})}
+             for i, s in enumerate(steps)]
+    return steps + [{"name": shape, "dag": {"tasks": tasks}}]
+
+
+def _compiled(shape, request_scale, limit_scale):
+    key = (shape, request_scale, limit_scale)
+    if key not in _SHAPE_CACHE:
+        with contextlib.redirect_stdout(io.StringIO()):  # apply_recommendation 출력 생략
+            templates = build_templates(shape, _CONFIG["recommendations"], request_scale, limit_scale)
+        _SHAPE_CACHE[key] = compile_pipeline(templates, _CONFIG["durations"])
+    return _SHAPE_CACHE[key]
+
+
+def run_scenario(scenario):
+    rng = np.random.default_rng(scenario["seed"])
+    node = [parse_cpu(scenario["node_cpu"]), parse_memory(scenario["node_memory"]), float(scenario["node_gpu"])]
+    simulator = ClusterSimulator(np.tile(node, (int(scenario["nodes"]), 1)), policy=scenario["policy"],
+                                 oom_retries=int(scenario["oom_retries"]))
+    count = int(scenario["pipelines"])
+    shapes = np.where(rng.random(count) < float(scenario["sllm_ratio"]), "sllm", "stress")
+    pipelines = [_compiled(shape, float(scenario["request_scale"]), float(scenario["limit_scale"])) for shape in shapes]
+    interarrival = float(scenario["interarrival"])
+    arrivals = np.cumsum(rng.exponential(interarrival, count)) if interarrival > 0 else np.zeros(count)
+    started = time.perf_counter()
+    result = simulator.run(pipelines, arrivals, _CONFIG["usage"], rng)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return {**scenario, **result}
+
+
+def _init_worker(config):
+    _CONFIG.update(config)
+
+
+def _load_json(path, default):
+    if not path:
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def parse_grid(values):
+    grid = {}
+    for value in values:
+        key, _, options = value.partition("=")
+        if key not in DEFAULTS:
+            raise SystemExit(f"unknown grid key '{key}' (choose from {sorted(DEFAULTS)})")
+        grid[key] = [option for option in options.split(",") if option]
+    return grid
+
+
+def _flatten(result):
+    row = dict(result)
+    for key, value in result["utilization"].items():
+        row[f"util_{key}"] = value
+    del row["utilization"]
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", action="append", default=[], help="key=v1,v2,... (keys: " + ", ".join(DEFAULTS) + ")")
+    parser.add_argument("--seeds", type=int, default=3, help="시나리오별 반복 (seed 개수)")
+    parser.add_argument("--recommendations", help="라벨별 추천값 JSON {label: {req_cpu, req_mem, lim_cpu, lim_mem}}")
+    parser.add_argument("--usage", help="라벨별 실제 사용량 JSON {label: {cpu: [mean, cv], memory: [mean, cv]}}")
+    parser.add_argument("--durations", help="step 이름 또는 라벨별 실행 시간(초) JSON")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--out", help="결과 파일 (.csv 또는 .json)")
+    args = parser.parse_args()
+
+    config = {
+        "recommendations": _load_json(args.recommendations, DEFAULT_RECOMMENDATIONS),
+        "usage": _load_json(args.usage, DEFAULT_USAGE),
+        "durations": {**DEFAULT_DURATIONS, **_load_json(args.durations, {})},
+    }
+    grid = {key: [value] for key, value in DEFAULTS.items()}
+    grid.update(parse_grid(args.grid))
+    keys = list(grid)
+    scenarios = [{**dict(zip(keys, values)), "seed": seed}
+                 for values in itertools.product(*(grid[key] for key in keys)) for seed in range(args.seeds)]
+
+    started = time.perf_counter()
+    if args.jobs > 1:
+        with multiprocessing.Pool(args.jobs, initializer=_init_worker, initargs=(config,)) as pool:
+            results = pool.map(run_scenario, scenarios, chunksize=max(1, len(scenarios) // (args.jobs * 8)))
+    else:
+        _init_worker(config)
+        results = [run_scenario(scenario) for scenario in scenarios]
+    elapsed = time.perf_counter() - started
+    print(f"{len(results)} scenarios in {elapsed:.2f}s ({len(results) / elapsed:.1f} scenarios/s, jobs={args.jobs})")
+
+    # 시나리오(seed 제외)별 평균
+    varying = [key for key in keys if len(grid[key]) > 1]
+    groups = {}
+    for result in results:
+        groups.setdefault(tuple(result[key] for key in varying), []).append(result)
+    print(" ".join(f"{key:>14s}" for key in varying) + f"{'makespan_h':>12s}{'pipe/h':>9s}{'cpu':>7s}{'mem':>7s}"
+          f"{'gpu':>7s}{'wait_min':>10s}{'oom':>6s}{'failed':>7s}")
+    for values, rows in groups.items():
+        mean = lambda key: float(np.mean([row[key] or 0 for row in rows]))  # noqa: E731
+        util = lambda key: float(np.mean([row["utilization"][key] for row in rows]))  # noqa: E731
+        print(" ".join(f"{str(value):>14s}" for value in values) +
+              f"{mean('makespan') / 3600:12.2f}{mean('throughput_per_hour'):9.2f}{util('cpu'):7.3f}"
+              f"{util('memory'):7.3f}{util('gpu'):7.3f}{mean('wait_mean') / 60:10.1f}{mean('oom_kills'):6.1f}"
+              f"{mean('failed'):7.1f}")
+
+    if args.out:
+        if args.out.endswith(".csv"):
+            rows = [_flatten(result) for result in results]
+            with open(args.out, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(args.out, "w") as f:
+                json.dump({"config": config, "grid": grid, "elapsed": elapsed, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
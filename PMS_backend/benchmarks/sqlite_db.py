@@ -0,0 +1,109 @@
+"""MySQL 없이 부하 테스트를 돌리기 위한 db_utils용 SQLite stand-in.
+
+db_utils가 사용하는 pymysql 인터페이스(connect/cursor/execute/ping) 중 필요한 부분만 흉내내고
+MySQL 전용 구문은 SQLite 구문으로 변환한다.
+
+- %s                                  -> ?
+- INSERT IGNORE                       -> INSERT OR IGNORE
+- ON DUPLICATE KEY UPDATE a=VALUES(a) -> ON CONFLICT DO UPDATE SET a=excluded.a
+- LAST_INSERT_ID(expr) / LAST_INSERT_ID() -> 커넥션 단위 사용자 함수
+- GREATEST(a, b)                      -> 사용자 함수
+
+SQLite는 쓰기를 DB 단위로 직렬화하므로 MySQL 대비 쓰기 경합 수치는 비관적으로 나온다.
+"""
+import re
+import sqlite3
+import functools
+
+_VALUES_REF = re.compile(r"VALUES\((\w+)\)")
+
+
+@functools.lru_cache(maxsize=256)
+def translate(query):
+    query = query.replace("%s", "?").replace("INSERT IGNORE", "INSERT OR IGNORE")
+    head, sep, updates = query.partition("ON DUPLICATE KEY UPDATE")
+    if sep:
+        query = head + "ON CONFLICT DO UPDATE SET" + _VALUES_REF.sub(r"excluded.\1", updates)
+    return query
+
+
+class SQLiteCursor:
+    def __init__(self, connection):
+        self._cursor = connection.raw.cursor()
+
+    def execute(self, query, args=None):
+        self._cursor.execute(translate(query), tuple(args) if args else ())
+        return max(self._cursor.rowcount, 0)
+
+    def executemany(self, query, args):
+        return sum(self.execute(query, row) for row in args)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path):
+        self.raw = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.raw.execute("PRAGMA journal_mode=WAL")
+        self.raw.execute("PRAGMA synchronous=NORMAL")
+        # MySQL LAST_INSERT_ID(expr) 동작: 값을 저장하고 그대로 반환
+        self._last_insert_id = 0
+        self.raw.create_function("LAST_INSERT_ID", 1, self._set_last_insert_id)
+        self.raw.create_function("LAST_INSERT_ID", 0, lambda: self._last_insert_id)
+        self.raw.create_function("GREATEST", 2, max)
+
+    def _set_last_insert_id(self, value):
+        self._last_insert_id = value
+        return value
+
+    def cursor(self, cursor_class=None):
+        return SQLiteCursor(self)
+
+    def ping(self, reconnect=False):
+        self.raw.execute("SELECT 1")
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+
+def install(path):
+    # db_utils의 커넥션 생성 함수를 교체 (풀 생성 전에 호출)
+    from utils import db_utils
+    db_utils._connect = lambda: SQLiteConnection(path)
+
+
+def create_schema():
+    # migrations의 MySQL 전용 구문(information_schema, ALTER ... AFTER)을 피해서 최종 스키마만 생성
+    from utils.db_utils import get_db_info
+    from utils.migrations import _create_workload_table, _create_mlid_sequence
+
+    with get_db_info() as (connection, cursor, table):
+        _create_workload_table(cursor, table)
+        columns = {row[1] for row in connection.raw.execute(f"PRAGMA table_info({table})")}
+        if "mlSeq" not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN mlSeq INTEGER")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_name ON {table} (name)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_mlseq ON {table} (mlSeq)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cluster_status ON {table} (clusterIdx, status)")
+        _create_mlid_sequence(cursor, table)
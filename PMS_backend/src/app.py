@@ -1,23 +1,77 @@
 import os
+import json
+import itertools
 from flask_cors import CORS
-from dotenv import load_dotenv
-from flask import Flask, request
+from flask import Flask, Response, request, send_file, stream_with_context
 
-from utils.ml_utils import ml_post_handler
-from utils.resource_utils import parse_recommend
-from utils.argo_utils import load_argo_info, get_workflow_info_from_instance
-from utils.db_utils import update_mldb, insert_ml_workload_info, remove_ml, get_next_mlid, get_current_ml_list
+from utils.ml_utils import parse_ml_request
+from utils.ml_jobs import ml_job_queue, QueueFullError
+from utils.manifest_utils import manifest_cache
+from utils.resource_utils import parse_recommend, iter_bulk_recommend, recommendation_cache, RECOMMEND_MODE
+from utils.local_recommender import local_recommender
+from utils.placement import cluster_registry, placement_advisor, pipeline_demand, DIMENSIONS
+from utils.argo_utils import load_argo_info, list_workflow_page, build_argo_table, stream_argo_table, get_argo_client_stats
+from utils.argo_informer import (iter_workflow_info_pages, get_workflow_info_batch, get_informer_stats,
+                                 history_source, record_workflow_history)
+from utils.workflow_history import workflow_history
+from utils.db_utils import update_mldb, insert_ml_workload_info, remove_ml, get_current_ml_list, get_db_pool_stats
+from utils.ml_reconciler import reconciler
+from utils.mlid_allocator import mlid_allocator
+from utils.migrations import run_migrations
+from utils.http_client import get_upstream_stats
+from utils.metrics import registry as metrics_registry, init_app_metrics
+from utils.profiler import request_profiler, init_app_profiler, profiling_active
+from utils.lifecycle import startup, startup_state
+from utils.settings import settings
+from utils import lazy
 
-# .env 파일에서 환경 변수 불러오기
-load_dotenv()
+# eager: 기존처럼 import 시점에 무거운 의존성(argo SDK, pymysql, yaml, requests, numpy)을 모두 로드
+if settings.startup_mode == "eager":
+    lazy.preload()
 
 app = Flask(__name__)
 CORS(app, resources={r"/api*": {"origins": "*"}})
+init_app_metrics(app)
+init_app_profiler(app)
 
 # 첫 번째 엔드포인트: 데이터베이스에 POST 요청 결과 저장
 @app.route('/api/v1/strato', methods=['POST'])
 def ml_post():
-    return ml_post_handler(request)
+    # 기본은 비동기: 입력 검증 후 job id와 함께 202 반환, 처리 결과는 jobs 엔드포인트로 조회
+    # 같은 내용의 중복 제출은 기존 job으로 합쳐 STRATO apply를 한 번만 호출
+    sync = request.args.get('sync', default=settings.ml_submit_sync, type=lambda value: value.lower() == "true")
+    try:
+        spec = parse_ml_request(request.get_json(silent=True))
+    except ValueError as e:
+        return {"status": "failure", "error": str(e)}, 400
+    spec["profile"] = profiling_active()
+    try:
+        job, deduplicated = ml_job_queue.submit(spec)
+    except QueueFullError as e:
+        return {"status": "failure", "error": str(e)}, 503, {"Retry-After": "5"}
+    if sync:
+        job = ml_job_queue.wait(job["id"], settings.ml_submit_sync_timeout)
+        if job["finished_at"] is not None:
+            return job["message"]
+    return ({"status": "accepted", "job_id": job["id"], "deduplicated": deduplicated, "job": job}, 202,
+            {"Location": f"/api/v1/strato/jobs/{job['id']}"})
+
+# 제출 job 상태 조회: queued / running / succeeded / failed
+@app.route('/api/v1/strato/jobs/<job_id>', methods=['GET'])
+def ml_job_status(job_id):
+    job = ml_job_queue.get(job_id)
+    if job is None:
+        return {"status": "failure", "error": f"Job '{job_id}' not found."}, 404
+    return {"status": "succeeded", "job": job}
+
+# STRATO ML 목록 강제 재동기화
+@app.route('/api/v1/strato/resync', methods=['POST'])
+def ml_resync():
+    try:
+        result = reconciler.sync(full=True)
+        return {"status": "succeeded", "result": result}
+    except Exception as e:
+        return {"status": "failure", "error": str(e)}, 500
 
 # 두 번째 엔드포인트: Argo Workflow 정보 가져오기
 @app.route('/api/v1/info', methods=['GET'])
@@ -26,14 +80,57 @@ def get_workflow_info():
     argo_port = request.args.get('port', default="30103")
     namespace = request.args.get('namespace', default='argo-test')
 
+    limit = request.args.get('limit', type=int)
+    continue_token = request.args.get('continue')
+
     if not argo_ip or not namespace:
         return {"status": "failure", "error": "IP and namespace are required query parameters."}, 400
     try:
-        api_instance = load_argo_info(argo_ip, argo_port)
-        workflows_info = get_workflow_info_from_instance(api_instance, namespace)
-        return {"status": "succeeded", "items": workflows_info}
+        if limit or continue_token:
+            # 클라이언트 페이지네이션: 한 페이지와 다음 continue 토큰 반환
+            page = list_workflow_page(load_argo_info(argo_ip, argo_port), namespace, limit, continue_token)
+            record_workflow_history(argo_ip, argo_port, namespace, page["items"])
+            return {"status": "succeeded", "items": build_argo_table(page["items"]), "continue": page["continue"]}
+        # 첫 페이지는 미리 가져와 연결 오류는 일반 실패 응답으로 반환
+        pages = iter_workflow_info_pages(argo_ip, argo_port, namespace)
+        first_page = next(pages, [])
     except Exception as e:
         return {"status": "failure", "error": str(e)}
+    return Response(stream_argo_table(itertools.chain([first_page], pages)), mimetype='application/json')
+
+# 여러 클러스터/네임스페이스 Workflow 정보 동시 조회
+@app.route('/api/v1/info/batch', methods=['POST'])
+def get_workflow_info_multi():
+    request_data = request.get_json(silent=True) or {}
+    targets = request_data.get('targets')
+    if not isinstance(targets, list) or not targets:
+        return {"status": "failure", "error": "targets must be a non-empty list of {ip, port, namespace}."}, 400
+    try:
+        timeout = float(request_data.get('timeout', settings.argo_batch_timeout))
+    except (TypeError, ValueError):
+        return {"status": "failure", "error": "timeout must be a number."}, 400
+    try:
+        batch = get_workflow_info_batch(targets, timeout)
+    except ValueError as e:
+        return {"status": "failure", "error": str(e)}, 400
+    return {"status": "succeeded", **batch}
+
+# 종료된 Workflow 소요 시간 통계 (파이프라인/phase별 p50/p90/p99, 성공률, 처리량)
+@app.route('/api/v1/analytics', methods=['GET'])
+def get_workflow_analytics():
+    window = request.args.get('window', default=86400, type=float)
+    group_by = request.args.get('group_by', default='name')
+    argo_ip = request.args.get('ip')
+    argo_port = request.args.get('port', default="30103")
+    namespace = request.args.get('namespace', default='argo-test')
+
+    if group_by not in ('name', 'phase'):
+        return {"status": "failure", "error": "group_by must be 'name' or 'phase'."}, 400
+    if window is None or window <= 0:
+        return {"status": "failure", "error": "window must be a positive number of seconds."}, 400
+    source = history_source(argo_ip, argo_port, namespace) if argo_ip else None
+    result = workflow_history.query(window, group_by, source)
+    return {"status": "succeeded", "window": window, "group_by": group_by, **result}
 
 # 세 번째 엔드포인트: Informer Prediction
 @app.route('/api/v1/predict', methods=['POST'])
@@ -45,6 +142,170 @@ def predict_resources():
     except Exception as e:
         return {"status": "failure", "error": str(e)}    
 
+class _InvalidLine:
+    def __init__(self, error):
+        self.error = error
+
+def _parse_ndjson_line(line):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return _InvalidLine(str(e))
+
+# 여러 파이프라인 일괄 추천: 라벨별 추천은 요청 전체에서 한 번만 조회, 파이프라인별 결과를 NDJSON 한 줄씩 스트리밍
+# 입력: {"pipelines": [[템플릿...] 또는 {"id": ..., "templates": [...]}, ...]} 또는 같은 항목을 한 줄씩 담은 NDJSON
+@app.route('/api/v1/predict/bulk', methods=['POST'])
+def predict_resources_bulk():
+    if request.mimetype == 'application/x-ndjson':
+        pipelines = (_parse_ndjson_line(line) for line in request.stream if line.strip())
+    else:
+        request_data = request.get_json(silent=True)
+        pipelines = request_data.get('pipelines') if isinstance(request_data, dict) else request_data
+        if not isinstance(pipelines, list):
+            return {"status": "failure", "error": "pipelines must be a list of template lists."}, 400
+    window = request.args.get('window', type=int)
+
+    def bulk_items():
+        # key: (index, id, 입력 파싱 오류)
+        for index, pipeline in enumerate(pipelines):
+            if isinstance(pipeline, _InvalidLine):
+                yield (index, None, pipeline.error), None
+            elif isinstance(pipeline, dict):
+                yield (index, pipeline.get('id'), None), pipeline.get('templates')
+            else:
+                yield (index, None, None), pipeline
+
+    def generate():
+        for (index, pipeline_id, parse_error), items, error in iter_bulk_recommend(bulk_items(), window):
+            line = {"index": index, "id": pipeline_id}
+            if parse_error is not None:
+                # 잘못된 줄은 해당 index만 실패로 반환하고 나머지 줄은 계속 처리
+                line.update(status="failure", error=f"Invalid NDJSON line: {parse_error}")
+            elif error is None:
+                line.update(status="succeeded", items=items)
+            else:
+                line.update(status="failure", error=error)
+            yield json.dumps(line) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# 라벨별 실제 사용량 수집 (로컬 추천기 학습용): {"samples": [{"label": ..., "cpu": 코어, "memory": Mi}, ...]}
+@app.route('/api/v1/recommend/usage', methods=['POST'])
+def ingest_usage():
+    request_data = request.get_json(silent=True)
+    samples = request_data.get('samples') if isinstance(request_data, dict) else None
+    if not isinstance(samples, list) or not all(isinstance(sample, dict) for sample in samples):
+        return {"status": "failure", "error": "samples must be a list of {label, cpu, memory}."}, 400
+    accepted = local_recommender.observe_many(
+        (sample.get('label'), sample.get('cpu'), sample.get('memory')) for sample in samples)
+    return {"status": "succeeded", "accepted": accepted, "rejected": len(samples) - accepted}
+
+# 로컬 추천기 상태 / 라벨별 추천값 확인
+@app.route('/api/v1/recommend/local', methods=['GET'])
+def get_local_recommendation():
+    label = request.args.get('label')
+    if not label:
+        return {"status": "succeeded", "mode": RECOMMEND_MODE, "labels": local_recommender.labels(),
+                "stats": local_recommender.stats()}
+    recommendation = local_recommender.recommend(label)
+    if recommendation is None:
+        return {"status": "failure", "error": f"Not enough usage samples for '{label}'."}, 404
+    return {"status": "succeeded", "label": label, "recommendation": recommendation}
+
+# 클러스터 용량/할당량 registry (placement advisor 입력)
+@app.route('/api/v1/clusters', methods=['GET'])
+def list_clusters():
+    return {"status": "succeeded", "clusters": cluster_registry.describe(), "placement": placement_advisor.stats()}
+
+# 클러스터 등록/갱신: {"name": ..., "capacity": {"cpu", "memory", "gpu"}, "allocated": {...}}
+@app.route('/api/v1/clusters/<int:cluster_idx>', methods=['PUT', 'DELETE'])
+def update_cluster(cluster_idx):
+    if request.method == 'DELETE':
+        if not cluster_registry.remove(cluster_idx):
+            return {"status": "failure", "error": f"Cluster {cluster_idx} not found."}, 404
+        return {"status": "succeeded"}
+    request_data = request.get_json(silent=True) or {}
+    try:
+        cluster_registry.update(cluster_idx, name=request_data.get('name'), capacity=request_data.get('capacity'),
+                                allocated=request_data.get('allocated'))
+    except (ValueError, AttributeError) as e:
+        return {"status": "failure", "error": str(e)}, 400
+    return {"status": "succeeded", "clusters": cluster_registry.describe()}
+
+# 여러 파이프라인 배치 계획 (예약 없음): 추천 리소스 반영 후 best-fit decreasing으로 클러스터 선택
+@app.route('/api/v1/placement', methods=['POST'])
+def plan_placement():
+    request_data = request.get_json(silent=True)
+    pipelines = request_data.get('pipelines') if isinstance(request_data, dict) else None
+    if not isinstance(pipelines, list):
+        return {"status": "failure", "error": "pipelines must be a list of template lists."}, 400
+    results, demands = [], []
+    for index, items, error in iter_bulk_recommend(enumerate(pipelines)):
+        if error is None:
+            try:
+                demands.append(pipeline_demand(items))
+                results.append({"index": index})
+                continue
+            except ValueError as e:
+                # 형식이 잘못된 파이프라인(DAG)은 요청 오류, 추천 실패만 항목별 error로 반환
+                return {"status": "failure", "error": f"pipelines[{index}]: {e}"}, 400
+        results.append({"index": index, "cluster": None, "error": error})
+    clusters, _ = placement_advisor.plan(demands)
+    placed = iter(zip(clusters, demands))
+    for result in results:
+        if "error" not in result:
+            cluster_idx, demand = next(placed)
+            result.update(cluster=cluster_idx, demand=dict(zip(DIMENSIONS, demand.round(3).tolist())))
+    return {"status": "succeeded", "items": results, "unplaced": sum(1 for r in results if r["cluster"] is None)}
+
+# 기동 상태 확인 (readiness/liveness probe): 지연 로드/ warmup 상태만 반환, 무거운 의존성은 로드하지 않음
+@app.route('/api/v1/health', methods=['GET'])
+def get_health():
+    return {"status": "succeeded", **startup_state()}
+
+# 런타임 상태 확인: DB 커넥션 풀 통계
+@app.route('/api/v1/stats', methods=['GET'])
+def get_runtime_stats():
+    return {"status": "succeeded", "db_pool": get_db_pool_stats(), "ml_reconciler": reconciler.stats(),
+            "mlid_allocator": mlid_allocator.stats(), "ml_jobs": ml_job_queue.stats(),
+            "manifest_cache": manifest_cache.stats(), "upstreams": get_upstream_stats(),
+            "recommend_cache": recommendation_cache.stats(), "argo_clients": get_argo_client_stats(),
+            "argo_informers": get_informer_stats(), "workflow_history": workflow_history.stats(),
+            "local_recommender": {"mode": RECOMMEND_MODE, **local_recommender.stats()},
+            "placement": placement_advisor.stats()}
+
+# Prometheus text format: route latency, in-flight, 외부 의존성(MySQL/STRATO/recommender/Argo) 호출 시간
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+# 저장된 요청 프로파일 목록 / 다운로드 (.prof, ?format=text 이면 pstats 요약)
+@app.route('/api/v1/admin/profiles', methods=['GET'])
+def list_profiles():
+    if not request_profiler.authorized(request.headers):
+        return {"status": "failure", "error": "Unauthorized."}, 403
+    return {"status": "succeeded", "profiler": request_profiler.stats(), "items": request_profiler.list()}
+
+@app.route('/api/v1/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    if not request_profiler.authorized(request.headers):
+        return {"status": "failure", "error": "Unauthorized."}, 403
+    if request.args.get('format') == 'text':
+        summary = request_profiler.summary(profile_id, sort=request.args.get('sort', 'cumulative'),
+                                           limit=request.args.get('limit', default=50, type=int))
+        if summary is None:
+            return {"status": "failure", "error": f"Profile '{profile_id}' not found."}, 404
+        return Response(summary, mimetype='text/plain')
+    path = request_profiler.path(profile_id)
+    if path is None:
+        return {"status": "failure", "error": f"Profile '{profile_id}' not found."}, 404
+    return send_file(os.path.abspath(path), mimetype='application/octet-stream',
+                     as_attachment=True, download_name=f"{profile_id}.prof")
+
 if __name__ == '__main__':
-    port = os.getenv("PYTHON_SERVER_PORT")
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    # 스키마 변경은 기동 시 한 번만 수행 (요청 핸들러에서는 스키마 확인 없음)
+    if settings.db_migrate_on_start:
+        run_migrations()
+    startup()
+    # reloader 부모 프로세스에서 reconciler / job worker / informer가 한 번 더 뜨지 않도록 reloader 비활성화
+    app.run(host='0.0.0.0', port=settings.python_server_port, debug=True, use_reloader=False)
\ No newline at end of file
@@ -0,0 +1,61 @@
+# 운영용 gunicorn 설정 (개발용은 python app.py)
+#   gunicorn -c gunicorn.conf.py wsgi:application
+# 제출 job 상태/중복 제출 map, reconciler, Argo informer, DB 풀, 메트릭은 워커 프로세스 단위로 유지된다.
+# -> 기본은 워커 1개 + 스레드 (여러 워커 사용 시 제약은 benchmarks/README.md 참고)
+import os
+import sys
+
+# gunicorn은 설정 파일을 읽은 뒤에 작업 디렉터리를 sys.path에 추가하므로 직접 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.settings import settings  # noqa: E402 (환경 변수/.env는 settings에서 한 번만 파싱)
+
+bind = f"0.0.0.0:{settings.python_server_port}"
+# 워커를 늘리면 job 조회/중복 제출 처리가 워커마다 달라지고 STRATO polling, DB 커넥션도 워커 수만큼 늘어남
+workers = max(1, min(settings.gunicorn_workers, settings.gunicorn_max_workers))
+# 요청 처리 시간 대부분이 STRATO/Argo/DB 대기이므로 스레드로 동시성 확보
+worker_class = "gthread"
+threads = settings.gunicorn_threads
+timeout = settings.gunicorn_timeout
+graceful_timeout = settings.gunicorn_graceful_timeout
+keepalive = settings.gunicorn_keepalive
+backlog = settings.gunicorn_backlog
+# preload 시에는 STARTUP_MODE=eager로 master에서 의존성을 모두 로드해 워커가 공유하도록 사용
+preload_app = settings.gunicorn_preload
+max_requests = settings.gunicorn_max_requests
+max_requests_jitter = settings.gunicorn_max_requests_jitter
+accesslog = settings.gunicorn_access_log or None
+errorlog = "-"
+loglevel = settings.gunicorn_log_level
+
+
+def on_starting(server):
+    if server.cfg.workers > 1:
+        server.log.warning(
+            "Running %d workers: ML job status/dedup, reconciler, Argo informers, DB pool and /metrics "
+            "are per worker (job polling may return 404 and identical submits may not be deduplicated).",
+            server.cfg.workers)
+    # 스키마 변경은 master에서 한 번만 수행 (워커마다 실행하지 않음)
+    if settings.db_migrate_on_start:
+        from utils.migrations import run_migrations
+        from utils.db_utils import reset_db_pool
+        run_migrations()
+        reset_db_pool()
+
+
+def post_fork(server, worker):
+    # preload 시 master에서 만든 커넥션/세션/스레드 풀을 워커에서 새로 생성하도록 정리
+    if server.cfg.preload_app:
+        from utils.lifecycle import reset_after_fork
+        reset_after_fork()
+
+
+def post_worker_init(worker):
+    # STARTUP_WARMUP=background(기본)이면 바로 요청을 받고 warmup은 별도 스레드에서 실행
+    from utils.lifecycle import startup
+    startup()
+
+
+def worker_exit(server, worker):
+    # 워커 프로세스에서 호출됨: 진행 중인 요청 처리가 끝난 뒤 남은 ML 제출 job 처리
+    from utils.lifecycle import drain
+    drain(max(server.cfg.graceful_timeout - 5, 1))
@@ -0,0 +1,364 @@
+import json
+import time
+import socket
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .argo_utils import (load_argo_info, iter_workflow_pages, workflow_summary,
+                         build_argo_table, argo_host_url, WORKFLOW_WATCH_FIELDS)
+from .workflow_history import workflow_history
+from .metrics import track_dependency
+from .settings import settings
+
+ARGO_INFORMER_ENABLED = settings.argo_informer_enabled
+_WATCH_TIMEOUT = settings.argo_watch_timeout
+_SYNC_TIMEOUT = settings.argo_informer_sync_timeout
+_MAX_IDLE = settings.argo_informer_max_idle
+_RETRY_BACKOFF = settings.argo_informer_retry_backoff
+_MAX_INFORMERS = max(1, settings.argo_informer_max_targets)
+
+
+class ResourceVersionExpired(Exception):
+    pass
+
+
+class WorkflowInformer:
+    """(클러스터, 네임스페이스) 단위 Workflow 캐시.
+
+    최초 1회 list로 채운 뒤 watch_workflows 이벤트로 갱신하고, 끊기면 마지막
+    resourceVersion부터 watch를 재개한다 (만료 시 다시 list).
+    """
+
+    def __init__(self, argo_ip, argo_port, namespace, name):
+        self.argo_ip = argo_ip
+        self.argo_port = argo_port
+        self.namespace = namespace
+        self.name = name
+
+        self._items = {}  # workflow name -> summary
+        self._lock = threading.Lock()
+        self._resource_version = None
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._connected = False
+        self._last_sync = None  # 마지막 relist 또는 watch 이벤트/bookmark 수신 시각
+        self._last_read = time.monotonic()
+        self._lists = 0
+        self._events = 0
+        self._errors = 0
+        self._last_error = None
+        self._response = None
+        self._thread = threading.Thread(target=self._run, name=f"argo-informer-{name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._interrupt_watch()
+
+    def _interrupt_watch(self):
+        # 대기 중인 watch 스트림의 소켓을 끊어 스레드와 Argo 연결을 바로 정리
+        # (response.close()는 읽기 중인 스레드가 buffer lock을 잡고 있어 다음 이벤트까지 대기함)
+        sock = getattr(getattr(self._response, "_connection", None), "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    @property
+    def api_instance(self):
+        # 매번 registry에서 가져와 클라이언트가 idle로 정리되지 않도록 함
+        return load_argo_info(self.argo_ip, self.argo_port)
+
+    def wait_synced(self, timeout):
+        if not self._synced.is_set() and self._last_error is not None:
+            # 초기 list가 실패 중이면 기다리지 않음
+            return False
+        return self._synced.wait(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                self._watch()
+            except ResourceVersionExpired:
+                print(f"Argo informer {self.name}: resourceVersion expired, relisting")
+                self._resource_version = None
+            except Exception as e:
+                self._connected = False
+                if self._stop.is_set():
+                    break
+                self._errors += 1
+                self._last_error = str(e)
+                print(f"Error: Argo informer {self.name} failed: {e}")
+                print(traceback.format_exc())
+                self._stop.wait(_RETRY_BACKOFF)
+            if time.monotonic() - self._last_read > _MAX_IDLE:
+                # 아무도 조회하지 않는 캐시는 watch 중단
+                self._stop.set()
+        self._connected = False
+
+    def _relist(self):
+        # projection + 페이지 단위 list, watch는 첫 페이지의 resourceVersion부터 시작
+        items = {}
+        resource_version = None
+        for page in iter_workflow_pages(self.api_instance, self.namespace):
+            if resource_version is None:
+                resource_version = page["resourceVersion"]
+            for summary in page["items"]:
+                items[summary['name']] = summary
+        with self._lock:
+            self._items = items
+        workflow_history.record(self.name, items.values())
+        self._resource_version = resource_version
+        self._lists += 1
+        self._last_error = None
+        self._last_sync = time.monotonic()
+        self._synced.set()
+
+    def _watch(self):
+        # watch 스트림 자체는 길게 유지되므로 연결 수립까지만 측정
+        with track_dependency("argo", "watch_workflows"):
+            response = self.api_instance.watch_workflows(
+                self.namespace,
+                list_options_resource_version=self._resource_version,
+                list_options_timeout_seconds=str(_WATCH_TIMEOUT),
+                list_options_allow_watch_bookmarks=True,
+                fields=WORKFLOW_WATCH_FIELDS,
+                _preload_content=False,
+                _request_timeout=(10, _WATCH_TIMEOUT + 30),
+            )
+        self._response = response
+        if self._stop.is_set():
+            # 연결 수립 중에 stop()이 호출된 경우
+            self._interrupt_watch()
+        self._connected = True
+        try:
+            for line in response:
+                if self._stop.is_set():
+                    break
+                line = line.strip()
+                if line:
+                    self._handle(json.loads(line))
+        finally:
+            self._connected = False
+            self._response = None
+            if self._stop.is_set():
+                response.close()
+            response.release_conn()
+
+    def _handle(self, message):
+        if 'error' in message:
+            error = message['error']
+            if error.get('code') == 410 or 'too old' in str(error.get('message', '')):
+                raise ResourceVersionExpired()
+            raise RuntimeError(f"watch error: {error}")
+
+        event = message.get('result') or {}
+        obj = event.get('object')
+        if not obj:
+            return
+        if event.get('type') == 'BOOKMARK':
+            # 변경 없음: resourceVersion만 갱신 (이벤트가 없는 동안에도 lag 측정 기준)
+            resource_version = (obj.get('metadata') or {}).get('resourceVersion')
+            if resource_version:
+                self._resource_version = resource_version
+            self._last_sync = time.monotonic()
+            return
+        summary = workflow_summary(obj)
+        with self._lock:
+            if event.get('type') == 'DELETED':
+                self._items.pop(summary['name'], None)
+            else:
+                self._items[summary['name']] = summary
+        if summary['finishedAt']:
+            workflow_history.record(self.name, [summary])
+        resource_version = (obj.get('metadata') or {}).get('resourceVersion')
+        if resource_version:
+            self._resource_version = resource_version
+        self._events += 1
+        self._last_sync = time.monotonic()
+
+    def snapshot(self):
+        self._last_read = time.monotonic()
+        with self._lock:
+            summaries = list(self._items.values())
+        # argo-server 정렬과 동일하게: 실행 중 -> 종료된 것, 각각 최신순
+        summaries.sort(key=lambda s: s['finishedAt'] or s['startedAt'] or '', reverse=True)
+        summaries.sort(key=lambda s: s['finishedAt'] is not None)
+        return summaries
+
+    def lag(self):
+        # 연결 여부와 관계없이 마지막 relist / 이벤트 / bookmark 이후 경과 시간
+        if self._last_sync is None:
+            return None
+        return time.monotonic() - self._last_sync
+
+    def stats(self):
+        lag = self.lag()
+        with self._lock:
+            size = len(self._items)
+        return {
+            "workflows": size,
+            "connected": self._connected,
+            "lag_seconds": None if lag is None else round(lag, 3),
+            "resource_version": self._resource_version,
+            "lists": self._lists,
+            "events": self._events,
+            "errors": self._errors,
+            "last_error": self._last_error,
+        }
+
+
+_informers = OrderedDict()  # LRU, 최대 ARGO_INFORMER_MAX_TARGETS개
+_informers_lock = threading.Lock()
+
+
+def history_source(argo_ip, argo_port, namespace):
+    # informer 이름과 동일한 키로 workflow 이력 구분
+    return f"{argo_host_url(argo_ip, argo_port)}/{namespace}"
+
+
+def record_workflow_history(argo_ip, argo_port, namespace, summaries):
+    workflow_history.record(history_source(argo_ip, argo_port, namespace), summaries)
+    return summaries
+
+
+def get_informer(argo_ip, argo_port, namespace):
+    # 요청 파라미터마다 watch 스레드가 무한히 늘지 않도록 가장 오래 조회되지 않은 informer부터 중단
+    key = (argo_host_url(argo_ip, argo_port), namespace)
+    evicted = []
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None or informer.stopped:
+            informer = WorkflowInformer(argo_ip, argo_port, namespace, history_source(argo_ip, argo_port, namespace))
+            _informers[key] = informer
+            informer.start()
+        _informers.move_to_end(key)
+        while len(_informers) > _MAX_INFORMERS:
+            evicted.append(_informers.popitem(last=False)[1])
+    for old in evicted:
+        print(f"Argo informer {old.name}: evicted (max {_MAX_INFORMERS} targets)")
+        old.stop()
+    return informer
+
+
+def _synced_informer(argo_ip, argo_port, namespace, timeout=None):
+    if not ARGO_INFORMER_ENABLED:
+        return None
+    informer = get_informer(argo_ip, argo_port, namespace)
+    if informer.wait_synced(_SYNC_TIMEOUT if timeout is None else min(timeout, _SYNC_TIMEOUT)):
+        return informer
+    print(f"Argo informer {informer.name} not synced yet, falling back to list")
+    return None
+
+
+def get_workflow_info(argo_ip, argo_port, namespace, timeout=None):
+    # informer 캐시에서 응답, 초기 동기화가 늦으면 직접 list로 대체 (timeout은 informer 대기 + list 전체 시간)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    informer = _synced_informer(argo_ip, argo_port, namespace, timeout)
+    if informer is not None:
+        return build_argo_table(informer.snapshot())
+    api_instance = load_argo_info(argo_ip, argo_port)
+    argo_table = {}
+    for page in iter_workflow_pages(api_instance, namespace, deadline=deadline):
+        summaries = record_workflow_history(argo_ip, argo_port, namespace, page["items"])
+        argo_table.update(build_argo_table(summaries, start=len(argo_table)))
+    return argo_table
+
+
+def iter_workflow_info_pages(argo_ip, argo_port, namespace):
+    # 스트리밍 응답용: workflow summary 목록을 페이지 단위로 반환
+    informer = _synced_informer(argo_ip, argo_port, namespace)
+    if informer is not None:
+        return iter([informer.snapshot()])
+    api_instance = load_argo_info(argo_ip, argo_port)
+    return (record_workflow_history(argo_ip, argo_port, namespace, page["items"])
+            for page in iter_workflow_pages(api_instance, namespace))
+
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor():
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(max_workers=settings.argo_batch_workers,
+                                                     thread_name_prefix="argo-batch")
+    return _batch_executor
+
+
+def _timed_workflow_info(argo_ip, argo_port, namespace, deadline):
+    # 실행 대기 중 지난 시간을 제외한 남은 시간만 Argo 요청 timeout으로 사용 (끝난 요청이 batch 스레드를 잡고 있지 않도록)
+    started = time.monotonic()
+    remaining = deadline - started
+    if remaining <= 0:
+        return {"status": "timeout", "error": "Deadline exceeded before the request started.", "latency_ms": 0.0}
+    try:
+        result = {"status": "succeeded", "items": get_workflow_info(argo_ip, argo_port, namespace, remaining)}
+    except Exception as e:
+        result = {"status": "failure", "error": str(e)}
+    result["latency_ms"] = round((time.monotonic() - started) * 1000, 3)
+    return result
+
+
+def get_workflow_info_batch(targets, timeout=10):
+    # 여러 (클러스터, 네임스페이스)를 동시에 조회, 느린 대상은 timeout으로 분리
+    if not all(isinstance(target, dict) for target in targets):
+        raise ValueError("Each target must be an object of {ip, port, namespace}.")
+    started = time.monotonic()
+    deadline = started + timeout
+    results, futures = [], []
+    for target in targets:
+        result = {
+            "ip": target.get("ip"),
+            "port": target.get("port", "30103"),
+            "namespace": target.get("namespace", "argo-test"),
+        }
+        results.append(result)
+        if not result["ip"] or not result["namespace"]:
+            result.update({"status": "failure", "error": "IP and namespace are required.", "latency_ms": 0.0})
+            futures.append(None)
+            continue
+        futures.append(_get_batch_executor().submit(
+            _timed_workflow_info, result["ip"], result["port"], result["namespace"], deadline))
+
+    for result, future in zip(results, futures):
+        if future is None:
+            continue
+        try:
+            result.update(future.result(timeout=max(0, deadline - time.monotonic())))
+        except FutureTimeoutError:
+            future.cancel()
+            result.update({"status": "timeout", "latency_ms": round(timeout * 1000, 3),
+                           "error": f"No response within {timeout}s."})
+    return {"targets": results, "elapsed_ms": round((time.monotonic() - started) * 1000, 3)}
+
+
+def reset_informers():
+    # fork 이후: 부모의 watch 스레드는 워커에 없으므로 informer와 batch 스레드 풀을 새로 만듦
+    global _batch_executor
+    with _informers_lock:
+        informers = list(_informers.values())
+        _informers.clear()
+    for informer in informers:
+        informer.stop()
+    with _batch_executor_lock:
+        _batch_executor = None
+
+
+def get_informer_stats():
+    with _informers_lock:
+        informers = list(_informers.values())
+    return {informer.name: informer.stats() for informer in informers if not informer.stopped}
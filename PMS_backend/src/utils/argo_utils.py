@@ -1,60 +1,185 @@
+import json
 import time
-import datetime
-import argo_workflows
-from argo_workflows.api import workflow_service_api
+import calendar
+import threading
+from .lazy import lazy_module
+from .metrics import timed_dependency
+from .settings import settings
 
-def load_argo_info(argo_ip, argo_port=None):
+# 생성된 SDK가 커서 import 비용이 큼 -> 첫 클라이언트 생성 시 로드
+argo_workflows = lazy_module("argo_workflows")
+workflow_service_api = lazy_module("argo_workflows.api.workflow_service_api")
+
+# (host_url) -> [api_instance, api_client, last_used]
+# Flask 스레드 간에 공유: urllib3 PoolManager는 thread-safe 하므로 클라이언트 재사용 가능
+_argo_clients = {}
+_argo_clients_lock = threading.Lock()
+_ARGO_CLIENT_MAX_IDLE = settings.argo_client_max_idle
+_ARGO_POOL_MAXSIZE = settings.argo_pool_maxsize
+
+def argo_host_url(argo_ip, argo_port=None):
     # 포트가 존재하지 않을 경우 경로를 직접 설정
     if argo_port == "" or argo_port is None:
-        host_url = f"https://{argo_ip.rstrip('/')}/argo-server"
-    else:
-        host_url = f"https://{argo_ip}:{argo_port}"
+        return f"https://{argo_ip.rstrip('/')}/argo-server"
+    return f"https://{argo_ip}:{argo_port}"
 
-    configuration = argo_workflows.Configuration(host=host_url)
-    configuration.verify_ssl = False
+def _close_argo_client(api_client):
+    try:
+        api_client.close()
+        api_client.rest_client.pool_manager.clear()
+    except Exception as e:
+        print(f"Error closing Argo client: {e}")
 
-    api_client = argo_workflows.ApiClient(configuration)
-    api_instance = workflow_service_api.WorkflowServiceApi(api_client)
+def _evict_idle_argo_clients_locked(now):
+    for host_url, (_, api_client, last_used) in list(_argo_clients.items()):
+        if now - last_used > _ARGO_CLIENT_MAX_IDLE:
+            del _argo_clients[host_url]
+            _close_argo_client(api_client)
+            print(f"Evicted idle Argo client for {host_url}")
+
+def load_argo_info(argo_ip, argo_port=None):
+    host_url = argo_host_url(argo_ip, argo_port)
+    now = time.monotonic()
+    with _argo_clients_lock:
+        _evict_idle_argo_clients_locked(now)
+        entry = _argo_clients.get(host_url)
+        if entry is not None:
+            entry[2] = now
+            return entry[0]
+
+        configuration = argo_workflows.Configuration(host=host_url)
+        configuration.verify_ssl = False
+        configuration.connection_pool_maxsize = _ARGO_POOL_MAXSIZE
+
+        api_client = argo_workflows.ApiClient(configuration)
+        api_instance = workflow_service_api.WorkflowServiceApi(api_client)
+        _argo_clients[host_url] = [api_instance, api_client, now]
     return api_instance
 
-def get_workflow_info_from_instance(api_instance, namespace):
-    workflow_list = api_instance.list_workflows(namespace, _check_return_type=False).to_dict()
-    
-    argo_table = {}
-    if workflow_list['items']:
-        for i in range(len(workflow_list['items'])):
-            workflow_name = workflow_list['items'][i]['metadata']['name']
-            workflow_status = workflow_list['items'][i]['status']['phase']
-            target = workflow_list['items'][i]['status']['finishedAt']
-
-            start_time = time.mktime(datetime.datetime.strptime(workflow_list['items'][i]['status']['startedAt'], '%Y-%m-%dT%H:%M:%SZ').timetuple()) 
-            if target:
-                end_time = time.mktime(datetime.datetime.strptime(workflow_list['items'][i]['status']['finishedAt'], '%Y-%m-%dT%H:%M:%SZ').timetuple()) 
-            else:
-                now = str(datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'))
-                end_time = time.mktime(datetime.datetime.strptime(now, '%Y-%m-%dT%H:%M:%SZ').timetuple())
-
-            split_duration = str(datetime.timedelta(seconds=end_time - start_time)).split(':')
-            
-            # 시간 형식 조정
-            if ' day' in split_duration[0]:
-                days_hours = split_duration[0].split()
-                days = int(days_hours[0])
-                hours = int(days_hours[2]) + (days * 24)
-                split_duration[0] = str(hours)
-                
-            split_duration = [str(int(x)) for x in split_duration]
-            if split_duration[0] == '0':
-                if split_duration[1] == '0':
-                    workflow_duration = split_duration[2] + 's'
-                else:
-                    workflow_duration = split_duration[1] + 'm ' + split_duration[2] + 's'
-            else:
-                workflow_duration = split_duration[0] + 'h ' + split_duration[1] + 'm ' + split_duration[2] + 's'
-            
-            argo_table[i] = {
-                'name': workflow_name,
-                'status': workflow_status,
-                'duration': workflow_duration
-            }
-    return argo_table
\ No newline at end of file
+def reset_argo_clients():
+    # fork 이후 워커에서 부모의 커넥션을 공유하지 않도록 초기화
+    with _argo_clients_lock:
+        clients = list(_argo_clients.values())
+        _argo_clients.clear()
+    for _, api_client, _ in clients:
+        _close_argo_client(api_client)
+
+def get_argo_client_stats():
+    now = time.monotonic()
+    with _argo_clients_lock:
+        return {
+            host_url: {"idle_seconds": round(now - last_used, 3)}
+            for host_url, (_, _, last_used) in _argo_clients.items()
+        }
+
+# argo-server에서 필요한 필드만 받아오도록 projection (status.nodes, spec 등 제외)
+WORKFLOW_LIST_FIELDS = ",".join([
+    "metadata.resourceVersion",
+    "metadata.continue",
+    "items.metadata.name",
+    "items.status.phase",
+    "items.status.startedAt",
+    "items.status.finishedAt",
+])
+WORKFLOW_WATCH_FIELDS = ",".join([
+    "result.type",
+    "result.object.metadata.name",
+    "result.object.metadata.resourceVersion",
+    "result.object.status.phase",
+    "result.object.status.startedAt",
+    "result.object.status.finishedAt",
+])
+ARGO_PAGE_SIZE = settings.argo_page_size
+
+def parse_timestamp(value):
+    # 'YYYY-MM-DDTHH:MM:SSZ' -> epoch seconds (strptime 대비 고정 위치 슬라이싱)
+    return calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                            int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0))
+
+def format_duration(seconds):
+    seconds = max(0, int(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours == 0:
+        if minutes == 0:
+            return f"{seconds}s"
+        return f"{minutes}m {seconds}s"
+    return f"{hours}h {minutes}m {seconds}s"
+
+def workflow_summary(item):
+    # Workflow 객체(dict)에서 목록 표시에 필요한 필드만 추출
+    status = item.get('status') or {}
+    return {
+        'name': item['metadata']['name'],
+        'phase': status.get('phase'),
+        'startedAt': status.get('startedAt'),
+        'finishedAt': status.get('finishedAt'),
+    }
+
+def workflow_duration(started_at, finished_at, now=None):
+    if not started_at:
+        return "0s"
+    end_time = parse_timestamp(finished_at) if finished_at else (now or time.time())
+    return format_duration(end_time - parse_timestamp(started_at))
+
+def workflow_row(summary, now=None):
+    return {
+        'name': summary['name'],
+        'status': summary['phase'],
+        'duration': workflow_duration(summary['startedAt'], summary['finishedAt'], now)
+    }
+
+def build_argo_table(summaries, start=0):
+    now = time.time()
+    return {i: workflow_row(summary, now) for i, summary in enumerate(summaries, start)}
+
+@timed_dependency("argo", "list_workflows")
+def list_workflow_page(api_instance, namespace, limit=None, continue_token=None, request_timeout=None):
+    # 모델 객체 변환 없이 projection된 JSON을 바로 파싱
+    kwargs = {"fields": WORKFLOW_LIST_FIELDS, "_preload_content": False}
+    if limit:
+        kwargs["list_options_limit"] = str(limit)
+    if continue_token:
+        kwargs["list_options_continue"] = continue_token
+    if request_timeout:
+        kwargs["_request_timeout"] = request_timeout
+    response = api_instance.list_workflows(namespace, **kwargs)
+    workflow_list = json.loads(response.data)
+    metadata = workflow_list.get('metadata') or {}
+    return {
+        "items": [workflow_summary(item) for item in workflow_list.get('items') or []],
+        "continue": metadata.get('continue') or None,
+        "resourceVersion": metadata.get('resourceVersion'),
+    }
+
+def iter_workflow_pages(api_instance, namespace, page_size=None, request_timeout=None, deadline=None):
+    # deadline(time.monotonic 기준)이 있으면 페이지마다 남은 시간을 요청 timeout으로 사용
+    continue_token = None
+    while True:
+        if deadline is not None:
+            request_timeout = deadline - time.monotonic()
+            if request_timeout <= 0:
+                raise TimeoutError("Deadline exceeded while listing workflows.")
+        page = list_workflow_page(api_instance, namespace, page_size or ARGO_PAGE_SIZE, continue_token, request_timeout)
+        yield page
+        continue_token = page["continue"]
+        if not continue_token:
+            break
+
+def stream_argo_table(pages):
+    # {"items": {"0": {...}, ...}, "status": ...} 형태로 페이지 단위 직렬화
+    # status를 마지막에 두어 스트리밍 도중 실패도 응답에 표시
+    yield '{"items": {'
+    index = 0
+    try:
+        for summaries in pages:
+            now = time.time()
+            for summary in summaries:
+                prefix = ', ' if index else ''
+                yield f'{prefix}"{index}": {json.dumps(workflow_row(summary, now))}'
+                index += 1
+    except Exception as e:
+        print(f"Error while streaming workflow info: {e}")
+        yield '}, "status": "failure", "error": ' + json.dumps(str(e)) + '}'
+        return
+    yield '}, "status": "succeeded"}'
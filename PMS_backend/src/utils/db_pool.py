@@ -0,0 +1,167 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """고정 크기의 thread-safe DB 커넥션 풀.
+
+    - checkout 시 ping으로 커넥션 생존 여부 확인 (죽은 커넥션은 재생성)
+    - max_idle 초 이상 사용되지 않은 커넥션은 정리
+    - connection() 컨텍스트 매니저로 대여/반납
+    """
+
+    def __init__(self, connect, max_size=10, max_idle=300, timeout=10):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+
+        self._idle = deque()  # (connection, last_used)
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+        # 런타임 통계
+        self._created = 0
+        self._closed = 0
+        self._evicted = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        conn = None
+        waited = False
+        timed_out = False
+        stale = []
+
+        with self._cond:
+            while True:
+                stale.extend(self._evict_idle_locked())
+                if self._idle:
+                    # 가장 최근에 반납된(warm) 커넥션부터 사용
+                    conn, _ = self._idle.pop()
+                    break
+                if self._in_use < self.max_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                waited = True
+                self._cond.wait(remaining)
+
+            if not timed_out:
+                self._in_use += 1
+                self._checkouts += 1
+                wait_time = time.monotonic() - start
+                if waited:
+                    self._waits += 1
+                self._wait_time_total += wait_time
+                self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        # 네트워크 I/O는 lock 밖에서 수행
+        self._close_all(stale)
+        if timed_out:
+            raise PoolTimeout(f"No DB connection available within {self.timeout}s (max_size={self.max_size}).")
+        try:
+            if conn is not None and not self._is_alive(conn):
+                self._close(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+                with self._cond:
+                    self._created += 1
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def release(self, conn, discard=False):
+        if discard:
+            self._close(conn)
+        with self._cond:
+            self._in_use -= 1
+            if not discard:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            # 실패한 트랜잭션은 롤백, 롤백조차 실패하면 커넥션 폐기 (원래 예외를 그대로 전달)
+            try:
+                conn.rollback()
+            except Exception as e:
+                print(f"Error: DB rollback failed, discarding connection: {e}")
+                self.release(conn, discard=True)
+            else:
+                self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "created": self._created,
+                "closed": self._closed,
+                "evicted": self._evicted,
+                "checkouts": checkouts,
+                "waits": self._waits,
+                "wait_time_avg_ms": round(self._wait_time_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+            }
+
+    def _evict_idle_locked(self):
+        # deque 앞쪽이 가장 오래된 커넥션, close는 호출자가 lock 밖에서 수행
+        now = time.monotonic()
+        stale = []
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._evicted += 1
+            stale.append(conn)
+        return stale
+
+    def _is_alive(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _close_all(self, conns):
+        for conn in conns:
+            self._close(conn)
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:  # RLock 기반이므로 재진입 가능
+            self._closed += 1
@@ -1,104 +1,113 @@
-import os
 import json
-import pymysql
-import requests
-from dotenv import load_dotenv
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from .db_pool import ConnectionPool
+from .http_client import get_upstream
+from .lazy import lazy_module
+from .metrics import registry, track_dependency, Gauge
+from .settings import settings
 
-load_dotenv()
+# 첫 커넥션 생성 시 로드
+pymysql = lazy_module("pymysql")
+pymysql_cursors = lazy_module("pymysql.cursors")
 
-def get_db_info():
-    connection = pymysql.connect(
-        host=os.getenv('DB_HOST'),
-        port=int(os.getenv('DB_PORT')),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-        database=os.getenv('DB_NAME')
+_pool = None
+_pool_lock = threading.Lock()
+
+def _connect():
+    return pymysql.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        user=settings.db_user,
+        password=settings.db_password,
+        database=settings.db_name
     )
-    cursor = connection.cursor()
-    table = os.getenv('TABLE_NAME')
-    return connection, cursor, table
 
-def update_mldb(json_data: list):
-    if not json_data:
-        print("No data received for update.")
-        return
-    
-    connection, cursor, table = get_db_info()
-    
-    # 테이블 존재 여부 확인
-    check_query = "SHOW TABLES LIKE %s"
-    cursor.execute(check_query, (table,))
-    table_exists = cursor.fetchone()
-
-    # 테이블이 없으면 생성
-    if not table_exists:
-        create_table_query = f"""
-        CREATE TABLE {table} (
-            id VARCHAR(50),
-            mlId VARCHAR(255) PRIMARY KEY,
-            name VARCHAR(255),
-            namespace VARCHAR(255),
-            description TEXT,
-            mlStepCode JSON,  
-            status VARCHAR(255),
-            userId VARCHAR(255),
-            clusterIdx VARCHAR(50)
-        )
-        """
-        cursor.execute(create_table_query)
-        connection.commit()
-        print(f"Table '{table}' was created.")
-
-    # 테이블이 존재하는 경우 데이터 확인
-    get_db_query = f"SELECT * FROM {table}"
-    cursor.execute(get_db_query)
-    result = cursor.fetchall()
+def get_db_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _connect,
+                    max_size=settings.db_pool_size,
+                    max_idle=settings.db_pool_max_idle,
+                    timeout=settings.db_pool_timeout,
+                )
+    return _pool
 
-    if not result:  # 테이블이 비어 있음
-        print(f"There is no data on '{table}'. Insert initial information.")
-        insert_ml_workload_info(json_data)
+def reset_db_pool(close=True):
+    # 기동 시 마이그레이션 후(master) 또는 fork 직후(worker) 풀 초기화 - 다음 get_db_pool()에서 새로 생성
+    # fork된 프로세스에서는 부모와 소켓을 공유하므로 close=False로 참조만 버림
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None and close:
+        pool.close_all()
 
-import json
-import traceback
+def get_db_pool_stats():
+    if _pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pool.stats()}
 
-def insert_ml_workload_info(json_data: list):
-    if not json_data:
-        print("No data received for update.")
-        return
-    
-    connection, cursor, table = get_db_info()
+_pool_connections = registry.register(Gauge(
+    "pms_db_pool_connections", "MySQL connection pool connections by state.", ("state",)))
 
-    # 현재 DB에 존재하는 mlId 목록 가져오기
-    cursor.execute(f"SELECT mlId FROM {table}")
-    existing_mlids = {row[0] for row in cursor.fetchall()}  # Set으로 변환
+def _collect_pool_metrics():
+    stats = get_db_pool_stats()
+    if stats["initialized"]:
+        _pool_connections.set("in_use", value=stats["in_use"])
+        _pool_connections.set("idle", value=stats["idle"])
 
-    # API 리턴값에서 새로운 mlId 목록 추출
-    new_mlids = {item["mlId"] for item in json_data}
+registry.add_collector(_collect_pool_metrics)
 
-    # 📌 [수정된 로직] "진짜 삭제해야 할 mlId"만 찾기
-    mlids_to_delete = existing_mlids - new_mlids  # 기존 코드 (삭제 대상)
-    
-    # ✅ [수정된 로직] 기존 mlId가 API에서 누락된 건지 확인하기
-    mlids_to_keep = {mlId for mlId in mlids_to_delete if mlId.startswith("workload-")}  
-    mlids_to_delete -= mlids_to_keep  # 삭제 목록에서 "workload-" 관련된 것은 제거
-    
-    if mlids_to_delete:
+@functools.lru_cache(maxsize=None)
+def _timed_cursor_class():
+    # pymysql 로드 후 생성 (import 시점에는 pymysql을 불러오지 않음)
+    class _TimedCursor(pymysql_cursors.Cursor):
+        # 쿼리 종류(SELECT/INSERT/...)별 실행 시간 기록 (executemany도 내부적으로 execute 호출)
+        def execute(self, query, args=None):
+            with track_dependency("mysql", query.split(None, 1)[0].upper()):
+                return super().execute(query, args)
+    return _TimedCursor
+
+@contextmanager
+def get_db_info():
+    # 풀에서 커넥션을 빌려오고, 블록이 정상 종료되면 commit / 예외 시 rollback 후 반납
+    with get_db_pool().connection() as connection:
+        cursor = connection.cursor(_timed_cursor_class())
         try:
-            delete_query = f"DELETE FROM {table} WHERE mlId IN ({','.join(['%s'] * len(mlids_to_delete))})"
-            cursor.execute(delete_query, tuple(mlids_to_delete))
-            print(f"Deleted old mlIds from table: {mlids_to_delete}")
-        except Exception as e:
-            print(f"Error deleting mlIds: {e}")
-            print(traceback.format_exc())
+            yield connection, cursor, settings.table_name
+            connection.commit()
+        finally:
+            cursor.close()
+
+ML_REQUIRED_KEYS = {"id", "name", "namespace", "description", "mlStepCode", "status", "userId", "clusterIdx"}
+
+ML_ID_PREFIX = settings.mlid_prefix
+
+_ML_COLUMNS = "(id, mlId, mlSeq, name, namespace, description, mlStepCode, status, userId, clusterIdx)"
+_ML_PLACEHOLDER = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
 
-    # 추가할 mlId 찾기 (API에는 있지만 DB에 없는 값)
-    mlids_to_insert = new_mlids - existing_mlids
+def ml_seq(mlid):
+    # keti012 -> 12, 그 외 형식은 None (mlSeq 컬럼 값)
+    if isinstance(mlid, str) and mlid.startswith(ML_ID_PREFIX):
+        suffix = mlid[len(ML_ID_PREFIX):]
+        if suffix.isdigit():
+            return int(suffix)
+    return None
 
-    insert_query = f"""
+def _ml_upsert_query(table, rows=1):
+    # rows 개의 VALUES 튜플을 한 번에 보내는 multi-row upsert
+    values = ", ".join([_ML_PLACEHOLDER] * rows)
+    return f"""
     INSERT INTO {table}
-    (id, mlId, name, namespace, description, mlStepCode, status, userId, clusterIdx)
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    {_ML_COLUMNS}
+    VALUES {values}
     ON DUPLICATE KEY UPDATE
+        mlSeq = VALUES(mlSeq),
         name = VALUES(name),
         namespace = VALUES(namespace),
         description = VALUES(description),
@@ -108,15 +117,14 @@ def insert_ml_workload_info(json_data: list):
         clusterIdx = VALUES(clusterIdx)
     """
 
-    required_keys = {"id", "name", "namespace", "description", "mlStepCode", "status", "userId", "clusterIdx"}
-    
-    for item in json_data:
-        if item["mlId"] not in mlids_to_insert:
-            continue  # 이미 있는 값이면 넘어감
-
-        missing_keys = required_keys - set(item.keys())
+def _ml_rows(items):
+    # 배치 전체를 미리 검증/직렬화
+    rows, skipped = [], []
+    for item in items:
+        missing_keys = ML_REQUIRED_KEYS - set(item.keys())
         if missing_keys:
             print(f"Skipping item due to missing keys: {missing_keys}")
+            skipped.append(item.get("mlId"))
             continue
 
         mlId_value = item.get("mlId", "null_mlId")
@@ -124,30 +132,114 @@ def insert_ml_workload_info(json_data: list):
             mlId_value = "null_mlId"
             print(f"mlId is null. Assigning default mlId: {mlId_value}")
 
-        try:
-            cursor.execute(insert_query, (
-                item["id"],
-                mlId_value,
-                item["name"],
-                item["namespace"],
-                item["description"],
-                json.dumps(item["mlStepCode"]),
-                item["status"],
-                item["userId"],
-                item["clusterIdx"]
-            ))
-        except Exception as e:
-            print(f"Error inserting item {item['id']}: {e}")
-            print(traceback.format_exc())
-
-    connection.commit()
-    connection.close()
+        step_code_json = json.dumps(item["mlStepCode"])
+
+        rows.append((
+            item["id"],
+            mlId_value,
+            ml_seq(mlId_value),
+            item["name"],
+            item["namespace"],
+            item["description"],
+            step_code_json,
+            item["status"],
+            item["userId"],
+            item["clusterIdx"]
+        ))
+    return rows, skipped
+
+def _chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+def _bulk_chunk_size(chunk_size=None):
+    return max(1, int(chunk_size or settings.db_bulk_chunk_size))
+
+def _bulk_delete(cursor, table, mlids, chunk_size, batches):
+    deleted = 0
+    for chunk in _chunks(list(mlids), chunk_size):
+        started = time.perf_counter()
+        delete_query = f"DELETE FROM {table} WHERE mlId IN ({','.join(['%s'] * len(chunk))})"
+        deleted += cursor.execute(delete_query, tuple(chunk))
+        batches.append({"op": "delete", "rows": len(chunk), "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)})
+    return deleted
+
+def _bulk_upsert(cursor, table, rows, chunk_size, batches):
+    upserted = 0
+    for chunk in _chunks(rows, chunk_size):
+        started = time.perf_counter()
+        params = [value for row in chunk for value in row]
+        cursor.execute(_ml_upsert_query(table, len(chunk)), params)
+        upserted += len(chunk)
+        batches.append({"op": "upsert", "rows": len(chunk), "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)})
+    return upserted
+
+def update_mldb(json_data: list):
+    if not json_data:
+        print("No data received for update.")
+        return
     
-    return f"ML data updated successfully on '{table}'."
+    # 테이블 생성/스키마 변경은 기동 시 migrations.run_migrations()에서 처리
+    with get_db_info() as (connection, cursor, table):
+        # 데이터 존재 여부 확인 (한 행만 있으면 충분)
+        get_db_query = f"SELECT 1 FROM {table} LIMIT 1"
+        cursor.execute(get_db_query)
+        result = cursor.fetchone()
+
+    # 커넥션을 반납한 뒤 초기 데이터 입력
+    if not result:  # 테이블이 비어 있음
+        print(f"There is no data on '{table}'. Insert initial information.")
+        insert_ml_workload_info(json_data)
+
+def insert_ml_workload_info(json_data: list, chunk_size: int = None):
+    # chunk_size=1 로 호출하면 기존 row-by-row 방식과 같은 round-trip 수로 비교 가능
+    if not json_data:
+        print("No data received for update.")
+        return
+
+    chunk_size = _bulk_chunk_size(chunk_size)
+    started = time.perf_counter()
+    batches = []
+
+    with get_db_info() as (connection, cursor, table):
+        # 현재 DB에 존재하는 mlId 목록 가져오기
+        cursor.execute(f"SELECT mlId FROM {table}")
+        existing_mlids = {row[0] for row in cursor.fetchall()}  # Set으로 변환
+
+        # API 리턴값에서 새로운 mlId 목록 추출
+        new_mlids = {item["mlId"] for item in json_data}
+
+        # 📌 [수정된 로직] "진짜 삭제해야 할 mlId"만 찾기
+        mlids_to_delete = existing_mlids - new_mlids  # 기존 코드 (삭제 대상)
+
+        # ✅ [수정된 로직] 기존 mlId가 API에서 누락된 건지 확인하기
+        mlids_to_keep = {mlId for mlId in mlids_to_delete if mlId.startswith("workload-")}
+        mlids_to_delete -= mlids_to_keep  # 삭제 목록에서 "workload-" 관련된 것은 제거
+
+        # 추가할 mlId 찾기 (API에는 있지만 DB에 없는 값)
+        mlids_to_insert = new_mlids - existing_mlids
+        rows, skipped = _ml_rows([item for item in json_data if item["mlId"] in mlids_to_insert])
+
+        # 삭제/추가 모두 chunk 단위로 같은 트랜잭션에서 수행 (실패 시 전체 rollback)
+        deleted = _bulk_delete(cursor, table, mlids_to_delete, chunk_size, batches)
+        if mlids_to_delete:
+            print(f"Deleted old mlIds from table: {mlids_to_delete}")
+        inserted = _bulk_upsert(cursor, table, rows, chunk_size, batches)
+
+    result = {
+        "table": table,
+        "deleted": deleted,
+        "inserted": inserted,
+        "skipped": len(skipped),
+        "chunk_size": chunk_size,
+        "batches": batches,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    print(f"ML data updated successfully on '{table}'. (deleted={deleted}, inserted={inserted}, "
+          f"batches={len(batches)}, elapsed={result['elapsed_ms']}ms)")
+    return result
 
 def remove_ml(name: str):
-    connection, cursor, table = get_db_info()
-    
     if name.split('-')[-1] == str(0):
         # existed name : ml-pipeline
         # new name : ml-pipeline-retry-0
@@ -162,31 +254,28 @@ def remove_ml(name: str):
         print(f"Current name on case2 : {name}")
         
     # mlId 파싱 후 DB에 해당 데이터 삭제
-    select_query = f"SELECT mlId FROM {table} WHERE name = %s"
-    cursor.execute(select_query, (target_name,))
-    result = cursor.fetchone()
+    # STRATO 호출 전에 커넥션을 반납하도록 DB 작업만 블록 안에서 수행
+    with get_db_info() as (connection, cursor, table):
+        select_query = f"SELECT mlId FROM {table} WHERE name = %s"
+        cursor.execute(select_query, (target_name,))
+        result = cursor.fetchone()
+        if result:
+            delete_query = f"DELETE FROM {table} WHERE name = %s"
+            cursor.execute(delete_query, (target_name,))
+            connection.commit()  # DELETE 후 commit 필요
+
     null_mlid= "null_mlid"
     if result:
         mlid = result[0]  # result: tuple
-        delete_query = f"DELETE FROM {table} WHERE name = %s"
-        cursor.execute(delete_query, (target_name,))
-        connection.commit()  # DELETE 후 commit 필요
 
         # STRATO Workload 삭제 API 호출을 위한 metadata 파싱
-        db_get_url = os.getenv('URL') + '/interface/api/v2/ml/delete'
-        token = os.getenv('TOKEN')
-        headers = {
-            "Authorization": token,
-            "accept": "*/*",
-            "Content-Type": "application/json"
-        }
         remove_ml_data=json.dumps({"mlId": mlid})
         
         print("To retry running ML Workload, Current ML Workload delete :")
         print(remove_ml_data)
         
         # STRATO Workload 삭제 API 호출
-        response = requests.delete(db_get_url, headers=headers, data=remove_ml_data)
+        response = get_upstream("strato").delete('/interface/api/v2/ml/delete', data=remove_ml_data)
         response_data = response.json()
 
         if str(response_data.get("code", None)) == "10001":
@@ -202,29 +291,33 @@ def remove_ml(name: str):
         print(f"Return default mlid:{null_mlid}")
         return null_mlid
 
-def get_next_mlid():
-    connection, cursor, table = get_db_info()
-    # mlId를 가져오고 가장 큰 값을 선택
-    cursor.execute(f"SELECT mlId FROM {table} WHERE mlId LIKE 'keti%' ORDER BY mlId DESC LIMIT 1")
-    result = cursor.fetchone()
-    if result:
-        # 가장 큰 mlId 값에서 숫자 부분 추출 후 1 증가
-        current_num = int(result[0][4:])  # 'keti' 이후의 숫자 부분 추출
-        next_num = current_num + 1
-        return f'keti{next_num:03}'  # 세자리로 맞추기
-    else:
-        return "keti001"  # 만약 값이 없다면 keti001 반환
+def load_ml_snapshot():
+    # reconciler 초기화용: 현재 DB에 존재하는 mlId 목록
+    with get_db_info() as (connection, cursor, table):
+        cursor.execute(f"SELECT mlId FROM {table}")
+        return {row[0] for row in cursor.fetchall()}
 
-def get_current_ml_list():
-    mlid_get_url = os.getenv('URL') + "/interface/api/v2/ml/ml/list"
-    token = os.getenv('TOKEN')
-    headers = {
-        "Authorization": token,
-        "accept": "*/*",
-        "Content-Type": "application/json"
+def apply_ml_delta(upserts: list, deletes, chunk_size: int = None):
+    # 변경분(delta)만 하나의 트랜잭션으로 반영
+    chunk_size = _bulk_chunk_size(chunk_size)
+    started = time.perf_counter()
+    batches = []
+    rows, skipped = _ml_rows(upserts)
+    with get_db_info() as (connection, cursor, table):
+        deleted = _bulk_delete(cursor, table, deletes, chunk_size, batches)
+        upserted = _bulk_upsert(cursor, table, rows, chunk_size, batches)
+    return {
+        "upserted": upserted,
+        "deleted": deleted,
+        "skipped": len(skipped),
+        "batches": batches,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
     }
-    response = requests.post(mlid_get_url, headers=headers, data=json.dumps({}))
+
+def get_current_ml_list():
+    # 조회용 POST이므로 idempotent로 재시도 허용
+    response = get_upstream("strato").post("/interface/api/v2/ml/ml/list", data=json.dumps({}), idempotent=True)
     response_data = response.json()
     if response_data.get("code", {}) == str(10001):
-        result = response_data.get("result", {})
-    return result
\ No newline at end of file
+        return response_data.get("result", {})
+    raise RuntimeError(f"Failed to get ML Workload list: {response_data.get('message', response.status_code)}")
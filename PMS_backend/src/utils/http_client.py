@@ -0,0 +1,265 @@
+import time
+import random
+import threading
+from .lazy import lazy_module
+from .metrics import registry, dependency_duration, dependency_in_flight, Gauge
+from .settings import settings
+
+# 첫 업스트림 세션 생성 시 로드
+requests = lazy_module("requests")
+requests_adapters = lazy_module("requests.adapters")
+
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def _setting(name, key):
+    # 업스트림별 설정(settings.strato_read_timeout) > 공통 설정(settings.http_read_timeout)
+    value = getattr(settings, f"{name}_{key}")
+    return getattr(settings, f"http_{key}") if value is None else value
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold 이상이면 reset_timeout 동안 요청 차단, 이후 1건만 시험 통과(half-open)."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class Upstream:
+    """업스트림 하나에 대한 keep-alive 세션 + timeout + retry + circuit breaker."""
+
+    def __init__(self, name, base_url="", headers=None, connect_timeout=3, read_timeout=30,
+                 retries=2, backoff=0.2, pool_size=20, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.session = requests.Session()
+        adapter = requests_adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._retries = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._last_status = None
+
+    def request(self, method, path="", idempotent=None, **kwargs):
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.base_url + path
+        operation = f"{method} {path or '/'}"
+
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                with self._lock:
+                    self._rejected += 1
+                raise CircuitOpenError(f"Circuit for upstream '{self.name}' is open.")
+
+            started = time.perf_counter()
+            dependency_in_flight.inc(self.name)
+            status, failed, error = None, True, None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                status = response.status_code
+                failed = status >= 500
+            except requests.RequestException as e:
+                error = e
+            finally:
+                # 예상하지 못한 예외도 실패로 기록 (in-flight gauge, half-open probe 상태가 남지 않도록)
+                self._observe(started, status, failed=failed, operation=operation)
+                if failed:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+            if error is not None:
+                # 연결 timeout은 요청이 전달되지 않았으므로 non-idempotent도 재시도 가능
+                retryable = idempotent or isinstance(error, requests.ConnectTimeout)
+                if retryable and attempt < self.retries:
+                    attempt += 1
+                    self._sleep(attempt)
+                    continue
+                raise error
+            if failed and idempotent and attempt < self.retries:
+                attempt += 1
+                self._sleep(attempt)
+                continue
+            return response
+
+    def get(self, path="", **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path="", **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path="", **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def _sleep(self, attempt):
+        with self._lock:
+            self._retries += 1
+        # exponential backoff + full jitter
+        time.sleep(random.uniform(0, self.backoff * (2 ** (attempt - 1))))
+
+    def _observe(self, started, status, failed, operation):
+        elapsed = time.perf_counter() - started
+        dependency_in_flight.dec(self.name)
+        dependency_duration.observe(elapsed, self.name, operation, "error" if failed else "success")
+        with self._lock:
+            self._requests += 1
+            if failed:
+                self._errors += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+            self._last_status = status
+
+    def close(self):
+        self.session.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "base_url": self.base_url,
+                "circuit": self.breaker.state,
+                "requests": self._requests,
+                "errors": self._errors,
+                "retries": self._retries,
+                "rejected": self._rejected,
+                "latency_avg_ms": round(self._latency_total / self._requests * 1000, 3) if self._requests else 0.0,
+                "latency_max_ms": round(self._latency_max * 1000, 3),
+                "last_status": self._last_status,
+            }
+
+
+def _strato_config():
+    return {
+        "base_url": settings.strato_url,
+        "headers": {
+            "Authorization": settings.strato_token,
+            "accept": "*/*",
+            "Content-Type": "application/json"
+        },
+    }
+
+
+def _recommender_config():
+    return {
+        "base_url": settings.recommend_server,
+        "headers": {
+            "accept": "*/*",
+            "Content-Type": "application/json"
+        },
+    }
+
+
+_UPSTREAM_CONFIG = {
+    "strato": _strato_config,
+    "recommender": _recommender_config,
+}
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(name):
+    upstream = _upstreams.get(name)
+    if upstream is None:
+        with _upstreams_lock:
+            upstream = _upstreams.get(name)
+            if upstream is None:
+                upstream = Upstream(
+                    name,
+                    connect_timeout=_setting(name, "connect_timeout"),
+                    read_timeout=_setting(name, "read_timeout"),
+                    retries=_setting(name, "retries"),
+                    backoff=_setting(name, "backoff"),
+                    pool_size=_setting(name, "pool_size"),
+                    failure_threshold=_setting(name, "breaker_failures"),
+                    reset_timeout=_setting(name, "breaker_reset"),
+                    **_UPSTREAM_CONFIG[name](),
+                )
+                _upstreams[name] = upstream
+    return upstream
+
+
+def reset_upstreams(close=True):
+    # fork 이후 워커에서 부모의 keep-alive 커넥션을 공유하지 않도록 세션 재생성
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+        _upstreams.clear()
+    if close:
+        for upstream in upstreams:
+            upstream.close()
+
+
+def get_upstream_stats():
+    with _upstreams_lock:
+        upstreams = dict(_upstreams)
+    return {name: upstream.stats() for name, upstream in upstreams.items()}
+
+
+_circuit_open = registry.register(Gauge(
+    "pms_upstream_circuit_open", "1 if the upstream circuit breaker is open or half-open.", ("upstream",)))
+
+
+def _collect_upstream_metrics():
+    with _upstreams_lock:
+        upstreams = dict(_upstreams)
+    for name, upstream in upstreams.items():
+        _circuit_open.set(name, value=0 if upstream.breaker.state == "closed" else 1)
+
+
+registry.add_collector(_collect_upstream_metrics)
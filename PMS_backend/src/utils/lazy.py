@@ -0,0 +1,94 @@
+import sys
+import time
+import threading
+
+# 지연 로드 대상 (preload()에서 한 번에 로드)
+_registered = []
+
+
+class LazyModule:
+    """첫 속성 접근 시 import 하는 모듈 proxy (argo SDK, pymysql, numpy 등 기동 시간 단축용).
+
+    로드 후에는 모듈 속성을 proxy에 복사해 이후 접근은 일반 속성 조회와 같은 비용.
+    """
+
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+        _registered.append(self)
+
+    def _lazy_load(self):
+        if self._lazy_module is None:
+            __import__(self._lazy_name)  # import 문과 같은 경로 (-X importtime에도 기록됨)
+            module = sys.modules[self._lazy_name]
+            self.__dict__.update(module.__dict__)
+            self._lazy_module = module
+        return self._lazy_module
+
+    def __getattr__(self, name):
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        return getattr(self._lazy_load(), name)
+
+    def __repr__(self):
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module '{self._lazy_name}' ({state})>"
+
+
+class LazyObject:
+    """첫 속성 접근 시 factory()로 생성하는 싱글턴 proxy (상태 파일 로드 등 생성 비용이 큰 객체용)."""
+
+    def __init__(self, name, factory):
+        self._lazy_name = name
+        self._lazy_factory = factory
+        self._lazy_target = None
+        self._lazy_lock = threading.Lock()
+        _registered.append(self)
+
+    def _lazy_load(self):
+        if self._lazy_target is None:
+            with self._lazy_lock:
+                if self._lazy_target is None:
+                    self._lazy_target = self._lazy_factory()
+        return self._lazy_target
+
+    def __getattr__(self, name):
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        return getattr(self._lazy_load(), name)
+
+    def __repr__(self):
+        state = "loaded" if self._lazy_target is not None else "not loaded"
+        return f"<lazy object '{self._lazy_name}' ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+def lazy_object(name, factory):
+    return LazyObject(name, factory)
+
+
+def is_loaded(proxy):
+    if isinstance(proxy, LazyModule):
+        return proxy._lazy_module is not None
+    if isinstance(proxy, LazyObject):
+        return proxy._lazy_target is not None
+    return True
+
+
+def preload():
+    # 등록된 지연 로드 대상을 모두 로드 -> {이름: 소요 ms} (이미 로드된 대상은 제외)
+    timings = {}
+    for proxy in list(_registered):
+        if is_loaded(proxy):
+            continue
+        started = time.perf_counter()
+        proxy._lazy_load()
+        timings[proxy._lazy_name] = round((time.perf_counter() - started) * 1000, 3)
+    return timings
+
+
+def stats():
+    return {proxy._lazy_name: is_loaded(proxy) for proxy in _registered}
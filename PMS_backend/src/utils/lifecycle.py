@@ -0,0 +1,114 @@
+import os
+import time
+import threading
+from . import lazy
+from .settings import settings
+from .db_utils import get_db_pool, reset_db_pool
+from .http_client import get_upstream, reset_upstreams
+from .argo_utils import load_argo_info, reset_argo_clients
+from .argo_informer import get_informer, reset_informers, ARGO_INFORMER_ENABLED
+from .resource_utils import reset_recommend_executor
+from .ml_reconciler import reconciler
+from .ml_jobs import ml_job_queue
+from .workflow_history import workflow_history
+from .local_recommender import local_recommender
+
+_started_at = time.time()
+_warmup = {"mode": None, "state": "pending", "result": None}
+_warmup_lock = threading.Lock()
+
+
+def reset_after_fork():
+    # preload된 master에서 상속받은 커넥션/스레드 풀은 워커에서 사용하지 않음
+    reset_db_pool(close=False)
+    reset_upstreams(close=False)
+    reset_argo_clients()
+    reset_informers()
+    reset_recommend_executor()
+
+
+def _argo_warmup_targets():
+    # ARGO_WARMUP_TARGETS="10.0.0.1:30103/argo-test,10.0.0.2:30103/kubeflow"
+    for target in filter(None, (t.strip() for t in settings.argo_warmup_targets.split(","))):
+        host, _, namespace = target.partition("/")
+        ip, _, port = host.partition(":")
+        yield ip, port or None, namespace or None
+
+
+def warmup():
+    # 첫 요청이 모듈 로드/커넥션 생성 비용을 부담하지 않도록 의존성/풀/세션/클라이언트를 미리 준비
+    started = time.perf_counter()
+    result = {"modules": lazy.preload()}
+
+    try:
+        pool = get_db_pool()
+        connections = [pool.acquire() for _ in range(min(settings.db_pool_warmup, pool.max_size))]
+        for connection in connections:
+            pool.release(connection)
+        result["db_connections"] = len(connections)
+    except Exception as e:
+        result["db_error"] = str(e)
+
+    result["upstreams"] = [get_upstream(name).name for name in ("strato", "recommender")]
+
+    argo = []
+    for ip, port, namespace in _argo_warmup_targets():
+        load_argo_info(ip, port)
+        if namespace and ARGO_INFORMER_ENABLED:
+            get_informer(ip, port, namespace)
+        argo.append(f"{ip}:{port}/{namespace}")
+    result["argo"] = argo
+
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    print(f"Warmup finished (pid={os.getpid()}): {result}")
+    return result
+
+
+def _run_warmup():
+    with _warmup_lock:
+        _warmup["state"] = "running"
+    try:
+        result, state = warmup(), "done"
+    except Exception as e:
+        result, state = {"error": str(e)}, "failed"
+        print(f"Error during warmup (pid={os.getpid()}): {e}")
+    with _warmup_lock:
+        _warmup.update(state=state, result=result)
+
+
+def startup(mode=None):
+    # 워커 시작: 제출 job 처리/ML 동기화 스레드 시작 후 STARTUP_WARMUP에 따라 warmup
+    # background: 요청을 바로 받으면서 별도 스레드에서 warmup (첫 요청은 필요한 모듈만 로드)
+    mode = mode or settings.startup_warmup
+    ml_job_queue.start()
+    if settings.ml_sync_enabled:
+        reconciler.start()
+    with _warmup_lock:
+        _warmup["mode"] = mode
+        if mode == "off":
+            _warmup["state"] = "off"
+    if mode == "background":
+        threading.Thread(target=_run_warmup, name="startup-warmup", daemon=True).start()
+    elif mode == "sync":
+        _run_warmup()
+
+
+def startup_state():
+    with _warmup_lock:
+        warmup_state = dict(_warmup)
+    return {"pid": os.getpid(), "uptime": round(time.time() - _started_at, 3), "startup_mode": settings.startup_mode,
+            "warmup": warmup_state, "lazy": lazy.stats()}
+
+
+def drain(timeout):
+    # graceful shutdown: 남은 제출 job 처리 후 백그라운드 작업 정리 (사용하지 않은 지연 로드 객체는 생성하지 않음)
+    remaining = ml_job_queue.drain(timeout)
+    reconciler.stop()
+    reset_informers()
+    for state in (workflow_history, local_recommender):
+        if lazy.is_loaded(state):
+            state.save()
+    reset_db_pool()
+    reset_upstreams()
+    print(f"Drained worker (pid={os.getpid()}), pending ML jobs: {remaining}")
+    return remaining
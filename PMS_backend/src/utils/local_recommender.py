@@ -0,0 +1,205 @@
+import os
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from .lazy import lazy_module, lazy_object
+from .settings import settings
+
+np = lazy_module("numpy")
+
+RECOMMEND_MODES = ("remote", "primary", "fallback", "shadow")
+_FIELDS = ("req_cpu", "req_mem", "lim_cpu", "lim_mem")
+
+
+class LocalRecommender:
+    """관측된 사용량 기반 프로세스 내 추천기 (추천 서버 대체/보조용).
+
+    라벨별로 최근 capacity개의 (cpu 코어, memory Mi) 사용량을 numpy ring buffer로 보관하고
+    requests = request_quantile, limits = limit_quantile * headroom 으로 추천값을 계산한다.
+    라벨 수는 max_labels로 제한 (가장 오래 관측되지 않은 라벨부터 제거).
+    """
+
+    def __init__(self, capacity=1024, max_labels=512, request_quantile=50, limit_quantile=95, headroom=1.2,
+                 min_samples=10, path=None, save_interval=60):
+        self.capacity = capacity
+        self.max_labels = max_labels
+        self.request_quantile = request_quantile
+        self.limit_quantile = limit_quantile
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.path = path
+        self.save_interval = save_interval
+
+        self._labels = OrderedDict()  # label -> [samples(capacity x 2), count, next]
+        self._recommendations = {}  # label -> 계산된 추천값 (새 관측 시 무효화)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._counters = {"observed": 0, "rejected": 0, "evictions": 0, "answers": 0, "insufficient": 0,
+                          "shadow_compared": 0, "shadow_missing": 0}
+        self._shadow_diff = dict.fromkeys(_FIELDS, 0.0)
+        self._shadow_max = dict.fromkeys(_FIELDS, 0.0)
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _entry(self, label):
+        entry = self._labels.get(label)
+        if entry is None:
+            if len(self._labels) >= self.max_labels:
+                evicted, _ = self._labels.popitem(last=False)
+                self._recommendations.pop(evicted, None)
+                self._counters["evictions"] += 1
+            entry = self._labels[label] = [np.zeros((self.capacity, 2), dtype=np.float32), 0, 0]
+        else:
+            self._labels.move_to_end(label)
+        return entry
+
+    def observe_many(self, samples):
+        # samples: [(label, cpu 코어, memory Mi), ...] -> 반영된 개수
+        accepted = 0
+        with self._lock:
+            for label, cpu, memory in samples:
+                try:
+                    cpu, memory = float(cpu), float(memory)
+                except (TypeError, ValueError):
+                    self._counters["rejected"] += 1
+                    continue
+                if not label or not (cpu >= 0 and memory >= 0) or np.isinf(cpu) or np.isinf(memory):
+                    self._counters["rejected"] += 1
+                    continue
+                entry = self._entry(label)
+                entry[0][entry[2]] = (cpu, memory)
+                entry[2] = (entry[2] + 1) % self.capacity
+                entry[1] = min(entry[1] + 1, self.capacity)
+                self._recommendations.pop(label, None)
+                accepted += 1
+            self._counters["observed"] += accepted
+            if accepted:
+                self._dirty = True
+        if accepted and self.path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return accepted
+
+    def observe(self, label, cpu, memory):
+        return self.observe_many([(label, cpu, memory)]) == 1
+
+    def recommend(self, label):
+        # fetch_recommendation과 같은 형식, 관측치가 min_samples 미만이면 None
+        with self._lock:
+            recommendation = self._recommendations.get(label)
+            if recommendation is not None:
+                self._counters["answers"] += 1
+                return recommendation
+            entry = self._labels.get(label)
+            if entry is None or entry[1] < self.min_samples:
+                self._counters["insufficient"] += 1
+                return None
+            samples = entry[0][:entry[1]].copy()
+        (req_cpu, req_mem), (lim_cpu, lim_mem) = np.percentile(
+            samples, [self.request_quantile, self.limit_quantile], axis=0)
+        recommendation = {
+            "req_cpu": round(float(req_cpu), 2),
+            "req_mem": int(np.ceil(req_mem)),
+            "lim_cpu": round(float(max(lim_cpu * self.headroom, req_cpu)), 2),
+            "lim_mem": int(np.ceil(max(lim_mem * self.headroom, req_mem))),
+        }
+        with self._lock:
+            if label in self._labels:
+                self._recommendations[label] = recommendation
+            self._counters["answers"] += 1
+        return recommendation
+
+    def compare(self, label, remote):
+        # shadow 모드: 원격 추천값과의 상대 오차 기록/출력
+        local = self.recommend(label)
+        if local is None:
+            with self._lock:
+                self._counters["shadow_missing"] += 1
+            return None
+        diff = {field: abs(local[field] - remote[field]) / max(abs(remote[field]), 1e-9) for field in _FIELDS}
+        with self._lock:
+            self._counters["shadow_compared"] += 1
+            for field, value in diff.items():
+                self._shadow_diff[field] += value
+                self._shadow_max[field] = max(self._shadow_max[field], value)
+        print(f"Shadow recommend [{label}] local={local} remote={remote} "
+              f"diff={ {field: round(value, 3) for field, value in diff.items()} }")
+        return diff
+
+    def labels(self):
+        with self._lock:
+            return {label: entry[1] for label, entry in self._labels.items()}
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            labels = list(self._labels)
+            counts = np.array([self._labels[label][1] for label in labels], dtype=np.int64)
+            # 라벨별 오래된 순서로 이어 붙여 저장
+            samples = [np.roll(entry[0], -entry[2], axis=0) if entry[1] == self.capacity else entry[0][:entry[1]]
+                       for entry in self._labels.values()]
+            data = {
+                "labels": np.array(labels, dtype=object),
+                "counts": counts,
+                "samples": np.concatenate(samples) if samples else np.zeros((0, 2), dtype=np.float32),
+            }
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **data)
+        os.replace(tmp_path, self.path)
+
+    def _load(self, path):
+        try:
+            with np.load(path, allow_pickle=True) as data:
+                offset = 0
+                for label, count in zip(data["labels"], data["counts"]):
+                    rows = data["samples"][offset:offset + count]
+                    offset += count
+                    self.observe_many((label, cpu, memory) for cpu, memory in rows[-self.capacity:])
+            self._dirty = False
+            self._counters["observed"] = 0
+            print(f"Loaded usage history for {len(self._labels)} labels from {path}")
+        except Exception as e:
+            print(f"Error loading usage history from {path}: {e}")
+
+    def stats(self):
+        with self._lock:
+            compared = self._counters["shadow_compared"]
+            return {
+                "labels": len(self._labels),
+                "max_labels": self.max_labels,
+                "capacity": self.capacity,
+                "quantiles": {"requests": self.request_quantile, "limits": self.limit_quantile},
+                "headroom": self.headroom,
+                "min_samples": self.min_samples,
+                **self._counters,
+                "shadow_mean_diff": {field: round(value / compared, 4) for field, value in self._shadow_diff.items()}
+                if compared else None,
+                "shadow_max_diff": {field: round(value, 4) for field, value in self._shadow_max.items()}
+                if compared else None,
+            }
+
+
+def _create_local_recommender():
+    recommender = LocalRecommender(
+        capacity=settings.local_recommend_samples,
+        max_labels=settings.local_recommend_max_labels,
+        request_quantile=settings.local_recommend_request_quantile,
+        limit_quantile=settings.local_recommend_limit_quantile,
+        headroom=settings.local_recommend_headroom,
+        min_samples=settings.local_recommend_min_samples,
+        path=settings.local_recommend_path,
+        save_interval=settings.local_recommend_save_interval,
+    )
+    atexit.register(recommender.save)
+    return recommender
+
+
+# 저장된 사용량 파일 로드는 첫 사용 시
+local_recommender = lazy_object("local_recommender", _create_local_recommender)
@@ -0,0 +1,196 @@
+import os
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+
+# 기본 latency 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, labels)} {value}" for labels, value in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """label 조합별 버킷 count/sum 누적 (관측 시에는 bisect 한 번 + 덧셈만 수행)."""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        with self._lock:
+            series = [(labels, list(values)) for labels, values in self._series.items()]
+        lines = self.header()
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {values[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []  # 조회 시점에 값을 채우는 함수 (풀/큐 상태 등)
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Error: metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "pms_http_request_duration_seconds", "Flask request latency by route.", ("method", "route", "status")))
+http_requests_in_flight = registry.register(Gauge(
+    "pms_http_requests_in_flight", "Requests currently being handled by route.", ("route",)))
+dependency_duration = registry.register(Histogram(
+    "pms_dependency_duration_seconds", "Outbound call latency by dependency (mysql, strato, recommender, argo).",
+    ("dependency", "operation", "outcome")))
+dependency_in_flight = registry.register(Gauge(
+    "pms_dependency_in_flight", "Outbound calls currently in progress by dependency.", ("dependency",)))
+# 여러 워커로 실행한 경우 어떤 워커 프로세스의 값인지 구분
+worker_info = registry.register(Gauge("pms_worker_info", "Process that served this scrape.", ("pid",)))
+
+
+def _collect_worker_info():
+    worker_info.set(str(os.getpid()), value=1)
+
+
+registry.add_collector(_collect_worker_info)
+
+
+@contextmanager
+def track_dependency(dependency, operation):
+    dependency_in_flight.inc(dependency)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        dependency_duration.observe(time.perf_counter() - started, dependency, operation, outcome)
+        dependency_in_flight.dec(dependency)
+
+
+def timed_dependency(dependency, operation):
+    # 함수 데코레이터 버전
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_dependency(dependency, operation):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def init_app_metrics(app):
+    # route(url rule) 단위 latency/in-flight 기록, 매칭되지 않은 경로는 하나로 묶음
+    from flask import g, request
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        g._metrics_started = time.perf_counter()
+        http_requests_in_flight.inc(g._metrics_route)
+
+    @app.after_request
+    def _metrics_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _metrics_end(exc):
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return
+        route = g.pop("_metrics_route")
+        status = g.pop("_metrics_status", 500)
+        http_request_duration.observe(time.perf_counter() - started, request.method, route, str(status))
+        http_requests_in_flight.dec(route)
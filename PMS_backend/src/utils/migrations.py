@@ -0,0 +1,138 @@
+import sys
+from .db_utils import get_db_info, ML_ID_PREFIX
+from .mlid_allocator import mlid_allocator
+
+# 여러 워커가 동시에 기동해도 마이그레이션은 한 곳에서만 수행
+_LOCK_TIMEOUT = 60
+
+
+def _has_index(cursor, table, index):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+        (table, index),
+    )
+    return cursor.fetchone() is not None
+
+
+def _has_column(cursor, table, column):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1",
+        (table, column),
+    )
+    return cursor.fetchone() is not None
+
+
+def _create_workload_table(cursor, table):
+    # 기존 update_mldb에서 lazy하게 만들던 스키마 그대로
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        id VARCHAR(50),
+        mlId VARCHAR(255) PRIMARY KEY,
+        name VARCHAR(255),
+        namespace VARCHAR(255),
+        description TEXT,
+        mlStepCode JSON,
+        status VARCHAR(255),
+        userId VARCHAR(255),
+        clusterIdx VARCHAR(50)
+    )
+    """)
+
+
+def _add_name_index(cursor, table):
+    # remove_ml의 name 기준 조회/삭제
+    if not _has_index(cursor, table, "idx_name"):
+        cursor.execute(f"CREATE INDEX idx_name ON {table} (name)")
+
+
+def _add_ml_seq(cursor, table):
+    # mlId 숫자 부분(keti012 -> 12)을 별도 컬럼으로 관리해 prefix 문자열 정렬 대신 사용
+    if not _has_column(cursor, table, "mlSeq"):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN mlSeq BIGINT UNSIGNED NULL AFTER mlId")
+    if not _has_index(cursor, table, "idx_mlseq"):
+        cursor.execute(f"CREATE INDEX idx_mlseq ON {table} (mlSeq)")
+    cursor.execute(
+        f"UPDATE {table} SET mlSeq = CAST(SUBSTRING(mlId, %s) AS UNSIGNED) WHERE mlSeq IS NULL AND mlId REGEXP %s",
+        (len(ML_ID_PREFIX) + 1, f"^{ML_ID_PREFIX}[0-9]+$"),
+    )
+
+
+def _add_cluster_status_index(cursor, table):
+    # 클러스터별 상태 목록 조회
+    if not _has_index(cursor, table, "idx_cluster_status"):
+        cursor.execute(f"CREATE INDEX idx_cluster_status ON {table} (clusterIdx, status)")
+
+
+def _create_mlid_sequence(cursor, table):
+    seq_table = mlid_allocator.sequence_table_for(table)
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {seq_table} (
+        name VARCHAR(64) PRIMARY KEY,
+        next_val BIGINT UNSIGNED NOT NULL
+    )
+    """)
+    # 기존 keti 번호 중 최대값(숫자 기준) 다음 번호부터 발급
+    cursor.execute(f"SELECT MAX(mlSeq) FROM {table}")
+    current_max = cursor.fetchone()[0]
+    cursor.execute(
+        f"INSERT IGNORE INTO {seq_table} (name, next_val) VALUES (%s, %s)",
+        (ML_ID_PREFIX, int(current_max or 0) + 1),
+    )
+
+
+# (version, description, step) - 한 번 배포된 항목은 수정하지 말고 새 버전을 추가
+MIGRATIONS = [
+    (1, "create ml workload table", _create_workload_table),
+    (2, "index on name", _add_name_index),
+    (3, "numeric mlSeq column", _add_ml_seq),
+    (4, "index on (clusterIdx, status)", _add_cluster_status_index),
+    (5, "mlId sequence table", _create_mlid_sequence),
+]
+
+
+def _applied_versions(cursor, version_table):
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {version_table} (
+        version INT PRIMARY KEY,
+        description VARCHAR(255),
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute(f"SELECT version FROM {version_table}")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def run_migrations(table=None):
+    applied_now = []
+    with get_db_info() as (connection, cursor, default_table):
+        table = table or default_table
+        version_table = f"{table}_schema_migrations"
+        lock_name = f"migrate:{table}"
+
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (lock_name, _LOCK_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError(f"Could not acquire migration lock for '{table}'.")
+        try:
+            applied = _applied_versions(cursor, version_table)
+            for version, description, step in MIGRATIONS:
+                if version in applied:
+                    continue
+                print(f"Applying migration {version} on '{table}': {description}")
+                step(cursor, table)
+                cursor.execute(
+                    f"INSERT INTO {version_table} (version, description) VALUES (%s, %s)",
+                    (version, description),
+                )
+                connection.commit()
+                applied_now.append(version)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+
+    if applied_now:
+        print(f"Schema of '{table}' migrated to version {applied_now[-1]}.")
+    return {"table": table, "applied": applied_now, "version": MIGRATIONS[-1][0]}
+
+
+if __name__ == '__main__':
+    # python -m utils.migrations [table]
+    print(run_migrations(sys.argv[1] if len(sys.argv) > 1 else None))
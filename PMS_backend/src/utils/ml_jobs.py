@@ -0,0 +1,237 @@
+import time
+import json
+import uuid
+import queue
+import hashlib
+import threading
+import traceback
+from collections import OrderedDict
+from .ml_utils import submit_ml_workload
+from .metrics import registry, Gauge
+from .profiler import request_profiler
+from .settings import settings
+
+
+class QueueFullError(Exception):
+    pass
+
+
+def submission_key(spec):
+    # 변환된 파이프라인 manifest digest + cluster + retry 기준 해시 (yaml 공백/따옴표 차이는 무시)
+    content = json.dumps([spec["digest"], spec["cluster_idx"], bool(spec["retry"])], default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class MLJobQueue:
+    """/api/v1/strato 제출 요청을 큐에 넣고 고정 개수의 워커가 순서대로 처리.
+
+    job 상태: queued -> running -> succeeded / failed
+    종료된 job은 max_history 개수, ttl 시간 동안만 조회 가능하다.
+    같은 내용의 제출은 처리 중(in-flight)이거나 dedup_ttl 이내에 성공한 job으로 합친다.
+    """
+
+    def __init__(self, workers=4, max_queue=100, max_history=1000, ttl=3600, dedup_ttl=300):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_history = max_history
+        self.ttl = ttl
+        self.dedup_ttl = dedup_ttl
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = OrderedDict()  # job id -> job dict (생성 순)
+        self._done = {}  # job id -> threading.Event (종료 대기용)
+        self._inflight = {}  # submission key -> 대기/실행 중인 job id
+        self._results = {}  # submission key -> 성공한 job id
+        self._lock = threading.Lock()
+        self._threads = []
+        self._draining = False
+        self._counters = {"submitted": 0, "deduplicated": 0, "rejected": 0, "succeeded": 0, "failed": 0}
+
+    def start(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for i in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._run, name=f"ml-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, spec):
+        # 반환값: (job, deduplicated)
+        self.start()
+        key = submission_key(spec)
+        job = {
+            "id": uuid.uuid4().hex,
+            "key": key,
+            "status": "queued",
+            "name": spec["name"],
+            "cluster": spec["cluster_idx"],
+            "retry": bool(spec["retry"]),
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "mlId": None,
+            "message": None,
+            "response": None,
+            "placement": None,
+            "duplicates": 0,
+            "profile_id": None,
+        }
+        with self._lock:
+            if self._draining:
+                self._counters["rejected"] += 1
+                raise QueueFullError("Server is shutting down, submission not accepted.")
+            self._prune_locked()
+            duplicate = self._find_duplicate_locked(key)
+            if duplicate is not None:
+                duplicate["duplicates"] += 1
+                self._counters["deduplicated"] += 1
+                return self._public(duplicate), True
+            try:
+                self._queue.put_nowait((job["id"], spec))
+            except queue.Full:
+                self._counters["rejected"] += 1
+                raise QueueFullError(f"Submission queue is full ({self.max_queue} jobs waiting).")
+            self._jobs[job["id"]] = job
+            self._done[job["id"]] = threading.Event()
+            self._inflight[key] = job["id"]
+            self._counters["submitted"] += 1
+            return self._public(job), False
+
+    def _find_duplicate_locked(self, key):
+        job_id = self._inflight.get(key)
+        if job_id is None:
+            job_id = self._results.get(key)
+            job = self._jobs.get(job_id)
+            if job is None or time.time() - job["finished_at"] > self.dedup_ttl:
+                self._results.pop(key, None)
+                return None
+            return job
+        return self._jobs.get(job_id)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else self._public(job)
+
+    def wait(self, job_id, timeout=None):
+        # 동기 제출용: job 종료까지 대기 후 상태 반환 (timeout이면 현재 상태)
+        with self._lock:
+            done = self._done.get(job_id)
+        if done is not None:
+            done.wait(timeout)
+        return self.get(job_id)
+
+    def drain(self, timeout):
+        # graceful shutdown: 새 제출은 거절하고 대기/실행 중인 job이 끝날 때까지 대기
+        with self._lock:
+            self._draining = True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.1)
+        remaining = self._queue.unfinished_tasks
+        if remaining:
+            print(f"Error: {remaining} ML jobs still pending after {timeout}s drain timeout")
+        return remaining
+
+    def _run(self):
+        while True:
+            job_id, spec = self._queue.get()
+            try:
+                self._process(job_id, spec)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job_id, spec):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(status="running", started_at=time.time())
+        try:
+            if spec.get("profile"):
+                # 제출 요청이 프로파일링 대상이면 실제 처리(워커 스레드)도 같이 프로파일링
+                result, profile_id = request_profiler.run(
+                    {"method": "JOB", "path": f"ml-job/{job_id}", "route": "ml_job_queue"}, submit_ml_workload, spec)
+                with self._lock:
+                    job["profile_id"] = profile_id
+            else:
+                result = submit_ml_workload(spec)
+            update = {
+                "status": "succeeded" if result["success"] else "failed",
+                "mlId": result["mlId"],
+                "message": result["message"],
+                "response": result["response"],
+                "placement": result.get("placement"),
+            }
+            if result.get("placement"):
+                update["cluster"] = result["placement"]["cluster"]
+        except Exception as e:
+            print(f"Error: ML job {job_id} failed: {e}")
+            print(traceback.format_exc())
+            update = {"status": "failed", "message": f"Error: {e}"}
+        with self._lock:
+            job.update(update, finished_at=time.time())
+            self._counters[job["status"]] += 1
+            if self._inflight.get(job["key"]) == job_id:
+                del self._inflight[job["key"]]
+            # 성공한 결과만 재사용, 실패한 제출은 다시 시도할 수 있도록 캐시하지 않음
+            if job["status"] == "succeeded":
+                self._results[job["key"]] = job_id
+            done = self._done.pop(job_id, None)
+        if done is not None:
+            done.set()
+
+    def _prune_locked(self):
+        # 오래된 종료 job부터 정리 (대기/실행 중인 job은 유지)
+        now = time.time()
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        overflow = len(finished) - self.max_history
+        for job_id in finished:
+            if overflow > 0 or now - self._jobs[job_id]["finished_at"] > self.ttl:
+                job = self._jobs.pop(job_id)
+                if self._results.get(job["key"]) == job_id:
+                    del self._results[job["key"]]
+                overflow -= 1
+
+    def _public(self, job):
+        public = dict(job)
+        del public["key"]
+        if public["started_at"] is not None:
+            end = public["finished_at"] or time.time()
+            public["elapsed_ms"] = round((end - public["started_at"]) * 1000, 3)
+        return public
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job["status"] == "running")
+            return {
+                "workers": self.workers,
+                "draining": self._draining,
+                "queued": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "running": running,
+                "tracked": len(self._jobs),
+                "inflight_keys": len(self._inflight),
+                "cached_results": len(self._results),
+                **self._counters,
+            }
+
+
+ml_job_queue = MLJobQueue(
+    workers=settings.ml_job_workers,
+    max_queue=settings.ml_job_max_queue,
+    max_history=settings.ml_job_max_history,
+    ttl=settings.ml_job_ttl,
+    dedup_ttl=settings.ml_dedup_ttl,
+)
+
+_ml_jobs = registry.register(Gauge("pms_ml_jobs", "ML submission jobs by state.", ("state",)))
+
+
+def _collect_ml_job_metrics():
+    stats = ml_job_queue.stats()
+    _ml_jobs.set("queued", value=stats["queued"])
+    _ml_jobs.set("running", value=stats["running"])
+
+
+registry.add_collector(_collect_ml_job_metrics)
@@ -0,0 +1,177 @@
+import json
+import time
+import hashlib
+import threading
+import traceback
+from .db_utils import get_current_ml_list, update_mldb, load_ml_snapshot, apply_ml_delta, ML_REQUIRED_KEYS
+from .settings import settings
+
+
+def _fingerprint(item):
+    return hashlib.sha1(json.dumps(item, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class MLReconciler:
+    """STRATO ML 목록과 DB를 백그라운드에서 동기화.
+
+    로컬 snapshot(mlId -> fingerprint)과 원격 목록을 비교해 변경분만 DB에 반영한다.
+    fingerprint가 None인 항목은 DB에는 있지만 내용을 아직 확인하지 못한 항목이다.
+    """
+
+    def __init__(self, interval=30, max_staleness=120):
+        self.interval = interval
+        self.max_staleness = max_staleness
+
+        self._snapshot = None
+        self._last_sync = None  # time.monotonic()
+        self._last_result = None
+        self._last_error = None
+        self._syncs = 0
+        self._failures = 0
+
+        self._sync_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._state_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ml-reconciler", daemon=True)
+            self._thread.start()
+            print(f"ML reconciler started (interval={self.interval}s, max_staleness={self.max_staleness}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception:
+                pass  # sync() 내부에서 기록
+            self._stop.wait(self.interval)
+
+    def age(self):
+        if self._last_sync is None:
+            return None
+        return time.monotonic() - self._last_sync
+
+    def ensure_fresh(self, max_staleness=None):
+        # submit 경로: snapshot이 허용 범위 안이면 원격 호출 없이 바로 반환
+        bound = self.max_staleness if max_staleness is None else max_staleness
+        age = self.age()
+        if age is not None and age <= bound:
+            return False
+        last_sync = self._last_sync
+        with self._sync_lock:
+            # 대기하는 동안 다른 스레드가 동기화를 끝냈다면 재사용
+            if self._last_sync is not None and self._last_sync != last_sync:
+                return False
+            try:
+                self._sync_locked(full=False)
+            except Exception:
+                # 한 번이라도 동기화된 snapshot이 있으면 stale 상태로 계속 진행
+                if self._snapshot is None:
+                    raise
+                return False
+        return True
+
+    def sync(self, full=False):
+        with self._sync_lock:
+            return self._sync_locked(full)
+
+    def _sync_locked(self, full):
+        started = time.monotonic()
+        try:
+            ml_workload_list = get_current_ml_list() or []
+            if full or self._snapshot is None:
+                # 테이블 생성 / 초기 입력 후 DB 기준으로 snapshot 재구성
+                update_mldb(ml_workload_list)
+                self._snapshot = {mlid: None for mlid in load_ml_snapshot()}
+
+            upserts, deletes, fingerprints = self._diff(ml_workload_list)
+            if upserts or deletes:
+                apply_ml_delta(upserts, deletes)
+            for mlid in deletes:
+                self._snapshot.pop(mlid, None)
+            self._snapshot.update(fingerprints)
+
+            self._syncs += 1
+            self._last_sync = time.monotonic()
+            self._last_error = None
+            self._last_result = {
+                "full": bool(full),
+                "remote": len(ml_workload_list),
+                "upserted": len(upserts),
+                "deleted": len(deletes),
+                "elapsed_ms": round((self._last_sync - started) * 1000, 3),
+            }
+            if upserts or deletes:
+                print(f"ML reconciler applied delta: {self._last_result}")
+            return self._last_result
+        except Exception as e:
+            self._failures += 1
+            self._last_error = str(e)
+            print(f"Error: ML reconcile failed: {e}")
+            print(traceback.format_exc())
+            raise
+
+    def _diff(self, ml_workload_list):
+        remote = {}
+        for item in ml_workload_list:
+            mlid = item.get("mlId")
+            if mlid is None:
+                continue
+            remote[mlid] = item
+
+        # 원격 목록에서 사라진 mlId 삭제 ("workload-" 항목은 기존 규칙대로 유지)
+        deletes = [mlid for mlid in self._snapshot if mlid not in remote and not mlid.startswith("workload-")]
+
+        upserts, fingerprints = [], {}
+        for mlid, item in remote.items():
+            fp = _fingerprint(item)
+            if self._snapshot.get(mlid) == fp:
+                continue
+            missing_keys = ML_REQUIRED_KEYS - set(item.keys())
+            if missing_keys:
+                print(f"Skipping item due to missing keys: {missing_keys}")
+                continue
+            upserts.append(item)
+            fingerprints[mlid] = fp
+        return upserts, deletes, fingerprints
+
+    def record(self, workload):
+        # apply 성공 직후 해당 workload만 반영
+        with self._sync_lock:
+            apply_ml_delta([workload], [])
+            if self._snapshot is not None:
+                self._snapshot[workload["mlId"]] = _fingerprint(workload)
+
+    def forget(self, mlid):
+        with self._sync_lock:
+            if self._snapshot is not None:
+                self._snapshot.pop(mlid, None)
+
+    def stats(self):
+        age = self.age()
+        snapshot = self._snapshot
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "max_staleness": self.max_staleness,
+            "snapshot_size": None if snapshot is None else len(snapshot),
+            "age_seconds": None if age is None else round(age, 3),
+            "syncs": self._syncs,
+            "failures": self._failures,
+            "last_result": self._last_result,
+            "last_error": self._last_error,
+        }
+
+
+reconciler = MLReconciler(
+    interval=settings.ml_sync_interval,
+    max_staleness=settings.ml_sync_max_staleness,
+)
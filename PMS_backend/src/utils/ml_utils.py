@@ -1,49 +1,77 @@
-import os
 import json
-import yaml
 import base64
-import requests
-from dotenv import load_dotenv
-from .db_utils import get_current_ml_list, update_mldb, insert_ml_workload_info, remove_ml, get_next_mlid
+from .db_utils import remove_ml
+from .http_client import get_upstream
+from .mlid_allocator import mlid_allocator
+from .ml_reconciler import reconciler
+from .manifest_utils import manifest_cache, yaml, yaml_loader
+from .resource_utils import parse_recommend
+from .placement import placement_advisor, pipeline_demand, DIMENSIONS
 
-load_dotenv()
+USER_ID = "jhpark"
 
-def ml_post_handler(request):
-    ml_workload_list = get_current_ml_list()
-    print("Current ML Workload : ")
-    print(ml_workload_list)
-    update_mldb(ml_workload_list)
-    
-    # 요청 데이터에서 cluster와 base64 인코딩된 yaml 가져오기   
-    request_data = request.get_json()
-    cluster_idx = request_data.get("cluster", 1)  # cluster 기본값 1
+def parse_ml_request(request_data):
+    # 요청 데이터에서 cluster와 base64 인코딩된 yaml 가져오기 (형식 오류는 ValueError)
+    if not isinstance(request_data, dict) or not request_data.get("yaml"):
+        raise ValueError("yaml (base64 encoded workflow) is required.")
+    cluster_idx = request_data.get("cluster", 1)  # cluster 기본값 1, "auto"면 제출 시 placement advisor가 선택
     encoded_yaml = request_data.get("yaml")  # 요청에서 인코딩된 yaml 가져오기
     retry = request_data.get("retry")
-    
-    
-    decoded_yaml = base64.b64decode(encoded_yaml).decode("utf-8")
-    parsed_yaml = yaml.safe_load(decoded_yaml)
 
-    # 변수 추출
-    metadata = json.loads(parsed_yaml['metadata']['annotations']['pipelines.kubeflow.org/pipeline_spec'])
-    name = metadata['name']
-    description = metadata['description']
-    userid = "jhpark"
-    
-    # ml.workload.id 컴포넌트 별 추가
-    if 'spec' in parsed_yaml and 'templates' in parsed_yaml['spec']:
-        for template in parsed_yaml['spec']['templates']:
-            if 'metadata' in template:
-                labels = template['metadata'].setdefault('labels', {})
-                labels['ml.workload.id'] = userid  # 라벨 형식으로 추가
-    
-    # 수정된 YAML을 다시 base64로 인코딩
-    updated_yaml = yaml.dump(parsed_yaml, sort_keys=False)
-    updated_encoded_yaml = base64.b64encode(updated_yaml.encode('utf-8')).decode('utf-8')
+    try:
+        # decode/parse + 라벨 추가 + dump 결과는 입력 digest 기준으로 캐시
+        manifest = manifest_cache.transform(encoded_yaml, USER_ID)
+    except Exception as e:
+        raise ValueError(f"Invalid pipeline yaml : {e}")
+
+    return {
+        "cluster_idx": cluster_idx,
+        "retry": retry,
+        "name": manifest["name"],
+        "description": manifest["description"],
+        "yaml": manifest["yaml"],
+        "digest": manifest["digest"],
+    }
+
+
+def advise_cluster(encoded_yaml):
+    # "cluster": "auto" -> 추천 리소스 기준 step 요구량으로 클러스터 선택 (제출 yaml은 변경하지 않음)
+    parsed_yaml = yaml.load(base64.b64decode(encoded_yaml), Loader=yaml_loader())
+    templates = (parsed_yaml.get('spec') or {}).get('templates') or []
+    try:
+        parse_recommend(templates)
+    except Exception as e:
+        print(f"Error: recommendation failed during placement, using manifest resources : {e}")
+    demand = pipeline_demand(templates)
+    cluster_idx, fitted = placement_advisor.place(demand)
+    print(f"Placement : cluster {cluster_idx} (fitted={fitted}), demand {dict(zip(DIMENSIONS, demand.round(3).tolist()))}")
+    return cluster_idx, {"cluster": cluster_idx, "fitted": fitted,
+                         "demand": dict(zip(DIMENSIONS, demand.round(3).tolist()))}
+
+
+def submit_ml_workload(spec):
+    # 전체 동기화는 백그라운드 reconciler가 담당 (ML_SYNC_ENABLED일 때 startup()에서 시작)
+    # snapshot이 오래된 경우에만 이 요청에서 동기화
+    reconciler.ensure_fresh()
+    print(f"Current ML Workload snapshot : {reconciler.stats()['snapshot_size']} items")
+
+    cluster_idx = spec["cluster_idx"]
+    placement = None
+    if cluster_idx == "auto":
+        try:
+            cluster_idx, placement = advise_cluster(spec["yaml"])
+        except Exception as e:
+            return {"success": False, "mlId": None, "message": f"Error: Failed to select cluster : {e}", "response": None}
+    retry = spec["retry"]
+    name = spec["name"]
+    description = spec["description"]
+    # 라벨(ml.workload.id) 추가 후 다시 base64로 인코딩된 YAML
+    updated_encoded_yaml = spec["yaml"]
     
     # 재시작 시나리오 -> 기존 mlid 그대로 유지
     if retry:
         mlid = remove_ml(name)
+        reconciler.forget(mlid)
         data = {
             "clusterIdx": cluster_idx,
             "description": description,
@@ -55,13 +83,13 @@ def ml_post_handler(request):
             ],
             "name": name,
             "namespace": "keti-crd",
-            "userId": "jhpark",
+            "userId": USER_ID,
             "yaml": updated_encoded_yaml,
             "overwrite": 1
         }
-    #최초 실행 시나리오 -> DB 기반 mlid (keti001 ~ keti999)
+    #최초 실행 시나리오 -> 시퀀스 테이블 기반 mlid (keti001 ~)
     else:
-        mlid = get_next_mlid()
+        mlid = mlid_allocator.next_id()
         data = {
             "clusterIdx": cluster_idx,
             "description": description,
@@ -73,7 +101,7 @@ def ml_post_handler(request):
             ],
             "name": name,
             "namespace": "keti-crd",
-            "userId": "jhpark",
+            "userId": USER_ID,
             "yaml": updated_encoded_yaml,
             "overwrite": 0
         }
@@ -82,25 +110,27 @@ def ml_post_handler(request):
     print("ML Workload data : ")
     print(data_json)
     
-    token = os.getenv('TOKEN')
-    headers = {
-        "Authorization": token,
-        "accept": "*/*",
-        "Content-Type": "application/json"
-    }
-    
-    ml_post_url = os.getenv('URL') + '/interface/api/v2/ml/apply'
-    response = requests.post(ml_post_url, headers=headers, data=data_json)
+    # STRATO apply는 non-idempotent -> 연결 timeout 외에는 재시도하지 않음
+    try:
+        response = get_upstream("strato").post('/interface/api/v2/ml/apply', data=data_json)
+    except Exception as e:
+        return {"success": False, "mlId": mlid, "message": f"Error: Failed to call STRATO apply API : {e}", "response": None}
     response_data = response.json()
     print(response_data)
+    result = {"success": False, "mlId": mlid, "response": response_data, "placement": placement}
     if response_data.get("code", {}) == str(10001):
-        result = response_data.get("result", {})
-        if result.get("success") is True:
-            insert_ml_workload_info([result.get("workload")])
-            return "ML Workload running was successfully."
+        apply_result = response_data.get("result", {})
+        if apply_result.get("success") is True:
+            try:
+                reconciler.record(apply_result.get("workload"))
+            except Exception as e:
+                # STRATO에는 이미 반영됨 -> 제출은 성공으로 처리하고 DB 반영은 다음 동기화에 맡김 (재시도 시 중복 apply 방지)
+                print(f"Error: Failed to record ML workload {mlid}, will be repaired by next sync: {e}")
+            result.update(success=True, message="ML Workload running was successfully.")
         else:
-            return f"Error: {response_data}"
+            result["message"] = f"Error: {response_data}"
     elif response_data.get("code", {}) == str(10002):
-        return f"Error: Server error : {response_data['message']}"
+        result["message"] = f"Error: Server error : {response_data['message']}"
     else:
-        return f"Error: Failed to running ML Workload, status code {response.status_code}"
\ No newline at end of file
+        result["message"] = f"Error: Failed to running ML Workload, status code {response.status_code}"
+    return result
@@ -0,0 +1,81 @@
+import os
+import threading
+from .db_utils import get_db_info, ML_ID_PREFIX
+from .settings import settings
+
+
+def format_mlid(prefix, num):
+    return f'{prefix}{num:03}'  # 기존 keti001 형식 유지 (1000 이상은 자릿수 증가)
+
+
+class MLIdAllocator:
+    """카운터 테이블 기반 mlId 발급기.
+
+    `UPDATE ... SET next_val = LAST_INSERT_ID(next_val + n)` 한 번으로 n개의 id 블록을
+    원자적으로 예약하고, 블록을 다 쓰기 전까지는 DB 없이 메모리에서 발급한다.
+    예약 시 카운터를 MAX(mlSeq)+1 이상으로 올려, reconciler가 STRATO에서 가져온 기존 id와 겹치지 않게 한다.
+    카운터 테이블 생성과 초기값 설정은 migrations에서 수행한다.
+    프로세스가 종료되면 남은 블록 번호는 버려지므로 id에 빈 번호가 생길 수 있다.
+    """
+
+    def __init__(self, prefix="keti", block_size=10, sequence_table=None):
+        self.prefix = prefix
+        self.block_size = max(1, block_size)
+        self.sequence_table = sequence_table
+
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._next = 0
+        self._end = 0
+        self._blocks = 0
+        self._issued = 0
+
+    def next_id(self):
+        with self._lock:
+            # fork된 워커는 부모의 블록을 이어 쓰지 않도록 초기화
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._next = self._end = 0
+            if self._next >= self._end:
+                self._next, self._end = self._allocate_block()
+            num = self._next
+            self._next += 1
+            self._issued += 1
+        return format_mlid(self.prefix, num)
+
+    def sequence_table_for(self, table):
+        return self.sequence_table or f"{table}_mlid_seq"
+
+    def _allocate_block(self):
+        with get_db_info() as (connection, cursor, table):
+            # MAX(mlSeq)는 idx_mlseq 인덱스로 조회
+            updated = cursor.execute(
+                f"UPDATE {self.sequence_table_for(table)} "
+                f"SET next_val = LAST_INSERT_ID(GREATEST(next_val, (SELECT COALESCE(MAX(mlSeq), 0) + 1 FROM {table})) + %s) "
+                f"WHERE name = %s",
+                (self.block_size, self.prefix),
+            )
+            if not updated:
+                raise RuntimeError(f"mlId sequence '{self.prefix}' is not initialized. Run schema migrations first.")
+            cursor.execute("SELECT LAST_INSERT_ID()")
+            end = int(cursor.fetchone()[0])
+        self._blocks += 1
+        print(f"Reserved mlId block {format_mlid(self.prefix, end - self.block_size)} ~ {format_mlid(self.prefix, end - 1)}")
+        return end - self.block_size, end
+
+    def stats(self):
+        with self._lock:
+            return {
+                "prefix": self.prefix,
+                "block_size": self.block_size,
+                "blocks_reserved": self._blocks,
+                "issued": self._issued,
+                "remaining_in_block": self._end - self._next,
+            }
+
+
+mlid_allocator = MLIdAllocator(
+    prefix=ML_ID_PREFIX,
+    block_size=settings.mlid_block_size,
+    sequence_table=settings.mlid_sequence_table,
+)
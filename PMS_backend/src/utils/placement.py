@@ -0,0 +1,300 @@
+import re
+import json
+import time
+import threading
+from collections import deque
+from .lazy import lazy_module, lazy_object
+from .settings import settings
+
+np = lazy_module("numpy")
+yaml = lazy_module("yaml")
+
+DIMENSIONS = ("cpu", "memory", "gpu")  # cpu: 코어, memory: Mi, gpu: 개수
+_QUANTITY = re.compile(r"^([0-9.]+)([a-zA-Z]*)$")
+_MEMORY_UNITS = {"": 1 / 2 ** 20, "Ki": 1 / 1024, "Mi": 1, "Gi": 1024, "Ti": 1024 ** 2,
+                 "k": 1e3 / 2 ** 20, "K": 1e3 / 2 ** 20, "M": 1e6 / 2 ** 20, "G": 1e9 / 2 ** 20, "T": 1e12 / 2 ** 20}
+
+
+def parse_cpu(value):
+    # "1.5", "500m", 2 -> 코어
+    if value is None:
+        return 0.0
+    match = _QUANTITY.match(str(value).strip())
+    if match is None or match.group(2) not in ("", "m"):
+        raise ValueError(f"Invalid cpu quantity '{value}'")
+    return float(match.group(1)) / (1000 if match.group(2) == "m" else 1)
+
+
+def parse_memory(value):
+    # "805Mi", "1Gi", "512M", 1073741824(bytes) -> Mi
+    if value is None:
+        return 0.0
+    match = _QUANTITY.match(str(value).strip())
+    if match is None or match.group(2) not in _MEMORY_UNITS:
+        raise ValueError(f"Invalid memory quantity '{value}'")
+    return float(match.group(1)) * _MEMORY_UNITS[match.group(2)]
+
+
+def step_demand(template):
+    # 컨테이너 step 하나의 요구량: cpu/memory는 requests, gpu는 limits 기준 (없으면 limits/requests로 대체)
+    resources = template.get('container', {}).get('resources') or {}
+    requests = resources.get('requests') or {}
+    limits = resources.get('limits') or {}
+    return np.array([
+        parse_cpu(requests.get('cpu') if requests.get('cpu') is not None else limits.get('cpu')),
+        parse_memory(requests.get('memory') if requests.get('memory') is not None else limits.get('memory')),
+        float(limits.get('nvidia.com/gpu') or requests.get('nvidia.com/gpu') or 0),
+    ])
+
+
+def _dag_tasks(items):
+    # DAG task 목록 검증 -> {이름: task}, 형식이 잘못된 DAG는 ValueError (요청 오류로 처리)
+    if not isinstance(items, list):
+        raise ValueError("Pipeline DAG tasks must be a list")
+    tasks = {}
+    for task in items:
+        name = task.get('name') if isinstance(task, dict) else None
+        if not isinstance(name, str) or not name:
+            raise ValueError("Every pipeline DAG task must have a name")
+        tasks[name] = task
+    for name, task in tasks.items():
+        dependencies = task.get('dependencies') or []
+        if not isinstance(dependencies, list):
+            raise ValueError(f"Dependencies of pipeline DAG task '{name}' must be a list")
+        for parent in dependencies:
+            if parent not in tasks:
+                raise ValueError(f"Pipeline DAG task '{name}' depends on unknown task '{parent}'")
+    return tasks
+
+
+def _dag_depths(tasks):
+    # _dag_tasks 결과 -> {이름: 의존성 깊이}, 순환이 있으면 ValueError
+    depths = {}
+
+    def depth(name, visiting=()):
+        if name not in depths:
+            if name in visiting:
+                raise ValueError(f"Cycle in pipeline DAG at task '{name}'")
+            parents = tasks[name].get('dependencies') or []
+            depths[name] = 1 + max((depth(parent, visiting + (name,)) for parent in parents), default=-1)
+        return depths[name]
+
+    for name in tasks:
+        depth(name)
+    return depths
+
+
+def pipeline_levels(templates):
+    # DAG task를 의존성 깊이별로 묶음 -> [[container template, ...], ...]
+    # DAG가 없으면 모든 컨테이너 step을 한 단계로 취급 (동시에 실행된다고 가정)
+    by_name = {template.get('name'): template for template in templates if isinstance(template, dict)}
+    containers = [template for template in by_name.values() if 'container' in template]
+    dag = next((template['dag'] for template in by_name.values() if template.get('dag')), None)
+    if not isinstance(dag, dict) or not dag.get('tasks'):
+        return [containers] if containers else []
+    tasks = _dag_tasks(dag['tasks'])
+    depths = _dag_depths(tasks)
+    levels = {}
+    for name, task in tasks.items():
+        template = by_name.get(task.get('template'))
+        if template is not None and 'container' in template:
+            levels.setdefault(depths[name], []).append(template)
+    return [levels[level] for level in sorted(levels)]
+
+
+def pipeline_demand(templates):
+    # 파이프라인이 동시에 점유하는 최대 요구량: 같은 깊이의 step 합 중 최댓값 (차원별)
+    demand = np.zeros(len(DIMENSIONS))
+    for level in pipeline_levels(templates):
+        demand = np.maximum(demand, sum((step_demand(template) for template in level), np.zeros(len(DIMENSIONS))))
+    return demand
+
+
+def best_fit_decreasing(demands, free, capacity):
+    # demands: (n, 3), free/capacity: (m, 3) -> 파이프라인별 클러스터 위치 (배치 불가 시 -1)
+    # 큰 요구량(클러스터 용량 대비 비율의 최댓값)부터, 배치 후 남는 정규화 여유량 합이 가장 작은 클러스터에 배치
+    demands = np.asarray(demands, dtype=np.float64).reshape(-1, len(DIMENSIONS))
+    free = np.array(free, dtype=np.float64).reshape(-1, len(DIMENSIONS))
+    scale = np.where(np.asarray(capacity, dtype=np.float64) > 0, capacity, 1).max(axis=0)
+    order = np.argsort(-(demands / scale).max(axis=1), kind="stable")
+    assignment = np.full(len(demands), -1, dtype=np.int64)
+    for i in order:
+        residual = free - demands[i]
+        feasible = (residual >= -1e-9).all(axis=1)
+        if not feasible.any():
+            continue
+        score = np.where(feasible, (residual / scale).sum(axis=1), np.inf)
+        target = int(np.argmin(score))
+        assignment[i] = target
+        free[target] = residual[target]
+    return assignment, free
+
+
+class ClusterRegistry:
+    """클러스터별 용량 / 현재 할당량 + 배치 결정에 따른 임시 예약.
+
+    할당량은 외부(모니터링)에서 주기적으로 갱신한다고 가정하고, 그 사이 배치한 파이프라인은
+    reservation_ttl 동안 예약으로 차감한다 (할당량 갱신 시 해당 클러스터 예약은 초기화).
+    """
+
+    def __init__(self, clusters=None, reservation_ttl=600):
+        self.reservation_ttl = reservation_ttl
+        self._clusters = {}  # idx -> {"name", "capacity", "allocated", "updated_at"}
+        self._reservations = deque()  # (expires_at, idx, demand) - ttl이 고정이므로 만료 순서 = 추가 순서
+        self._reserved = {}  # idx -> [만료되지 않은 예약 합계, 개수]
+        self._arrays = None  # (idx 목록, 위치, capacity, allocated, reserved) - 클러스터 변경 시 다시 생성
+        self._lock = threading.Lock()
+        for cluster in clusters or []:
+            self.update(cluster["idx"], name=cluster.get("name"), capacity=cluster.get("capacity", cluster),
+                        allocated=cluster.get("allocated"))
+
+    @staticmethod
+    def _vector(values):
+        values = values or {}
+        return np.array([parse_cpu(values.get("cpu")), parse_memory(values.get("memory")),
+                         float(values.get("gpu") or 0)])
+
+    def update(self, idx, name=None, capacity=None, allocated=None):
+        idx = int(idx)
+        capacity = None if capacity is None else self._vector(capacity)
+        allocated = None if allocated is None else self._vector(allocated)
+        with self._lock:
+            cluster = self._clusters.get(idx)
+            if cluster is None:
+                if capacity is None:
+                    raise ValueError(f"capacity is required for new cluster {idx}")
+                cluster = self._clusters[idx] = {"name": name or str(idx), "capacity": capacity,
+                                                 "allocated": np.zeros(len(DIMENSIONS)), "updated_at": None}
+            if name:
+                cluster["name"] = name
+            if capacity is not None:
+                cluster["capacity"] = capacity
+            if allocated is not None:
+                cluster["allocated"] = allocated
+                cluster["updated_at"] = time.time()
+                self._clear_reservations(idx)
+            self._arrays = None
+
+    def _clear_reservations(self, idx):
+        self._reservations = deque(r for r in self._reservations if r[1] != idx)
+        self._reserved.pop(idx, None)
+        self._arrays = None
+
+    def _add_reserved(self, idx, demand, count):
+        reserved = self._reserved.setdefault(idx, [np.zeros(len(DIMENSIONS)), 0])
+        reserved[0] += demand
+        reserved[1] += count
+        if self._arrays is not None and idx in self._arrays[1]:
+            self._arrays[4][self._arrays[1][idx]] += demand
+
+    def _get_arrays(self):
+        if self._arrays is None:
+            indexes = sorted(self._clusters)
+            shape = (len(indexes), len(DIMENSIONS))
+            self._arrays = (
+                indexes,
+                {idx: position for position, idx in enumerate(indexes)},
+                np.array([self._clusters[i]["capacity"] for i in indexes]).reshape(shape),
+                np.array([self._clusters[i]["allocated"] for i in indexes]).reshape(shape),
+                np.array([self._reserved[i][0] if i in self._reserved else np.zeros(len(DIMENSIONS))
+                          for i in indexes]).reshape(shape),
+            )
+        return self._arrays
+
+    def _expire(self, now):
+        while self._reservations and self._reservations[0][0] <= now:
+            _, idx, demand = self._reservations.popleft()
+            if idx in self._reserved:
+                self._add_reserved(idx, -demand, -1)
+
+    def remove(self, idx):
+        with self._lock:
+            self._clear_reservations(int(idx))
+            self._arrays = None
+            return self._clusters.pop(int(idx), None) is not None
+
+    def snapshot(self):
+        # (idx 목록, capacity (m, 3), free (m, 3)) - 만료되지 않은 예약은 free에서 차감
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            indexes, _, capacity, allocated, reserved = self._get_arrays()
+            return list(indexes), capacity.copy(), capacity - allocated - reserved
+
+    def reserve(self, idx, demand):
+        with self._lock:
+            demand = np.asarray(demand, dtype=np.float64)
+            self._reservations.append((time.monotonic() + self.reservation_ttl, idx, demand))
+            self._add_reserved(idx, demand, 1)
+
+    def describe(self):
+        indexes, capacity, free = self.snapshot()
+        with self._lock:
+            reserved = {idx: self._reserved.get(idx, [None, 0])[1] for idx in indexes}
+            return [{
+                "idx": idx,
+                "name": self._clusters[idx]["name"],
+                "capacity": dict(zip(DIMENSIONS, capacity[position].round(3).tolist())),
+                "allocated": dict(zip(DIMENSIONS, self._clusters[idx]["allocated"].round(3).tolist())),
+                "free": dict(zip(DIMENSIONS, free[position].round(3).tolist())),
+                "reservations": reserved[idx],
+                "updated_at": self._clusters[idx]["updated_at"],
+            } for position, idx in enumerate(indexes) if idx in self._clusters]
+
+
+class PlacementAdvisor:
+    """추천 리소스 기반 파이프라인 클러스터 선택 (best-fit decreasing)."""
+
+    def __init__(self, registry, default_cluster=1):
+        self.registry = registry
+        self.default_cluster = default_cluster
+        self._lock = threading.Lock()
+        self._counters = {"placed": 0, "fallbacks": 0}
+
+    def plan(self, demands):
+        # 여러 파이프라인 배치 계획 (예약하지 않음) -> (클러스터 idx 또는 None 목록, 배치 후 free)
+        indexes, capacity, free = self.registry.snapshot()
+        if not indexes:
+            return [None] * len(demands), free
+        assignment, free = best_fit_decreasing(demands, free, capacity)
+        return [indexes[position] if position >= 0 else None for position in assignment], free
+
+    def place(self, demand):
+        # 파이프라인 하나 배치 + 예약, 들어갈 클러스터가 없으면 기본 클러스터
+        with self._lock:
+            clusters, _ = self.plan([demand])
+            cluster_idx = clusters[0]
+            if cluster_idx is None:
+                self._counters["fallbacks"] += 1
+                return self.default_cluster, False
+            self.registry.reserve(cluster_idx, demand)
+            self._counters["placed"] += 1
+            return cluster_idx, True
+
+    def stats(self):
+        with self._lock:
+            return {"clusters": len(self.registry.snapshot()[0]), "default_cluster": self.default_cluster,
+                    **self._counters}
+
+
+def _load_clusters():
+    # CLUSTER_REGISTRY='[{"idx": 1, "name": "...", "capacity": {"cpu": 64, "memory": "256Gi", "gpu": 8}}]'
+    # 또는 CLUSTER_REGISTRY_PATH (같은 형식의 yaml/json 파일), cpu/memory는 k8s 수량 형식 (단위 없는 memory는 bytes)
+    path = settings.cluster_registry_path
+    try:
+        if path:
+            with open(path) as f:
+                return yaml.safe_load(f) or []
+        return json.loads(settings.cluster_registry)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error loading cluster registry: {e}")
+        return []
+
+
+def _create_cluster_registry():
+    return ClusterRegistry(_load_clusters(), reservation_ttl=settings.placement_reservation_ttl)
+
+
+# 클러스터 목록 로드(numpy 사용)는 첫 사용 시
+cluster_registry = lazy_object("cluster_registry", _create_cluster_registry)
+placement_advisor = PlacementAdvisor(cluster_registry, default_cluster=settings.placement_default_cluster)
@@ -0,0 +1,192 @@
+import os
+import re
+import io
+import json
+import time
+import uuid
+import pstats
+import random
+import hmac
+import cProfile
+import threading
+from .settings import settings
+
+_PROFILE_ID = re.compile(r"^[0-9]{17}-[0-9a-f]{8}$")
+
+
+class RequestProfiler:
+    """요청 단위 cProfile (opt-in).
+
+    header가 있거나 sample_rate 확률에 걸린 요청만 프로파일링하고, 결과(.prof + .json)는
+    directory에 최대 max_profiles개까지 보관한다 (오래된 것부터 삭제).
+    비활성화 상태에서는 요청마다 boolean 확인 한 번만 수행한다.
+    """
+
+    def __init__(self, directory, max_profiles=50, sample_rate=0.0, header="X-Profile", token=None, enabled=False):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.sample_rate = sample_rate
+        self.header = header
+        self.token = token
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._saved = 0
+        self._skipped = 0
+
+    def should_profile(self, headers):
+        if not self.enabled:
+            return False
+        value = headers.get(self.header)
+        if value is not None:
+            return self.token is None or value == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def authorized(self, headers):
+        # 관리 엔드포인트: token이 설정되어 있고 같은 header 값이 일치할 때만 허용 (미설정 시 항상 거부)
+        value = headers.get(self.header)
+        return bool(self.token) and value is not None and hmac.compare_digest(value.encode(), self.token.encode())
+
+    def start(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 동작 중인 경우 (동시 요청 등)
+            with self._lock:
+                self._skipped += 1
+            return None
+        return profile
+
+    def finish(self, profile, meta):
+        profile.disable()
+        now = time.time()
+        profile_id = f"{time.strftime('%Y%m%d%H%M%S', time.localtime(now))}{int(now * 1000) % 1000:03}-{uuid.uuid4().hex[:8]}"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+            with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+                json.dump({"id": profile_id, "created_at": time.time(), **meta}, f)
+            with self._lock:
+                self._saved += 1
+            self._trim()
+        except OSError as e:
+            print(f"Error: failed to save profile {profile_id}: {e}")
+            return None
+        return profile_id
+
+    def run(self, meta, fn, *args, **kwargs):
+        # 요청 스레드 밖(job 워커 등)에서 실행되는 작업 프로파일링
+        profile = self.start()
+        if profile is None:
+            return fn(*args, **kwargs), None
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            meta = dict(meta, duration_ms=round((time.perf_counter() - started) * 1000, 3))
+            profile_id = self.finish(profile, meta)
+        return result, profile_id
+
+    def _trim(self):
+        with self._lock:
+            profiles = self._profile_ids()
+            for profile_id in profiles[:max(0, len(profiles) - self.max_profiles)]:
+                for ext in (".prof", ".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, profile_id + ext))
+                    except FileNotFoundError:
+                        pass
+
+    def _profile_ids(self):
+        if not os.path.isdir(self.directory):
+            return []
+        # id가 시간순 prefix를 가지므로 이름 정렬 = 생성 순
+        return sorted(name[:-5] for name in os.listdir(self.directory)
+                      if name.endswith(".prof") and _PROFILE_ID.match(name[:-5]))
+
+    def list(self):
+        profiles = []
+        for profile_id in reversed(self._profile_ids()):
+            try:
+                with open(os.path.join(self.directory, f"{profile_id}.json")) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                profiles.append({"id": profile_id})
+        return profiles
+
+    def path(self, profile_id):
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    def summary(self, profile_id, sort="cumulative", limit=50):
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "stored": len(self._profile_ids()),
+                "max_profiles": self.max_profiles,
+                "saved": self._saved,
+                "skipped": self._skipped,
+            }
+
+
+request_profiler = RequestProfiler(
+    directory=settings.profile_dir,
+    max_profiles=settings.profile_max_profiles,
+    sample_rate=settings.profile_sample_rate,
+    header=settings.profile_header,
+    token=settings.profile_token or None,
+    enabled=settings.profile_enabled,
+)
+
+
+def profiling_active():
+    # 현재 요청이 프로파일링 중인지 (job 워커로 전달할 때 사용)
+    from flask import g
+    return g.get("_profile") is not None
+
+
+def init_app_profiler(app, profiler=request_profiler):
+    from flask import g, request
+
+    @app.before_request
+    def _profile_start():
+        if not profiler.should_profile(request.headers):
+            return
+        profile = profiler.start()
+        if profile is not None:
+            g._profile = profile
+            g._profile_started = time.perf_counter()
+
+    @app.after_request
+    def _profile_end(response):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return response
+        profile_id = profiler.finish(profile, {
+            "method": request.method,
+            "path": request.path,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - g.pop("_profile_started")) * 1000, 3),
+        })
+        if profile_id:
+            response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    @app.teardown_request
+    def _profile_abort(exc):
+        # after_request를 거치지 않은 경우(처리 중 예외) 프로파일러 정리
+        profile = g.pop("_profile", None)
+        if profile is not None:
+            profile.disable()
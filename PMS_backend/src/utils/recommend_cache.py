@@ -0,0 +1,131 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+
+
+class RecommendationCache:
+    """추천 결과 LRU + TTL 캐시 (stale-while-revalidate).
+
+    - ttl 이내: 캐시 값 그대로 반환 (hit)
+    - ttl ~ ttl + stale_ttl: 캐시 값을 반환하고 백그라운드에서 갱신 (stale hit)
+    - 그 이후 또는 캐시 없음: 동기 조회 (miss), 실패 시 마지막 정상 값으로 대체 (fallback)
+    같은 key에 대한 동시 조회는 하나의 loader 호출로 합친다.
+    """
+
+    def __init__(self, loader, max_size=256, ttl=300, stale_ttl=600, refresh_workers=2):
+        self._loader = loader
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries = OrderedDict()  # key -> (value, loaded_at)
+        self._inflight = {}  # key -> Future
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresh_workers = refresh_workers
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="recommend-refresh")
+
+        self._counters = {
+            "hits": 0, "stale_hits": 0, "misses": 0, "loads": 0, "load_failures": 0,
+            "refreshes": 0, "refresh_failures": 0, "fallbacks": 0, "evictions": 0,
+        }
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at = entry
+                age = now - loaded_at
+                self._entries.move_to_end(key)
+                if age < self.ttl:
+                    self._counters["hits"] += 1
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._counters["stale_hits"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._refresh_executor.submit(self._refresh, key)
+                    return value
+            self._counters["misses"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._load(key)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    # 추천 서버 장애 시 마지막 정상 값 사용
+                    self._counters["fallbacks"] += 1
+                    print(f"Recommender unavailable for {key}, using last known value: {e}")
+                    future.set_result(entry[0])
+                    return entry[0]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def _load(self, key):
+        try:
+            value = self._loader(*key)
+        except Exception:
+            with self._lock:
+                self._counters["load_failures"] += 1
+            raise
+        with self._lock:
+            self._counters["loads"] += 1
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return value
+
+    def _refresh(self, key):
+        try:
+            self._load(key)
+            with self._lock:
+                self._counters["refreshes"] += 1
+        except Exception as e:
+            with self._lock:
+                self._counters["refresh_failures"] += 1
+            print(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def reset_after_fork(self):
+        # 부모 프로세스의 refresh 스레드/진행 중 Future는 fork된 프로세스에서 완료되지 않음
+        with self._lock:
+            self._inflight.clear()
+            self._refreshing.clear()
+            self._refresh_executor = ThreadPoolExecutor(max_workers=self._refresh_workers,
+                                                        thread_name_prefix="recommend-refresh")
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                **self._counters,
+            }
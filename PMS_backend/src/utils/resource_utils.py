@@ -1,79 +1,211 @@
-import os
 import json
-import requests
-from dotenv import load_dotenv
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .http_client import get_upstream
+from .recommend_cache import RecommendationCache
+from .local_recommender import local_recommender, RECOMMEND_MODES
+from .settings import settings
 
-load_dotenv()
+RESOURCE_LIST = {'cpu', 'memory', 'nvidia.com/gpu'}
 
-def parse_recommend(_dict):
-    resource_list = {'cpu', 'memory', 'nvidia.com/gpu'}
-    predict_url = os.getenv("RECOMMAND_SERVER")
-    headers = {
-        "accept": "*/*",
-        "Content-Type": "application/json"
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.recommend_max_workers,
+                                               thread_name_prefix="recommend")
+    return _executor
+
+def reset_recommend_executor():
+    # fork된 워커는 부모의 스레드 풀을 사용할 수 없으므로 다시 생성
+    global _executor
+    with _executor_lock:
+        _executor = None
+    recommendation_cache.reset_after_fork()
+
+def _workload_label(template):
+    return template.get('metadata', {}).get('labels', {}).get('ml.workload')
+
+def fetch_recommendation(workload_label):
+    inference_req = {"case" : workload_label}
+    recommend_resources = get_upstream("recommender").post(data=json.dumps(inference_req), idempotent=True)
+    result = recommend_resources.json()['result']
+    resource_req, resource_lim = result['requests'], result['limits']
+    return {
+        "req_cpu": resource_req[0][0][0]/100,
+        "req_mem": resource_req[0][0][1],
+        "lim_cpu": resource_lim[0][0][0]/100,
+        "lim_mem": resource_lim[0][0][1],
     }
+
+# remote: 추천 서버만 사용 / primary: 로컬 추천 우선, 관측치 부족 시 추천 서버
+# fallback: 추천 서버 실패 시 로컬 추천 / shadow: 추천 서버 결과 사용, 로컬 추천과의 차이만 기록
+RECOMMEND_MODE = settings.recommend_mode.lower()
+if RECOMMEND_MODE not in RECOMMEND_MODES:
+    raise ValueError(f"RECOMMEND_MODE must be one of {RECOMMEND_MODES}, got '{RECOMMEND_MODE}'")
+
+def load_recommendation(workload_label):
+    if RECOMMEND_MODE == "primary":
+        recommendation = local_recommender.recommend(workload_label)
+        if recommendation is not None:
+            return recommendation
+    try:
+        recommendation = fetch_recommendation(workload_label)
+    except Exception as e:
+        if RECOMMEND_MODE == "fallback":
+            recommendation = local_recommender.recommend(workload_label)
+            if recommendation is not None:
+                print(f"Error: recommender failed for '{workload_label}' ({e}), using local recommendation")
+                return recommendation
+        raise
+    if RECOMMEND_MODE == "shadow":
+        try:
+            local_recommender.compare(workload_label, recommendation)
+        except Exception as e:
+            print(f"Error: shadow recommend failed for '{workload_label}': {e}")
+    return recommendation
+
+# 추천 결과는 (라벨, 모델 버전) 단위로 캐시 - 모델 버전이 바뀌면 자연스럽게 새 key 사용
+RECOMMEND_MODEL_VERSION = settings.recommend_model_version
+recommendation_cache = RecommendationCache(
+    lambda workload_label, model_version: load_recommendation(workload_label),
+    max_size=settings.recommend_cache_size,
+    ttl=settings.recommend_cache_ttl,
+    stale_ttl=settings.recommend_cache_stale_ttl,
+)
+
+def get_recommendation(workload_label):
+    if not settings.recommend_cache_enabled:
+        return load_recommendation(workload_label)
+    return recommendation_cache.get((workload_label, RECOMMEND_MODEL_VERSION))
+
+def resolve_recommendations(labels):
+    # 중복 제거한 라벨별로 한 번씩, 병렬로 추천 조회 (캐시 hit는 호출 없음)
+    labels = list(dict.fromkeys(labels))
+    if len(labels) <= 1:
+        return {label: get_recommendation(label) for label in labels}
+    return dict(zip(labels, _get_executor().map(get_recommendation, labels)))
+
+def apply_recommendation(i, workload_label, recommendation):
+    resource_list = RESOURCE_LIST
+    req_cpu, req_mem = recommendation["req_cpu"], recommendation["req_mem"]
+    lim_cpu, lim_mem = recommendation["lim_cpu"], recommendation["lim_mem"]
+    if 'resources' in i['container'].keys():
+        # `requests`와 `limits` 각각 처리
+        for req in i['container']['resources']:
+            current_resources = set(i['container']['resources'][req].keys())
+            missing_resources = resource_list - current_resources
+            # 누락된 리소스 처리
+            for resource in missing_resources:
+                if resource == 'nvidia.com/gpu' and workload_label != "preprocess":
+                    if req == 'limits':
+                        i['container']['resources'][req]['nvidia.com/gpu'] = '1'  # 기본값 설정
+                elif resource == 'cpu':
+                    i['container']['resources'][req]['cpu'] = str(round(req_cpu, 2))
+                elif resource == 'memory':
+                    i['container']['resources'][req]['memory'] = str(req_mem) + 'Mi'
+            # 기존 리소스 처리
+            if req == 'requests':
+                i['container']['resources'][req].pop('nvidia.com/gpu', None)  # GPU 제거
+                if 'cpu' in i['container']['resources'][req]:
+                    i['container']['resources'][req]['cpu'] = str(round(req_cpu, 2))
+                if 'memory' in i['container']['resources'][req]:
+                    i['container']['resources'][req]['memory'] = str(round(req_mem,2)) + 'Mi'
+            elif req == 'limits':
+                if 'cpu' in i['container']['resources'][req]:
+                    i['container']['resources'][req]['cpu'] = str(round(lim_cpu, 2))
+                if 'memory' in i['container']['resources'][req]:
+                    i['container']['resources'][req]['memory'] = str(round(lim_mem,2)) + 'Mi'
+    else:
+        # resources가 없는 경우 기본값 추가
+        i['container']['resources'] = {
+            'requests': {
+                'cpu': str(round(req_cpu, 2)),
+                'memory': str(req_mem) + 'Mi',
+            },
+            'limits': {
+                'cpu': str(round(lim_cpu, 2)),
+                'memory': str(lim_mem) + 'Mi',
+                'nvidia.com/gpu': '1'
+            }
+        }
+    print("Current ML Workload Label: ", workload_label)
+    print("Recommend Resources : \n", i['container']['resources'])
+
+def apply_no_recommendation(i):
+    i['container']['resources'] = {
+            'requests': {
+                'cpu': None,
+                'memory': None,
+            },
+            'limits': {
+                'cpu': None,
+                'memory': None,
+            }
+        }
+    print("There is no label for ML workloads. Recommend does not occur")
+
+def _pipeline_labels(_dict):
+    if not isinstance(_dict, list):
+        raise TypeError("pipeline must be a list of templates.")
+    return [label for label in (_workload_label(i) for i in _dict if 'container' in i.keys()) if label]
+
+def _apply_pipeline(_dict, recommendations):
     for i in _dict:
         if 'container' in i.keys():
-            if 'ml.workload' in i['metadata']['labels'].keys():
-                workload_label = i['metadata']['labels']['ml.workload']
-                inference_req = {"case" : workload_label}
-                recommend_resources = requests.post(predict_url, headers=headers, data=json.dumps(inference_req))
-                resource_req, resource_lim = recommend_resources.json()['result']['requests'], recommend_resources.json()['result']['limits']
-                req_cpu = resource_req[0][0][0]/100
-                req_mem = resource_req[0][0][1]
-                lim_cpu = resource_lim[0][0][0]/100
-                lim_mem = resource_lim[0][0][1]
-                if 'resources' in i['container'].keys():
-                    # `requests`와 `limits` 각각 처리
-                    for req in i['container']['resources']:
-                        current_resources = set(i['container']['resources'][req].keys())
-                        missing_resources = resource_list - current_resources
-                        # 누락된 리소스 처리
-                        for resource in missing_resources:
-                            if resource == 'nvidia.com/gpu' and workload_label != "preprocess":
-                                if req == 'limits':
-                                    i['container']['resources'][req]['nvidia.com/gpu'] = '1'  # 기본값 설정
-                            elif resource == 'cpu':
-                                i['container']['resources'][req]['cpu'] = str(round(req_cpu, 2))
-                            elif resource == 'memory':
-                                i['container']['resources'][req]['memory'] = str(req_mem) + 'Mi'
-                        # 기존 리소스 처리
-                        if req == 'requests':
-                            i['container']['resources'][req].pop('nvidia.com/gpu', None)  # GPU 제거
-                            if 'cpu' in i['container']['resources'][req]:
-                                i['container']['resources'][req]['cpu'] = str(round(req_cpu, 2))
-                            if 'memory' in i['container']['resources'][req]:
-                                i['container']['resources'][req]['memory'] = str(round(req_mem,2)) + 'Mi'
-                        elif req == 'limits':
-                            if 'cpu' in i['container']['resources'][req]:
-                                i['container']['resources'][req]['cpu'] = str(round(lim_cpu, 2))
-                            if 'memory' in i['container']['resources'][req]:
-                                i['container']['resources'][req]['memory'] = str(round(lim_mem,2)) + 'Mi'
-                else:
-                    # resources가 없는 경우 기본값 추가
-                    i['container']['resources'] = {
-                        'requests': {
-                            'cpu': str(round(req_cpu, 2)),
-                            'memory': str(req_mem) + 'Mi',
-                        },
-                        'limits': {
-                            'cpu': str(round(lim_cpu, 2)),
-                            'memory': str(lim_mem) + 'Mi',
-                            'nvidia.com/gpu': '1'
-                        }
-                    }
-                print("Current ML Workload Label: ", workload_label)
-                print("Recommend Resources : \n", i['container']['resources'])
+            workload_label = _workload_label(i)
+            if workload_label:
+                apply_recommendation(i, workload_label, recommendations[workload_label])
+            else:
+                apply_no_recommendation(i)
+    return _dict
+
+def parse_recommend(_dict):
+    # 1) 컨테이너 라벨 수집 -> 2) 라벨별 추천 병렬 조회 -> 3) 한 번에 반영
+    return _apply_pipeline(_dict, resolve_recommendations(_pipeline_labels(_dict)))
+
+def _resolve_or_error(label):
+    try:
+        return get_recommendation(label)
+    except Exception as e:
+        return e
+
+def iter_bulk_recommend(pipelines, window=None):
+    # 여러 파이프라인 추천: window개씩 읽어 새로 나온 라벨만 병렬 조회 후 파이프라인별 결과를 바로 반환
+    # 라벨별 결과는 요청 전체에서 한 번만 조회 (보관하는 것은 라벨별 추천값뿐, 파이프라인은 window개만 메모리에 유지)
+    # pipelines: (key, templates) 목록 -> yield (key, templates 또는 None, error 또는 None)
+    window = window or settings.predict_bulk_window
+    resolved = {}
+    pipelines = iter(pipelines)
+    while True:
+        chunk = list(itertools.islice(pipelines, window))
+        if not chunk:
+            return
+        labels = []
+        for _, pipeline in chunk:
+            try:
+                labels.append(_pipeline_labels(pipeline))
+            except (TypeError, AttributeError):
+                labels.append(None)
+        new_labels = list(dict.fromkeys(label for pipeline_labels in labels if pipeline_labels
+                                        for label in pipeline_labels if label not in resolved))
+        if len(new_labels) > 1:
+            resolved.update(zip(new_labels, _get_executor().map(_resolve_or_error, new_labels)))
+        else:
+            resolved.update((label, _resolve_or_error(label)) for label in new_labels)
+        for (key, pipeline), pipeline_labels in zip(chunk, labels):
+            failed = [label for label in pipeline_labels or [] if isinstance(resolved[label], Exception)]
+            if pipeline_labels is None:
+                yield key, None, "pipeline must be a list of templates."
+            elif failed:
+                yield key, None, f"Recommendation failed for '{failed[0]}': {resolved[failed[0]]}"
             else:
-                i['container']['resources'] = {
-                        'requests': {
-                            'cpu': None,
-                            'memory': None,
-                        },
-                        'limits': {
-                            'cpu': None,
-                            'memory': None,
-                        }
-                    }
-                print("There is no label for ML workloads. Recommend does not occur")
-    return _dict
\ No newline at end of file
+                try:
+                    yield key, _apply_pipeline(pipeline, resolved), None
+                except Exception as e:
+                    yield key, None, str(e)
@@ -0,0 +1,172 @@
+import os
+from dataclasses import dataclass, field, fields
+from dotenv import load_dotenv
+
+# .env 파일은 프로세스에서 한 번만 읽음 (각 모듈은 settings 사용)
+load_dotenv()
+
+STARTUP_MODES = ("lazy", "eager")
+STARTUP_WARMUPS = ("off", "sync", "background")
+
+
+def _env(name, default=None):
+    return field(default=default, metadata={"env": name})
+
+
+def _bool(value):
+    return value.lower() == "true"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """환경 변수 설정 (기동 시 한 번 파싱, 필드 이름의 대문자 = 환경 변수 이름)."""
+
+    # 기동
+    python_server_port: int = 32000
+    startup_mode: str = "lazy"  # lazy: 무거운 의존성을 첫 사용 시 로드 / eager: import 시 모두 로드
+    startup_warmup: str = "background"  # off / sync / background (포트를 연 뒤 warmup)
+    db_migrate_on_start: bool = True
+
+    # gunicorn (gunicorn.conf.py)
+    gunicorn_workers: int = 1
+    gunicorn_max_workers: int = 4
+    gunicorn_threads: int = 16
+    gunicorn_timeout: int = 120
+    gunicorn_graceful_timeout: int = 60
+    gunicorn_keepalive: int = 5
+    gunicorn_backlog: int = 2048
+    gunicorn_preload: bool = False
+    gunicorn_max_requests: int = 0
+    gunicorn_max_requests_jitter: int = 0
+    gunicorn_access_log: str = None
+    gunicorn_log_level: str = "info"
+
+    # MySQL
+    db_host: str = None
+    db_port: int = None
+    db_user: str = None
+    db_password: str = None
+    db_name: str = None
+    table_name: str = None
+    db_pool_size: int = 10
+    db_pool_max_idle: float = 300
+    db_pool_timeout: float = 10
+    db_pool_warmup: int = 2
+    db_bulk_chunk_size: int = 500
+    mlid_prefix: str = "keti"
+    mlid_block_size: int = 10
+    mlid_sequence_table: str = None
+
+    # STRATO / 추천 서버
+    strato_url: str = _env("URL")
+    strato_token: str = _env("TOKEN")
+    recommend_server: str = _env("RECOMMAND_SERVER")
+
+    # 업스트림 HTTP 호출: 업스트림별 설정(STRATO_READ_TIMEOUT, RECOMMENDER_READ_TIMEOUT) > 공통 설정(HTTP_READ_TIMEOUT)
+    http_connect_timeout: float = 3
+    http_read_timeout: float = 30
+    http_retries: int = 2
+    http_backoff: float = 0.2
+    http_pool_size: int = 20
+    http_breaker_failures: int = 5
+    http_breaker_reset: float = 30
+    strato_connect_timeout: float = None
+    strato_read_timeout: float = None
+    strato_retries: int = None
+    strato_backoff: float = None
+    strato_pool_size: int = None
+    strato_breaker_failures: int = None
+    strato_breaker_reset: float = None
+    recommender_connect_timeout: float = None
+    recommender_read_timeout: float = None
+    recommender_retries: int = None
+    recommender_backoff: float = None
+    recommender_pool_size: int = None
+    recommender_breaker_failures: int = None
+    recommender_breaker_reset: float = None
+
+    # ML 제출 / 동기화
+    ml_submit_sync: bool = False
+    ml_submit_sync_timeout: float = 120
+    ml_job_workers: int = 4
+    ml_job_max_queue: int = 100
+    ml_job_max_history: int = 1000
+    ml_job_ttl: float = 3600
+    ml_dedup_ttl: float = 300
+    ml_sync_enabled: bool = True
+    ml_sync_interval: float = 30
+    ml_sync_max_staleness: float = 120
+
+    # Argo
+    argo_client_max_idle: float = 600
+    argo_pool_maxsize: int = 8
+    argo_page_size: int = 500
+    argo_informer_enabled: bool = True
+    argo_watch_timeout: int = 300
+    argo_informer_sync_timeout: float = 10
+    argo_informer_max_idle: float = 600
+    argo_informer_retry_backoff: float = 5
+    argo_informer_max_targets: int = 32
+    argo_batch_workers: int = 16
+    argo_batch_timeout: float = 10
+    argo_warmup_targets: str = ""
+    workflow_history_size: int = 100000
+    workflow_history_path: str = "workflow_history.npz"
+    workflow_history_save_interval: float = 60
+
+    # 추천
+    recommend_mode: str = "remote"
+    recommend_max_workers: int = 8
+    recommend_model_version: str = "default"
+    recommend_cache_enabled: bool = True
+    recommend_cache_size: int = 256
+    recommend_cache_ttl: float = 300
+    recommend_cache_stale_ttl: float = 600
+    predict_bulk_window: int = 64
+    manifest_cache_size: int = 128
+    local_recommend_samples: int = 1024
+    local_recommend_max_labels: int = 512
+    local_recommend_request_quantile: float = 50
+    local_recommend_limit_quantile: float = 95
+    local_recommend_headroom: float = 1.2
+    local_recommend_min_samples: int = 10
+    local_recommend_path: str = "usage_history.npz"
+    local_recommend_save_interval: float = 60
+
+    # 배치
+    cluster_registry: str = "[]"
+    cluster_registry_path: str = None
+    placement_reservation_ttl: float = 600
+    placement_default_cluster: int = 1
+
+    # 프로파일링
+    profile_enabled: bool = False
+    profile_dir: str = "profiles"
+    profile_max_profiles: int = 50
+    profile_sample_rate: float = 0
+    profile_header: str = "X-Profile"
+    profile_token: str = None
+
+    def __post_init__(self):
+        if self.startup_mode not in STARTUP_MODES:
+            raise ValueError(f"STARTUP_MODE must be one of {STARTUP_MODES}, got '{self.startup_mode}'")
+        if self.startup_warmup not in STARTUP_WARMUPS:
+            raise ValueError(f"STARTUP_WARMUP must be one of {STARTUP_WARMUPS}, got '{self.startup_warmup}'")
+
+    @classmethod
+    def from_env(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        values = {}
+        for item in fields(cls):
+            name = item.metadata.get("env", item.name.upper())
+            value = environ.get(name)
+            if value is None:
+                continue
+            try:
+                values[item.name] = _bool(value) if item.type is bool else item.type(value)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for {name}: '{value}'") from e
+        return cls(**values)
+
+
+settings = Settings.from_env()
@@ -0,0 +1,220 @@
+import heapq
+import numpy as np
+from .placement import step_demand, parse_cpu, parse_memory, DIMENSIONS, _dag_tasks, _dag_depths
+
+_ARRIVE, _FINISH = 0, 1
+_EPS = 1e-9
+
+
+def _workload_label(template):
+    return ((template.get('metadata') or {}).get('labels') or {}).get('ml.workload')
+
+
+def compile_pipeline(templates, durations, default_duration=300.0):
+    # parse_recommend로 requests/limits가 반영된 templates -> 시뮬레이션용 step 배열
+    # durations: {ml.workload 라벨 또는 template 이름: 초}
+    by_name = {template.get('name'): template for template in templates if isinstance(template, dict)}
+    dag = next((template['dag'] for template in by_name.values() if template.get('dag')), None)
+    if isinstance(dag, dict) and dag.get('tasks'):
+        # DAG 검증/순환 검사는 placement.pipeline_levels와 같은 helper 사용 (형식 오류는 ValueError)
+        dag_tasks = _dag_tasks(dag['tasks'])
+        _dag_depths(dag_tasks)
+        tasks = [(name, by_name.get(task.get('template')), task.get('dependencies') or [])
+                 for name, task in dag_tasks.items()]
+        tasks = [(name, template, parents) for name, template, parents in tasks
+                 if template is not None and 'container' in template]
+    else:
+        # DAG가 없으면 컨테이너 step을 모두 동시에 시작 가능한 것으로 취급
+        tasks = [(name, template, []) for name, template in by_name.items() if 'container' in template]
+    positions = {name: position for position, (name, _, _) in enumerate(tasks)}
+
+    steps = {"names": [], "labels": [], "demand": [], "limits": [], "duration": [], "parents": []}
+    for name, template, parents in tasks:
+        label = _workload_label(template)
+        limits = (template['container'].get('resources') or {}).get('limits') or {}
+        steps["names"].append(name)
+        steps["labels"].append(label)
+        steps["demand"].append(step_demand(template))
+        steps["limits"].append([parse_cpu(limits['cpu']) if limits.get('cpu') is not None else np.inf,
+                                parse_memory(limits['memory']) if limits.get('memory') is not None else np.inf])
+        steps["duration"].append(float(durations.get(name, durations.get(template.get('name'),
+                                                                          durations.get(label, default_duration)))))
+        steps["parents"].append([positions[parent] for parent in parents if parent in positions])
+    steps["demand"] = np.array(steps["demand"]).reshape(-1, len(DIMENSIONS))
+    steps["limits"] = np.array(steps["limits"]).reshape(-1, 2)
+    steps["duration"] = np.array(steps["duration"])
+    return steps
+
+
+def sample_usage(labels, usage_model, rng):
+    # 라벨별 실제 사용량 (cpu 코어, memory Mi) - 평균/변동계수(cv) 기준 lognormal
+    # usage_model: {라벨: {"cpu": (평균, cv), "memory": (평균, cv)}}, 없는 라벨은 사용량 0 (제한 초과 없음)
+    labels = np.asarray(labels, dtype=object)
+    usage = np.zeros((len(labels), 2))
+    for label, model in usage_model.items():
+        mask = labels == label
+        count = int(mask.sum())
+        if not count:
+            continue
+        for column, key in enumerate(("cpu", "memory")):
+            mean, cv = model[key]
+            sigma = np.sqrt(np.log1p(cv ** 2))
+            usage[mask, column] = rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, count)
+    return usage
+
+
+class ClusterSimulator:
+    """파이프라인 DAG step 단위 discrete-event 시뮬레이터 (heap 기반 event loop).
+
+    step은 의존 step이 끝나면 대기열에 들어가고 requests(cpu/memory/gpu)가 들어가는 노드에
+    policy(best_fit / first_fit / spread)로 배치된다. 실제 사용량이 cpu limit을 넘으면 그만큼 느려지고
+    memory limit을 넘으면 oom_at 지점에서 OOM 종료 후 재시도 (oom_retries 초과 시 파이프라인 실패).
+    """
+
+    POLICIES = ("best_fit", "first_fit", "spread")
+
+    def __init__(self, nodes, policy="best_fit", oom_retries=2, oom_at=0.5):
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {self.POLICIES}, got '{policy}'")
+        self.nodes = np.asarray(nodes, dtype=np.float64).reshape(-1, len(DIMENSIONS))
+        self.policy = policy
+        self.oom_retries = oom_retries
+        self.oom_at = oom_at
+        self._scale = np.where(self.nodes.max(axis=0) > 0, self.nodes.max(axis=0), 1)
+
+    def _choose(self, free, candidates, demand):
+        if self.policy == "first_fit":
+            return candidates[0]
+        score = ((free[candidates] - demand) / self._scale).sum(axis=1)
+        return candidates[np.argmin(score) if self.policy == "best_fit" else np.argmax(score)]
+
+    def run(self, pipelines, arrivals, usage_model, rng):
+        # pipelines: compile_pipeline 결과 목록 (같은 객체 재사용 가능), arrivals: 파이프라인별 도착 시각(초)
+        counts = np.array([len(pipeline["duration"]) for pipeline in pipelines])
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(pipelines)), counts)
+        demand = np.concatenate([pipeline["demand"] for pipeline in pipelines]) if total else np.zeros((0, 3))
+        limits = np.concatenate([pipeline["limits"] for pipeline in pipelines]) if total else np.zeros((0, 2))
+        duration = np.concatenate([pipeline["duration"] for pipeline in pipelines]) if total else np.zeros(0)
+        labels = [label for pipeline in pipelines for label in pipeline["labels"]]
+        children = [[] for _ in range(total)]
+        waiting_parents = np.zeros(total, dtype=np.int64)
+        for index, pipeline in enumerate(pipelines):
+            for step, parents in enumerate(pipeline["parents"]):
+                waiting_parents[offsets[index] + step] = len(parents)
+                for parent in parents:
+                    children[offsets[index] + parent].append(offsets[index] + step)
+
+        # 실제 사용량 -> 실행 시간 (cpu throttling) / OOM 여부를 시도(재시도 포함)별로 한 번에 계산
+        usage = np.stack([sample_usage(labels, usage_model, rng) for _ in range(self.oom_retries + 1)])
+        throttle = np.maximum(1.0, np.divide(usage[..., 0], limits[:, 0], out=np.zeros(usage.shape[:2]),
+                                             where=limits[:, 0] > 0))
+        oom = usage[..., 1] > limits[:, 1]
+        runtime = duration * throttle
+        runtime = np.where(oom, runtime * self.oom_at, runtime)
+
+        free = self.nodes.copy()
+        used = np.zeros(len(DIMENSIONS))
+        busy = np.zeros(len(DIMENSIONS))
+        ready_at = np.zeros(total)
+        wait = np.zeros(len(pipelines))
+        remaining = counts.copy()
+        finished_at = np.full(len(pipelines), np.nan)
+        failed = np.zeros(len(pipelines), dtype=bool)
+        attempts = np.zeros(total, dtype=np.int64)
+        node_of = np.full(total, -1, dtype=np.int64)
+        pending = []
+        heap = [(float(at), index, _ARRIVE, index) for index, at in enumerate(arrivals)]
+        heapq.heapify(heap)
+        sequence = len(heap)
+        now = 0.0
+        events = 0
+        oom_kills = 0
+
+        def schedule():
+            nonlocal pending, sequence
+            if not pending:
+                return
+            demands = demand[pending]
+            fits = (free[None, :, :] - demands[:, None, :] >= -_EPS).all(axis=2)
+            available = fits.any(axis=1)
+            started = np.zeros(len(pending), dtype=bool)
+            while True:
+                rows = np.flatnonzero(available & ~started)
+                if not rows.size:
+                    break
+                row = rows[0]
+                node = self._choose(free, np.flatnonzero(fits[row]), demands[row])
+                free[node] -= demands[row]
+                used[:] += demands[row]
+                started[row] = True
+                fits[:, node] = (free[node] - demands >= -_EPS).all(axis=1)
+                available = fits.any(axis=1)
+                step = pending[row]
+                node_of[step] = node
+                wait[owner[step]] += now - ready_at[step]
+                heapq.heappush(heap, (now + runtime[attempts[step], step], sequence, _FINISH, step))
+                sequence += 1
+            if started.any():
+                pending = [step for step, done in zip(pending, started) if not done]
+
+        while heap:
+            at, _, kind, value = heapq.heappop(heap)
+            busy += used * (at - now)
+            now = at
+            events += 1
+            if kind == _ARRIVE:
+                for step in range(offsets[value], offsets[value] + counts[value]):
+                    if waiting_parents[step] == 0:
+                        ready_at[step] = now
+                        pending.append(step)
+            else:
+                step, index = value, owner[value]
+                free[node_of[step]] += demand[step]
+                used[:] -= demand[step]
+                if oom[attempts[step], step]:
+                    oom_kills += 1
+                    attempts[step] += 1
+                    if attempts[step] <= self.oom_retries:
+                        ready_at[step] = now
+                        pending.append(step)
+                    else:
+                        failed[index] = True
+                        finished_at[index] = now
+                else:
+                    remaining[index] -= 1
+                    if remaining[index] == 0:
+                        finished_at[index] = now
+                    for child in children[step]:
+                        waiting_parents[child] -= 1
+                        if waiting_parents[child] == 0:
+                            ready_at[child] = now
+                            pending.append(child)
+            # 같은 시각의 event를 모두 처리한 뒤 배치
+            if not heap or heap[0][0] > now:
+                schedule()
+
+        arrivals = np.asarray(arrivals, dtype=np.float64)
+        completed = ~np.isnan(finished_at) & ~failed
+        jct = finished_at[completed] - arrivals[completed]
+        makespan = float(np.nanmax(finished_at)) - float(arrivals.min()) if completed.any() or failed.any() else 0.0
+        capacity = self.nodes.sum(axis=0)
+        utilization = np.divide(busy, capacity * makespan, out=np.zeros(len(DIMENSIONS)),
+                                where=(capacity > 0) & (makespan > 0))
+        return {
+            "pipelines": len(pipelines),
+            "completed": int(completed.sum()),
+            "failed": int(failed.sum()),
+            "unschedulable": int(len(pipelines) - completed.sum() - failed.sum()),
+            "makespan": round(makespan, 3),
+            "throughput_per_hour": round(completed.sum() / makespan * 3600, 4) if makespan else 0.0,
+            "utilization": dict(zip(DIMENSIONS, utilization.round(4).tolist())),
+            "wait_mean": round(float(wait[completed].mean()), 3) if completed.any() else None,
+            "wait_p95": round(float(np.percentile(wait[completed], 95)), 3) if completed.any() else None,
+            "jct_mean": round(float(jct.mean()), 3) if jct.size else None,
+            "jct_p95": round(float(np.percentile(jct, 95)), 3) if jct.size else None,
+            "oom_kills": oom_kills,
+            "throttled_steps": int((throttle[0] > 1).sum()),
+            "events": events,
+        }
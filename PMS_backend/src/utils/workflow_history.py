@@ -0,0 +1,211 @@
+import os
+import re
+import time
+import atexit
+import threading
+from .argo_utils import parse_timestamp
+from .lazy import lazy_module, lazy_object
+from .settings import settings
+
+np = lazy_module("numpy")
+
+FINISHED_PHASES = ("Succeeded", "Failed", "Error")
+# KFP/Argo generateName 뒤에 붙는 5자리 suffix 제거 -> 파이프라인 이름
+_GENERATED_SUFFIX = re.compile(r"-[a-z0-9]{5}$")
+
+
+def pipeline_name(workflow_name):
+    return _GENERATED_SUFFIX.sub("", workflow_name)
+
+
+class WorkflowHistory:
+    """종료된 Workflow 기록을 컬럼 단위 numpy ring buffer로 보관.
+
+    finished(epoch), duration(sec), phase/pipeline/source 코드 배열을 유지하고
+    주기적으로 .npz 파일에 저장해 재기동 후에도 이어서 사용한다.
+    """
+
+    def __init__(self, capacity=100000, path=None, save_interval=60):
+        self.capacity = capacity
+        self.path = path
+        self.save_interval = save_interval
+
+        self._finished = np.zeros(capacity, dtype=np.float64)
+        self._duration = np.zeros(capacity, dtype=np.float64)
+        self._phase = np.zeros(capacity, dtype=np.int8)
+        self._pipeline = np.zeros(capacity, dtype=np.int32)
+        self._source = np.zeros(capacity, dtype=np.int32)
+        self._keys = [None] * capacity  # 중복 기록 방지용 (source, workflow name)
+        self._seen = set()
+        self._next = 0
+        self._count = 0
+
+        self._phases = list(FINISHED_PHASES)
+        self._pipelines, self._pipeline_codes = [], {}
+        self._sources, self._source_codes = [], {}
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _code(self, value, names, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def record(self, source, summaries):
+        added = 0
+        with self._lock:
+            for summary in summaries:
+                phase = summary.get('phase')
+                if phase not in FINISHED_PHASES or not summary.get('finishedAt') or not summary.get('startedAt'):
+                    continue
+                key = (source, summary['name'])
+                if key in self._seen:
+                    continue
+                finished = parse_timestamp(summary['finishedAt'])
+                slot = self._next
+                old_key = self._keys[slot]
+                if old_key is not None:
+                    self._seen.discard(old_key)
+                self._keys[slot] = key
+                self._seen.add(key)
+                self._finished[slot] = finished
+                self._duration[slot] = finished - parse_timestamp(summary['startedAt'])
+                self._phase[slot] = self._phases.index(phase)
+                self._pipeline[slot] = self._code(pipeline_name(summary['name']), self._pipelines, self._pipeline_codes)
+                self._source[slot] = self._code(source, self._sources, self._source_codes)
+                self._next = (slot + 1) % self.capacity
+                self._count = min(self._count + 1, self.capacity)
+                added += 1
+            if added:
+                self._dirty = True
+        if added and self.path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return added
+
+    def query(self, window=86400, group_by="name", source=None, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            n = self._count
+            finished = self._finished[:n].copy()
+            duration = self._duration[:n].copy()
+            phase = self._phase[:n].copy()
+            groups = (self._pipeline if group_by == "name" else self._phase)[:n].copy()
+            source_mask = None
+            if source is not None:
+                code = self._source_codes.get(source)
+                source_mask = self._source[:n] == code if code is not None else np.zeros(n, dtype=bool)
+            labels = list(self._pipelines if group_by == "name" else self._phases)
+
+        mask = finished >= now - window
+        if source_mask is not None:
+            mask &= source_mask
+        duration, phase, groups = duration[mask], phase[mask], groups[mask]
+        succeeded = phase == self._phases.index("Succeeded")
+        hours = window / 3600
+
+        result = {"total": self._summarize(duration, succeeded, hours), "groups": {}}
+        if duration.size == 0:
+            return result
+        # 그룹 코드 기준 정렬 후 구간별로 통계 계산
+        order = np.argsort(groups, kind="stable")
+        codes, starts = np.unique(groups[order], return_index=True)
+        bounds = list(starts[1:]) + [order.size]
+        for code, start, end in zip(codes, starts, bounds):
+            idx = order[start:end]
+            result["groups"][labels[code]] = self._summarize(duration[idx], succeeded[idx], hours)
+        return result
+
+    def _summarize(self, duration, succeeded, hours):
+        count = int(duration.size)
+        if count == 0:
+            return {"count": 0, "p50": None, "p90": None, "p99": None, "success_rate": None, "throughput_per_hour": 0.0}
+        p50, p90, p99 = np.percentile(duration, [50, 90, 99])
+        return {
+            "count": count,
+            "p50": round(float(p50), 3),
+            "p90": round(float(p90), 3),
+            "p99": round(float(p99), 3),
+            "success_rate": round(float(succeeded.mean()), 4),
+            "throughput_per_hour": round(count / hours, 4) if hours else None,
+        }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            n = self._count
+            # 오래된 순서로 정렬해 저장 (ring buffer 위치와 무관하게 복원 가능)
+            order = np.arange(self._next - n, self._next) % self.capacity
+            data = {
+                "finished": self._finished[order],
+                "duration": self._duration[order],
+                "phase": self._phase[order],
+                "pipeline": self._pipeline[order],
+                "source": self._source[order],
+                "workflow": np.array([self._keys[i][1] for i in order], dtype=object),
+                "pipelines": np.array(self._pipelines, dtype=object),
+                "sources": np.array(self._sources, dtype=object),
+                "phases": np.array(self._phases, dtype=object),
+            }
+            self._dirty = False
+            self._last_save = time.monotonic()
+        # gunicorn 워커 여러 개가 같은 path에 저장할 수 있으므로 임시 파일은 프로세스별로 분리
+        tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **data)
+        os.replace(tmp_path, self.path)
+
+    def _load(self, path):
+        try:
+            with np.load(path, allow_pickle=True) as data:
+                phases = list(data["phases"])
+                pipelines = list(data["pipelines"])
+                sources = list(data["sources"])
+                n = min(len(data["finished"]), self.capacity)
+                start = len(data["finished"]) - n
+                self._pipelines = pipelines
+                self._pipeline_codes = {name: i for i, name in enumerate(pipelines)}
+                self._sources = sources
+                self._source_codes = {name: i for i, name in enumerate(sources)}
+                # 저장된 phase 코드를 현재 코드 체계로 변환
+                phase_map = np.array([self._phases.index(p) for p in phases], dtype=np.int8)
+                self._finished[:n] = data["finished"][start:]
+                self._duration[:n] = data["duration"][start:]
+                self._phase[:n] = phase_map[data["phase"][start:]]
+                self._pipeline[:n] = data["pipeline"][start:]
+                self._source[:n] = data["source"][start:]
+                for i, (source, workflow) in enumerate(zip(data["source"][start:], data["workflow"][start:])):
+                    key = (sources[source], workflow)
+                    self._keys[i] = key
+                    self._seen.add(key)
+                self._count = n
+                self._next = n % self.capacity
+            print(f"Loaded {n} workflow history records from {path}")
+        except Exception as e:
+            print(f"Error loading workflow history from {path}: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {"records": self._count, "capacity": self.capacity, "pipelines": len(self._pipelines), "path": self.path}
+
+
+def _create_workflow_history():
+    history = WorkflowHistory(
+        capacity=settings.workflow_history_size,
+        path=settings.workflow_history_path,
+        save_interval=settings.workflow_history_save_interval,
+    )
+    atexit.register(history.save)
+    return history
+
+
+# ring buffer 할당 / 저장 파일 로드는 첫 사용 시
+workflow_history = lazy_object("workflow_history", _create_workflow_history)
@@ -0,0 +1,2 @@
+# gunicorn 진입점: gunicorn -c gunicorn.conf.py wsgi:application
+from app import app as application